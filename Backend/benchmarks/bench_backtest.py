@@ -0,0 +1,73 @@
+"""
+Compare the fill-only backtest engine against the old row-by-row loop.
+
+Run from the Backend directory:
+    python -m benchmarks.bench_backtest
+    python -m benchmarks.bench_backtest --bars 10000 100000 1000000 --algorithm MACD
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_access.models.trading_strategy import TradingStrategy
+
+
+def synthetic_bars(bars: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, bars))
+    dates = pd.date_range('1990-01-01', periods=bars, freq='h', tz='America/New_York')
+    return pd.DataFrame({
+        'Date': dates.strftime('%Y-%m-%dT%H:%M:%S'),
+        'Open': close,
+        'High': close,
+        'Low': close,
+        'Close': close,
+        'Volume': rng.integers(1000, 100000, bars)
+    })
+
+
+def run_legacy(data, algorithm):
+    strategy = TradingStrategy(data, 'BENCH', algorithm)
+    strategy.calculate_signals()
+    strategy._simulate_rows()
+    return strategy._summarize()
+
+
+def run_vectorized(data, algorithm):
+    return TradingStrategy(data, 'BENCH', algorithm).run_backtest()
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--algorithm', default='MACD', choices=['SMA', 'BollingerBands', 'MACD'])
+    parser.add_argument('--legacy-max-bars', type=int, default=1_000_000,
+                        help='skip the row loop above this size (it takes minutes at 1M bars)')
+    args = parser.parse_args()
+
+    print(f"{'bars':>10} {'trades':>8} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>9}")
+    for bars in args.bars:
+        data = synthetic_bars(bars)
+        new_time, new_result = timed(run_vectorized, data.copy(), args.algorithm)
+        trades = len(new_result[1])
+
+        if bars > args.legacy_max_bars:
+            print(f"{bars:>10} {trades:>8} {'skipped':>12} {new_time:>15.3f} {'-':>9}")
+            continue
+
+        old_time, old_result = timed(run_legacy, data.copy(), args.algorithm)
+        if old_result != new_result:
+            raise AssertionError(f"Results differ at {bars} bars")
+        print(f"{bars:>10} {trades:>8} {old_time:>12.3f} {new_time:>15.3f} {old_time / new_time:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Backtest tens of millions of memory-mapped minute bars in fixed-size chunks.
+
+Writes a synthetic minute-bar series straight to disk with
+BarSeries.allocate (never holding it in RAM), then runs
+ChunkedTradingStrategy over the memory-mapped copy and reports run time and
+the tracemalloc peak, which should depend on --chunk-rows, not --bars.
+
+Run from the Backend directory:
+    python -m benchmarks.bench_chunked_backtest --bars 20000000 --chunk-rows 1000000
+"""
+import argparse
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from data_access.bar_series import BarSeries
+from data_access.models.chunked_backtest import ChunkedTradingStrategy
+
+MINUTE_NS = 60 * 10 ** 9
+
+
+def write_bars(directory, bars, price_dtype, seed=42, block=1000000):
+    series = BarSeries.allocate(directory, bars, price_dtype=price_dtype, tz='America/New_York')
+    rng = np.random.default_rng(seed)
+    start_ns = np.datetime64('2000-01-03T14:30', 'ns').astype(np.int64)
+    price = 100.0
+    for start in range(0, bars, block):
+        stop = min(start + block, bars)
+        close = price * np.cumprod(1 + rng.normal(0, 0.0005, stop - start))
+        price = close[-1]
+        series.timestamps[start:stop] = start_ns + np.arange(start, stop, dtype=np.int64) * MINUTE_NS
+        series.open[start:stop] = close
+        series.high[start:stop] = close
+        series.low[start:stop] = close
+        series.close[start:stop] = close
+        series.volume[start:stop] = rng.integers(100, 10000, stop - start)
+    series.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, default=20000000)
+    parser.add_argument('--chunk-rows', type=int, nargs='+', default=[250000, 1000000])
+    parser.add_argument('--algorithms', nargs='+', default=['SMA', 'BollingerBands', 'MACD'])
+    parser.add_argument('--float32', action='store_true', help='store prices as float32')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        write_bars(directory, args.bars, np.float32 if args.float32 else np.float64)
+        print(f"wrote {args.bars:,} minute bars in {time.perf_counter() - start:.1f}s")
+
+        print(f"{'algorithm':>15} {'chunk rows':>11} {'seconds':>8} {'peak MB':>8} {'trades':>9} {'final balance':>15}")
+        for algorithm in args.algorithms:
+            for chunk_rows in args.chunk_rows:
+                bars = BarSeries.load(directory)
+                strategy = ChunkedTradingStrategy(bars, 'BENCH', algorithm, chunk_rows=chunk_rows, keep_trades=False)
+                tracemalloc.start()
+                start = time.perf_counter()
+                final_balance = strategy.run_backtest()[0]
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f"{algorithm:>15} {chunk_rows:>11,} {elapsed:>8.1f} {peak / 1e6:>8.1f} "
+                      f"{strategy.num_trades:>9,} {final_balance:>15,.2f}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
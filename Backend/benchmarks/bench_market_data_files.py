@@ -0,0 +1,70 @@
+"""
+Compare file size, save time and load time of the market data formats
+supported by DataAccessService.save_market_data / load_market_data.
+
+Parquet and feather are only included when pyarrow is installed.
+
+Run from the Backend directory:
+    python -m benchmarks.bench_market_data_files --symbols 1 10 100 --bars 5000
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.bench_backtest import synthetic_bars
+from data_access.market_data_files import available_formats, market_data_path, save_frame, load_frame
+
+
+def disk_size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def bench_format(format, frames, root):
+    paths = [market_data_path(os.path.join(root, f"SYM{i}_market_data"), format) for i in range(len(frames))]
+
+    start = time.perf_counter()
+    for data, path in zip(frames, paths):
+        save_frame(data, path)
+    save_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = 0
+    for path in paths:
+        rows += len(load_frame(path))
+    load_time = time.perf_counter() - start
+
+    size = sum(disk_size(path) for path in paths)
+    return save_time, load_time, size, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--bars', type=int, default=5000, help='rows per symbol (~20 years of daily bars)')
+    args = parser.parse_args()
+
+    formats = available_formats()
+    print(f"{'symbols':>8} {'format':>8} {'size MB':>9} {'save s':>8} {'load s':>8} {'vs json':>8}")
+    for count in args.symbols:
+        frames = [synthetic_bars(args.bars, seed=i) for i in range(count)]
+        results = {}
+        for format in formats:
+            root = tempfile.mkdtemp()
+            try:
+                results[format] = bench_format(format, frames, root)
+            finally:
+                shutil.rmtree(root)
+
+        json_load = results['json'][1]
+        for format in formats:
+            save_time, load_time, size, _ = results[format]
+            print(f"{count:>8} {format:>8} {size / 1e6:>9.2f} {save_time:>8.3f} {load_time:>8.3f} "
+                  f"{json_load / load_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
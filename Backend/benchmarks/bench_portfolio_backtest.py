@@ -0,0 +1,57 @@
+"""
+Portfolio backtest of hundreds of symbols on one shared cash balance.
+
+Builds a synthetic dates x symbols close matrix (some symbols listing part
+way through) and times PortfolioBacktest for each algorithm and sizing rule.
+The default is 500 symbols over 20 years of trading days.
+
+Run from the Backend directory:
+    python -m benchmarks.bench_portfolio_backtest --symbols 500 --years 20
+"""
+import argparse
+import time
+
+import numpy as np
+
+from data_access.models.portfolio_backtest import PortfolioBacktest, POSITION_SIZERS
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def synthetic_closes(days, symbols, seed=42):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, (days, symbols)), axis=0))
+    # A tenth of the universe lists somewhere in the first half
+    listing = rng.integers(1, days // 2, symbols // 10)
+    for column, first_day in enumerate(listing):
+        close[:first_day, column] = np.nan
+    dates = np.datetime_as_string(np.busday_offset('2000-01-03', np.arange(days)), unit='D')
+    return dates, [f"SYM{i}" for i in range(symbols)], close
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--years', type=int, default=20)
+    parser.add_argument('--algorithms', nargs='+', default=['SMA', 'BollingerBands', 'MACD'])
+    parser.add_argument('--sizing', nargs='+', default=list(POSITION_SIZERS))
+    parser.add_argument('--rebalance-every', type=int, default=None)
+    parser.add_argument('--include-trades', action='store_true', help='also build the trade list')
+    args = parser.parse_args()
+
+    dates, symbols, close = synthetic_closes(args.years * TRADING_DAYS_PER_YEAR, args.symbols)
+    print(f"{len(dates):,} days x {len(symbols):,} symbols")
+    print(f"{'algorithm':>15} {'sizing':>19} {'seconds':>8} {'trades':>9} {'final balance':>15} {'max dd %':>9}")
+    for algorithm in args.algorithms:
+        for sizing in args.sizing:
+            portfolio = PortfolioBacktest(dates, symbols, close, algorithm, sizing=sizing,
+                                          rebalance_every=args.rebalance_every)
+            start = time.perf_counter()
+            result = portfolio.run(include_trades=args.include_trades)
+            elapsed = time.perf_counter() - start
+            print(f"{algorithm:>15} {sizing:>19} {elapsed:>8.2f} {result['num_trades']:>9,} "
+                  f"{result['final_balance']:>15,.2f} {result['max_drawdown']:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
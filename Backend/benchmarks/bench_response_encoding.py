@@ -0,0 +1,51 @@
+"""
+Time serializing a /fetch_market_data style payload: the old
+to_dict(orient='records') + jsonify path against encode_response with the
+row and columnar layouts.
+
+Run from the Backend directory:
+    python -m benchmarks.bench_response_encoding --bars 100000
+"""
+import argparse
+import time
+
+from flask import Flask, jsonify
+
+from benchmarks.bench_backtest import synthetic_bars
+from controllers.response_encoding import encode_response, frame_to_records, frame_to_columns
+
+
+def timed(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = func()
+        best = min(best, time.perf_counter() - start)
+    return best, response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    data = synthetic_bars(args.bars)
+    app = Flask(__name__)
+    cases = [
+        ('records + jsonify', lambda: jsonify({'status': 'success', 'data': data.to_dict(orient='records')})),
+        ('encode_response rows', lambda: encode_response({'status': 'success', 'data': frame_to_records(data)})),
+        ('encode_response columns', lambda: encode_response({'status': 'success', 'data': frame_to_columns(data)})),
+    ]
+
+    print(f"{args.bars} bars")
+    for headers in ({}, {'Accept-Encoding': 'gzip'}):
+        with app.test_request_context(headers=headers):
+            label = 'gzip' if headers else 'identity'
+            for name, func in cases:
+                seconds, response = timed(func, args.repeat)
+                print(f"  {name:<24} {label:<8} {seconds * 1000:8.1f} ms {len(response.get_data()) / 1e6:8.2f} MB")
+
+
+if __name__ == '__main__':
+    main()
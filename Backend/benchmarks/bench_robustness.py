@@ -0,0 +1,70 @@
+"""
+Walk-forward analysis and Monte Carlo bootstrap, serial against a process
+pool.
+
+Times run_walk_forward over a parameter grid and run_monte_carlo with the
+bootstrap method on one synthetic series, once with processes=1 and once
+per --processes value, and checks the pooled results equal the serial ones.
+
+Run from the Backend directory:
+    python -m benchmarks.bench_robustness --years 20 --runs 2000 --processes 4 8
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_access.models.monte_carlo import run_monte_carlo
+from data_access.models.walk_forward import run_walk_forward
+
+TRADING_DAYS_PER_YEAR = 252
+GRIDS = {
+    'SMA': {'short_window': [5, 10, 20, 50], 'long_window': [100, 150, 200]},
+    'BollingerBands': {'window': [10, 20, 30], 'num_std_dev': [1.5, 2, 2.5]},
+    'MACD': {'short_ema': [8, 12], 'long_ema': [21, 26]}
+}
+
+
+def timed(function, **kwargs):
+    started = time.perf_counter()
+    result = function(**kwargs)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--years', type=int, default=20)
+    parser.add_argument('--runs', type=int, default=2000, help='Monte Carlo price paths')
+    parser.add_argument('--processes', type=int, nargs='+', default=[os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    days = args.years * TRADING_DAYS_PER_YEAR
+    rng = np.random.default_rng(42)
+    data = pd.DataFrame({
+        'Date': pd.bdate_range('2000-01-03', periods=days).strftime('%Y-%m-%d'),
+        'Close': 100 * np.cumprod(1 + rng.normal(0.0003, 0.02, days))
+    })
+
+    jobs = {
+        'walk_forward': (run_walk_forward, dict(data=data, grids=GRIDS, train_bars=3 * TRADING_DAYS_PER_YEAR,
+                                                test_bars=TRADING_DAYS_PER_YEAR // 4)),
+        'monte_carlo': (run_monte_carlo, dict(data=data, algorithm='MACD', method='bootstrap', runs=args.runs,
+                                              seed=1))
+    }
+    print(f"{days} bars, {args.runs} Monte Carlo paths")
+    for name, (function, kwargs) in jobs.items():
+        serial, serial_time = timed(function, processes=1, **kwargs)
+        print(f"{name:<14} processes=1  {serial_time:8.2f}s")
+        for processes in args.processes:
+            if processes == 1:
+                continue
+            pooled, pooled_time = timed(function, processes=processes, **kwargs)
+            status = 'same results' if pooled == serial else 'RESULTS DIFFER'
+            print(f"{name:<14} processes={processes:<2} {pooled_time:8.2f}s  "
+                  f"x{serial_time / pooled_time:.1f}  {status}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Peak Python memory (tracemalloc) of serving a long market data range in one
+response versus streaming it as NDJSON chunks from the on-disk store.
+
+The store is pre-populated with the whole range, so both paths read the
+same memory-mapped columns without fetching; mapped pages live in the OS
+page cache and are not counted. The partial mode streams after the store
+has been cut back by --missing-bars, so the request first fetches those
+and merges them into the stored columns.
+
+Run from the Backend directory:
+    python -m benchmarks.bench_stream_memory --bars 200000 400000 800000 --chunk-rows 5000
+"""
+import argparse
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_backtest import synthetic_bars
+from controllers.response_encoding import encode_json, frame_to_records, ndjson_chunks
+from data_access.columnar_io import save_columns
+from data_access.market_data_store import MarketDataStore
+
+START_DATE = '1990-01-01'
+END_DATE = '2200-01-01'
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, nargs='+', default=[200000, 400000, 800000])
+    parser.add_argument('--chunk-rows', type=int, default=5000)
+    parser.add_argument('--missing-bars', type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'bars':>8} {'mode':>8} {'peak MB':>9} {'seconds':>8} {'body MB':>8}")
+    for bars in args.bars:
+        root = tempfile.mkdtemp()
+        try:
+            store = MarketDataStore(root)
+            data = synthetic_bars(bars)
+            save_columns(data, store._symbol_dir('BENCH'), extra={'start': START_DATE, 'end': END_DATE})
+
+            # Cut at a day boundary so the stored coverage ends where the missing bars start
+            split_date = data['Date'].iloc[max(bars - args.missing_bars, 1)][:10]
+            stored, missing = data[data['Date'] < split_date], data[data['Date'] >= split_date]
+
+            def fetch(symbol, start_date, end_date):
+                if start_date != split_date:
+                    raise AssertionError('the store already covers the range')
+                return missing.reset_index(drop=True)
+
+            def full_response():
+                frame = store.get_market_data('BENCH', START_DATE, END_DATE, fetch)
+                return len(encode_json({'status': 'success', 'data': frame_to_records(frame)}))
+
+            def streamed_response():
+                chunks = store.iter_market_data('BENCH', START_DATE, END_DATE, fetch, args.chunk_rows)
+                return sum(len(block) for block in ndjson_chunks(chunks))
+
+            for mode, func in (('full', full_response), ('stream', streamed_response), ('partial', streamed_response)):
+                if mode == 'partial':
+                    save_columns(stored, store._symbol_dir('BENCH'), extra={'start': START_DATE, 'end': split_date})
+                peak, elapsed, size = measure(func)
+                print(f"{bars:>8} {mode:>8} {peak / 1e6:>9.1f} {elapsed:>8.2f} {size / 1e6:>8.1f}")
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Memory held by a backtest's trades: the list of trade dicts run_backtest
+returns by default versus the TradeLog it returns with compact=True.
+
+Memory is what tracemalloc still sees allocated once the backtest returns,
+i.e. what a cache or a sweep keeping the result pays for it.
+
+Run from the Backend directory:
+    python -m benchmarks.bench_trade_log
+    python -m benchmarks.bench_trade_log --bars 100000 1000000 --algorithm MACD
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.bench_backtest import synthetic_bars
+from data_access.models.trading_strategy import ALGORITHMS, TradingStrategy
+
+
+def retained(data, algorithm, compact):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = TradingStrategy(data, 'BENCH', algorithm).run_backtest(compact=compact)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, len(result[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--algorithm', default='MACD', choices=list(ALGORITHMS))
+    args = parser.parse_args()
+
+    print(f"{'bars':>9} {'trades':>8} {'log':>8} {'MB':>8} {'bytes/trade':>12} {'seconds':>8}")
+    for bars in args.bars:
+        data = synthetic_bars(bars)
+        for name, compact in (('dicts', False), ('compact', True)):
+            size, elapsed, trades = retained(data, args.algorithm, compact)
+            print(f"{bars:>9} {trades:>8} {name:>8} {size / 1e6:>8.2f} {size / max(trades, 1):>12.0f} {elapsed:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Load test for the price streaming hub: thousands of concurrent subscribers in
+one process, some of them deliberately slow, fed by PricePublisher.notify.
+
+Run from the Backend directory:
+    python -m benchmarks.load_price_stream --clients 5000 --symbols 50 --ticks 200
+"""
+import argparse
+import random
+import threading
+import time
+
+import numpy as np
+
+from data_access.price_publisher import price_publisher
+from data_access.price_stream import PriceStreamHub
+
+
+def consume(client, slow_delay, stop):
+    while not stop.is_set() and not client.closed:
+        client.next_batch(timeout=0.5)
+        if slow_delay:
+            time.sleep(slow_delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=5000)
+    parser.add_argument('--symbols', type=int, default=50)
+    parser.add_argument('--symbols-per-client', type=int, default=5)
+    parser.add_argument('--ticks', type=int, default=200, help='price updates published per symbol')
+    parser.add_argument('--rate', type=float, default=100.0, help='publish rounds per second')
+    parser.add_argument('--slow-fraction', type=float, default=0.1)
+    parser.add_argument('--slow-delay', type=float, default=0.2, help='seconds a slow client sleeps per batch')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+    hub = PriceStreamHub(price_publisher, tick_interval=0, max_clients=args.clients)
+    stop = threading.Event()
+
+    clients, threads = [], []
+    connect_start = time.perf_counter()
+    for i in range(args.clients):
+        client = hub.connect(rng.sample(symbols, min(args.symbols_per_client, len(symbols))), pump=False)
+        slow = args.slow_delay if i < args.clients * args.slow_fraction else 0
+        thread = threading.Thread(target=consume, args=(client, slow, stop), daemon=True)
+        thread.start()
+        clients.append(client)
+        threads.append(thread)
+    connect_time = time.perf_counter() - connect_start
+
+    notify_latencies = []
+    prices = {symbol: 100.0 for symbol in symbols}
+    publish_start = time.perf_counter()
+    for _ in range(args.ticks):
+        round_start = time.perf_counter()
+        for symbol in symbols:
+            prices[symbol] *= 1 + (rng.random() - 0.5) * 0.0005
+            start = time.perf_counter()
+            price_publisher.notify(symbol, prices[symbol])
+            notify_latencies.append(time.perf_counter() - start)
+        time.sleep(max(0.0, 1 / args.rate - (time.perf_counter() - round_start)))
+    publish_time = time.perf_counter() - publish_start
+
+    time.sleep(1.0)
+    stop.set()
+    for client in clients:
+        hub.disconnect(client)
+    for thread in threads:
+        thread.join(timeout=2)
+
+    latencies = np.array(notify_latencies) * 1000
+    published = args.ticks * len(symbols)
+    offered = sum(client.delivered + client.coalesced + client.dropped for client in clients)
+    print(f"clients:              {args.clients} ({int(args.clients * args.slow_fraction)} slow)")
+    print(f"connect time:         {connect_time:.2f}s")
+    print(f"updates published:    {published} in {publish_time:.2f}s")
+    print(f"fan-out per notify:   p50 {np.percentile(latencies, 50):.3f} ms, p99 {np.percentile(latencies, 99):.3f} ms")
+    print(f"client updates:       {offered} offered, {sum(c.delivered for c in clients)} delivered, "
+          f"{sum(c.coalesced for c in clients)} coalesced, {sum(c.dropped for c in clients)} dropped")
+    print(f"subscriptions left:   {len(hub.symbols())} symbols, {hub.client_count()} clients")
+
+
+if __name__ == '__main__':
+    main()
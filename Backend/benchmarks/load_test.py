@@ -0,0 +1,255 @@
+"""
+HTTP load test for the backend: N concurrent clients posting /run_backtest
+(or /fetch_market_data) for a while, reporting p50/p99 latency and requests
+per second at each concurrency level.
+
+Unless --url points at a running server, one is started on a free port with
+the offline ReplayAdaptee as the upstream (MARKET_DATA_SOURCE=replay:
+fixtures from --fixtures, synthetic bars for other symbols, --latency and
+--jitter standing in for the Yahoo round trip, --failure-rate of fetches
+failing) and empty temporary stores: gunicorn with gunicorn.conf.py where
+available, otherwise the threaded Werkzeug server. Every request key
+is requested once before timing, so the numbers are for warm caches unless
+--distinct gives every request its own SMA parameters.
+
+Run from the Backend directory:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --clients 1 8 64 --duration 10 --workers 4
+    python -m benchmarks.load_test --server werkzeug --endpoint fetch_market_data
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --distinct
+    python -m benchmarks.load_test --fixtures fixtures/ --failure-rate 0.01
+"""
+import argparse
+import contextlib
+import http.client
+import itertools
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from data_access.models.trading_strategy import ALGORITHMS
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def gunicorn_available() -> bool:
+    if sys.platform == 'win32':
+        return False
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@contextlib.contextmanager
+def local_server(args):
+    """
+    Start the backend in a subprocess against the replay source and yield
+    its base URL
+    """
+    port = free_port()
+    data_dir = tempfile.mkdtemp(prefix='load-test-')
+    env = dict(
+        os.environ,
+        MARKET_DATA_SOURCE='replay',
+        REPLAY_FIXTURES=os.path.abspath(args.fixtures) if args.fixtures else '',
+        REPLAY_LATENCY=str(args.latency),
+        REPLAY_JITTER=str(args.jitter),
+        REPLAY_FAILURE_RATE=str(args.failure_rate),
+        MARKET_DATA_DIR=data_dir,
+        SIGNAL_STORE_DIR=os.path.join(data_dir, '_signals'),
+        REQUEST_PROFILING='0',
+        GUNICORN_ACCESS_LOG=''
+    )
+    if args.server == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+                   '--workers', str(args.workers), '--threads', str(args.threads)]
+    else:
+        command = [sys.executable, '-m', 'flask', '--app', 'app', 'run', '--port', str(port), '--with-threads']
+
+    # The Werkzeug server logs every request, so its output goes to a file
+    # rather than a pipe nobody drains
+    log_path = os.path.join(data_dir, 'server.log')
+    url = f'http://127.0.0.1:{port}'
+    with open(log_path, 'wb') as log:
+        process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    try:
+        wait_until_ready(url, process, log_path)
+        yield url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, log_path: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            with open(log_path, 'r', errors='replace') as log:
+                raise RuntimeError(f"Server exited with {process.returncode}: {log.read()[-2000:]}")
+        connection = connect(url)
+        try:
+            if request(connection, 'GET', '/metrics')[0] == 200:
+                return
+        except OSError:
+            pass
+        finally:
+            connection.close()
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not come up within {timeout}s")
+
+
+def connect(url: str) -> http.client.HTTPConnection:
+    parts = urlsplit(url)
+    return http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=120)
+
+
+def request(connection: http.client.HTTPConnection, method: str, path: str,
+            payload: Optional[Dict] = None) -> Tuple[int, bytes]:
+    body = json.dumps(payload).encode('utf-8') if payload is not None else None
+    headers = {'Content-Type': 'application/json'} if body is not None else {}
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+def request_bodies(args) -> List[Tuple[str, Dict]]:
+    """
+    The (path, payload) pairs the clients cycle through
+    """
+    symbols = [f"LOAD{i}" for i in range(args.symbols)]
+    if args.endpoint == 'fetch_market_data':
+        return [('/fetch_market_data', {'symbol': symbol, 'start_date': '2021-01-01', 'end_date': args.end_date,
+                                         'layout': 'columns'}) for symbol in symbols]
+    return [('/run_backtest', {'symbol': symbol, 'end_date': args.end_date, 'algorithm': algorithm})
+            for symbol in symbols for algorithm in ALGORITHMS]
+
+
+def run_level(url: str, bodies: List[Tuple[str, Dict]], clients: int, duration: float, distinct: bool) -> Dict:
+    """
+    clients threads, each on its own keep-alive connection, sending requests
+    back to back for duration seconds
+    """
+    latencies: List[List[float]] = [[] for _ in range(clients)]
+    errors = [0] * clients
+    counter = itertools.count()
+    start_barrier = threading.Barrier(clients + 1)
+
+    def client(n):
+        connection = connect(url)
+        start_barrier.wait()
+        while time.perf_counter() < deadline:
+            i = next(counter)
+            path, payload = bodies[i % len(bodies)]
+            if distinct:
+                # A fresh parameter set per request misses the result cache
+                payload = dict(payload, algorithm='SMA',
+                               params={'short_window': 5 + i % 45, 'long_window': 60 + i // 45 % 200})
+            started = time.perf_counter()
+            try:
+                status, _ = request(connection, 'POST', path, payload)
+            except (OSError, http.client.HTTPException):
+                status = None
+                connection.close()
+                connection = connect(url)
+            latencies[n].append(time.perf_counter() - started)
+            if status != 200:
+                errors[n] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(n,), daemon=True) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    deadline = time.perf_counter() + duration
+    start_barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples = np.array([value for values in latencies for value in values]) * 1000
+    return {
+        'clients': clients,
+        'requests': int(len(samples)),
+        'errors': int(sum(errors)),
+        'rps': len(samples) / elapsed,
+        'p50_ms': float(np.percentile(samples, 50)) if len(samples) else None,
+        'p99_ms': float(np.percentile(samples, 99)) if len(samples) else None
+    }
+
+
+def warm_up(url: str, bodies: List[Tuple[str, Dict]], attempts: int = 5) -> None:
+    connection = connect(url)
+    for path, payload in bodies:
+        # Retried, since an injected upstream failure is not a broken setup
+        for _ in range(attempts):
+            status, body = request(connection, 'POST', path, payload)
+            if status == 200:
+                break
+        else:
+            raise RuntimeError(f"{path} {payload} returned {status}: {body[:500]!r}")
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='load test a running server instead of starting one')
+    parser.add_argument('--server', choices=['gunicorn', 'werkzeug'],
+                        default='gunicorn' if gunicorn_available() else 'werkzeug')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='gunicorn worker processes')
+    parser.add_argument('--threads', type=int, default=8, help='threads per gunicorn worker')
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 8, 64])
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per concurrency level')
+    parser.add_argument('--endpoint', choices=['run_backtest', 'fetch_market_data'], default='run_backtest')
+    parser.add_argument('--symbols', type=int, default=20)
+    parser.add_argument('--end-date', default='2024-01-01')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds each upstream fetch sleeps')
+    parser.add_argument('--jitter', type=float, default=0.0, help='up to this many more seconds per fetch')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='fraction of upstream fetches that fail')
+    parser.add_argument('--fixtures', help='directory of recorded market data files to replay')
+    parser.add_argument('--distinct', action='store_true', help='new SMA parameters on every request')
+    parser.add_argument('--output', help='also write the results as JSON')
+    args = parser.parse_args()
+
+    bodies = request_bodies(args)
+    with contextlib.ExitStack() as stack:
+        url = args.url or stack.enter_context(local_server(args))
+        warm_up(url, bodies)
+        results = [run_level(url, bodies, clients, args.duration, args.distinct) for clients in args.clients]
+
+    server = 'external' if args.url else (
+        f"gunicorn {args.workers}x{args.threads}" if args.server == 'gunicorn' else 'werkzeug threaded')
+    print(f"{args.endpoint} on {server}, {args.duration:.0f}s per level")
+    print(f"{'clients':>8} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for r in results:
+        print(f"{r['clients']:>8} {r['requests']:>9} {r['errors']:>7} {r['rps']:>9.1f} "
+              f"{r['p50_ms'] or 0:>9.2f} {r['p99_ms'] or 0:>9.2f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'endpoint': args.endpoint, 'server': server, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Synthesize a multi-symbol tick load offline with VectorizedPriceSimulator.
+
+Steps every symbol at once, optionally publishing each tick as one batch
+through PricePublisher, and reports throughput. With --output the generated
+(ticks x symbols) price paths are saved as .npy for later replay.
+
+Run from the Backend directory:
+    python -m benchmarks.simulate_ticks --symbols 10000 --ticks 1000 --model gbm --seed 42
+"""
+import argparse
+import time
+
+import numpy as np
+
+from data_access.price_publisher import price_publisher
+from data_access.vectorized_price_simulator import VectorizedPriceSimulator
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, default=10000)
+    parser.add_argument('--ticks', type=int, default=1000)
+    parser.add_argument('--model', choices=['uniform', 'gbm'], default='uniform')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--publish', action='store_true', help='publish each tick through PricePublisher')
+    parser.add_argument('--subscribers', type=int, default=0,
+                        help='no-op subscribers to attach per symbol when publishing')
+    parser.add_argument('--output', help='save the price paths to this .npy file')
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+    initial = np.random.default_rng(args.seed).uniform(10.0, 500.0, args.symbols)
+    simulator = VectorizedPriceSimulator(symbols, initial, model=args.model, seed=args.seed,
+                                         publisher=price_publisher)
+
+    callback = lambda symbol, price: None
+    if args.publish:
+        for symbol in symbols:
+            for _ in range(args.subscribers):
+                price_publisher.subscribe(symbol, callback)
+
+    start = time.perf_counter()
+    paths = simulator.run(args.ticks, publish=args.publish)
+    elapsed = time.perf_counter() - start
+    if args.publish:
+        price_publisher.flush()
+    total = time.perf_counter() - start
+
+    updates = args.ticks * args.symbols
+    print(f"model={args.model} seed={args.seed} symbols={args.symbols} ticks={args.ticks}")
+    print(f"simulated {updates:,} price updates in {elapsed:.3f}s ({updates / elapsed:,.0f} updates/s)")
+    if args.publish:
+        print(f"delivered to {args.subscribers} subscriber(s) per symbol in {total:.3f}s")
+    print(f"final price range: {paths[-1].min():.2f} .. {paths[-1].max():.2f}")
+
+    if args.output:
+        np.save(args.output, paths)
+        print(f"saved {paths.shape} paths to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
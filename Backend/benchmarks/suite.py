@@ -0,0 +1,290 @@
+"""
+Benchmark suite for the data-access and backtest hot paths.
+
+Every benchmark runs offline against SyntheticDataSource. Timings are saved
+as JSON (by default benchmarks/results/<commit>.json), and --compare checks
+them against an earlier run: any benchmark slower than --threshold times the
+baseline is reported as a regression and the exit status is 1, so CI can run
+the suite on each commit against the main branch's results.
+
+Run from the Backend directory:
+    python -m benchmarks.suite
+    python -m benchmarks.suite --filter run_backtest endpoint
+    python -m benchmarks.suite --compare benchmarks/results/<baseline>.json --threshold 1.25
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+
+from flask import Flask
+
+from benchmarks.synthetic_source import SyntheticDataSource
+from data_access.data_access_service import DataAccessService
+from data_access.decorators.validation_decorator import ValidationDecorator
+from data_access.market_data_cache import MarketDataCache
+from data_access.signal_store import SignalStore
+from data_access.models.trading_strategy import ALGORITHMS, TradingStrategy, create_algo
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+START_DATE = '2005-01-01'
+
+# name -> setup(stack, options) returning the zero-argument callable to time;
+# cleanup goes on the ExitStack
+BENCHMARKS: Dict[str, Callable[[contextlib.ExitStack, argparse.Namespace], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# /run_backtest always starts on this date
+BACKTEST_START_DATE = '2021-01-01'
+
+
+def end_date(options, start_date: str = START_DATE) -> str:
+    return f"{int(start_date[:4]) + options.years}-01-01"
+
+
+def fetch_frame(options):
+    return SyntheticDataSource().fetch_market_data('BENCH', START_DATE, end_date(options))
+
+
+@benchmark('validation_decorator.fetch_market_data')
+def bench_validation(stack, options):
+    source = ValidationDecorator(SyntheticDataSource())
+    return lambda: source.fetch_market_data('BENCH', START_DATE, end_date(options))
+
+
+@benchmark('data_access_service.get_market_data[hit]')
+def bench_service_hit(stack, options):
+    service = DataAccessService(ValidationDecorator(SyntheticDataSource()), cache=MarketDataCache())
+    service.get_market_data('BENCH', START_DATE, end_date(options))
+    return lambda: service.get_market_data('BENCH', START_DATE, end_date(options))
+
+
+@benchmark('data_access_service.get_market_data[miss]')
+def bench_service_miss(stack, options):
+    cache = MarketDataCache()
+    service = DataAccessService(ValidationDecorator(SyntheticDataSource()), cache=cache)
+
+    def run():
+        cache.clear()
+        return service.get_market_data('BENCH', START_DATE, end_date(options))
+    return run
+
+
+def register_algorithm_benchmarks(algorithm: str) -> None:
+    @benchmark(f"trading_algo.calculate_signals[{algorithm}]")
+    def bench_signals(stack, options):
+        data = fetch_frame(options)
+        algo = create_algo(algorithm)
+        return lambda: algo.calculate_signals(data)
+
+    @benchmark(f"trading_strategy.run_backtest[{algorithm}]")
+    def bench_backtest(stack, options):
+        data = fetch_frame(options)
+        return lambda: TradingStrategy(data, 'BENCH', algorithm).run_backtest()
+
+
+for name in ALGORITHMS:
+    register_algorithm_benchmarks(name)
+
+
+@benchmark('trading_strategy.save_trades_to_csv[MACD]')
+def bench_save_trades(stack, options):
+    strategy = TradingStrategy(fetch_frame(options), 'BENCH', 'MACD')
+    strategy.run_backtest()
+    directory = stack.enter_context(tempfile.TemporaryDirectory())
+    return lambda: strategy.save_trades_to_csv(directory)
+
+
+def endpoint_client(stack):
+    from controllers import server
+    from data_access.models import market_data_adapter
+
+    service = DataAccessService(ValidationDecorator(SyntheticDataSource()), cache=MarketDataCache())
+    stack.enter_context(mock.patch.object(server, 'shared_data_service', service))
+    stack.enter_context(mock.patch.object(market_data_adapter, 'shared_data_service', service))
+    signal_dir = stack.enter_context(tempfile.TemporaryDirectory())
+    stack.enter_context(mock.patch.object(server, 'signal_store', SignalStore(signal_dir)))
+    app = Flask(__name__)
+    server.configure_routes(app)
+    return app.test_client()
+
+
+def post(client, path, payload):
+    def run():
+        response = client.post(path, json=payload)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        return response.get_data()
+    run()
+    return run
+
+
+@benchmark('endpoint./fetch_market_data')
+def bench_fetch_endpoint(stack, options):
+    client = endpoint_client(stack)
+    return post(client, '/fetch_market_data', {'symbol': 'BENCH', 'start_date': START_DATE, 'end_date': end_date(options)})
+
+
+@benchmark('endpoint./run_backtest[uncached]')
+def bench_backtest_endpoint(stack, options):
+    from data_access.backtest_result_cache import backtest_result_cache
+
+    client = endpoint_client(stack)
+    run = post(client, '/run_backtest', {
+        'symbol': 'BENCH', 'end_date': end_date(options, BACKTEST_START_DATE), 'algorithm': 'MACD'
+    })
+
+    def uncached():
+        backtest_result_cache.clear()
+        return run()
+    stack.callback(backtest_result_cache.clear)
+    return uncached
+
+
+@benchmark('endpoint./run_backtest[cached]')
+def bench_cached_backtest_endpoint(stack, options):
+    from data_access.backtest_result_cache import backtest_result_cache
+
+    client = endpoint_client(stack)
+    stack.callback(backtest_result_cache.clear)
+    return post(client, '/run_backtest', {
+        'symbol': 'BENCH', 'end_date': end_date(options, BACKTEST_START_DATE), 'algorithm': 'MACD'
+    })
+
+
+@benchmark('endpoint./run_portfolio_backtest[20 symbols]')
+def bench_portfolio_endpoint(stack, options):
+    client = endpoint_client(stack)
+    return post(client, '/run_portfolio_backtest', {
+        'symbols': [f"SYM{i}" for i in range(20)],
+        'algorithm': 'SMA',
+        'start_date': START_DATE,
+        'end_date': end_date(options)
+    })
+
+
+def measure(run: Callable[[], object], repeat: int, min_time: float) -> Dict:
+    """
+    Best-of-repeat timing, with enough calls per repeat to last min_time
+    """
+    start = time.perf_counter()
+    run()
+    single = time.perf_counter() - start
+    number = max(1, int(min_time / max(single, 1e-9)))
+    times = [total / number for total in timeit.Timer(run).repeat(repeat=repeat, number=number)]
+    return {
+        'min': min(times),
+        'median': statistics.median(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'number': number,
+        'repeat': repeat
+    }
+
+
+def run_suite(names: List[str], options: argparse.Namespace) -> Dict[str, Dict]:
+    results = {}
+    for name in names:
+        with contextlib.ExitStack() as stack:
+            try:
+                run = BENCHMARKS[name](stack, options)
+                results[name] = measure(run, options.repeat, options.min_time)
+            except Exception as e:
+                results[name] = {'error': str(e)}
+        timing = results[name]
+        summary = f"{timing['min'] * 1000:10.3f} ms" if 'min' in timing else f"ERROR {timing['error']}"
+        print(f"{name:<50} {summary}")
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """
+    Print the change against baseline per benchmark and return the names
+    that got slower than threshold times the baseline
+    """
+    regressions = []
+    print(f"\n{'benchmark':<50} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for name, timing in results.items():
+        before = baseline.get(name, {})
+        if 'min' not in timing or 'min' not in before:
+            continue
+        ratio = timing['min'] / before['min']
+        flag = ''
+        if ratio > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif ratio < 1 / threshold:
+            flag = '  faster'
+        print(f"{name:<50} {before['min'] * 1000:12.3f} {timing['min'] * 1000:12.3f} {ratio:7.2f}{flag}")
+    return regressions
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', nargs='+', help='only run benchmarks whose name contains one of these')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    parser.add_argument('--years', type=int, default=15, help='years of daily bars per symbol')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.1, help='seconds per repeat')
+    parser.add_argument('--output', help='results file (default benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='baseline results file to check for regressions')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio counted as a regression')
+    options = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if not options.filter or any(part in name for part in options.filter)]
+    if options.list:
+        print('\n'.join(names))
+        return 0
+
+    results = run_suite(names, options)
+    commit = git_commit()
+    document = {
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'years': options.years,
+        'results': results
+    }
+    output = options.output or os.path.join(RESULTS_DIR, f"{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+    print(f"\nresults written to {output}")
+
+    if options.compare:
+        with open(options.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], options.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,21 @@
+"""
+Offline stand-in for YahooFinanceAdaptee used by the benchmark suite.
+
+A ReplayAdaptee with no fixtures: every symbol is a seeded random walk over
+business days, in the same layout Yahoo returns (ISO Date strings with the
+exchange offset), so the decorators, caches and endpoints do the same work
+they do in production without touching the network.
+"""
+import os
+from typing import Optional
+
+from data_access.data_adaptees.replay_adaptee import ReplayAdaptee
+
+
+class SyntheticDataSource(ReplayAdaptee):
+    def __init__(self, latency: Optional[float] = None, tz: str = 'America/New_York'):
+        # latency is slept on every fetch, to stand in for the network round
+        # trip; SYNTHETIC_LATENCY sets it when the server builds the source
+        if latency is None:
+            latency = float(os.environ.get('SYNTHETIC_LATENCY', '0'))
+        super().__init__(fixtures_dir='', synthetic=True, latency=latency, jitter=0, failure_rate=0, tz=tz)
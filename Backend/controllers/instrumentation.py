@@ -0,0 +1,145 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+from flask import Response, g, request
+
+from data_access.metrics import metrics, stats_families
+from data_access.market_data_cache import market_data_cache
+from data_access.market_data_store import market_data_store
+from data_access.backtest_result_cache import backtest_result_cache
+from data_access.signal_store import signal_store
+from data_access.price_publisher import price_publisher
+from data_access.fetch_executor import fetch_executor
+from data_access.models.strategy_pattern.registry import strategy_registry
+
+try:
+    from pyinstrument import Profiler as InstrumentProfiler
+except ImportError:
+    InstrumentProfiler = None
+
+PROMETHEUS_MIMETYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Send "X-Profile: cprofile" (or "1") or "X-Profile: pyinstrument" to get the
+# profile of that request back instead of its body. Off unless
+# REQUEST_PROFILING=1, since any client could otherwise profile any request.
+# Streamed responses (e.g. /stream_prices) are never drained into a profile.
+PROFILE_HEADER = 'X-Profile'
+PROFILE_SORT_HEADER = 'X-Profile-Sort'
+PROFILE_LIMIT_HEADER = 'X-Profile-Limit'
+PROFILING_ENABLED = os.environ.get('REQUEST_PROFILING', '0') == '1'
+
+
+def collect_caches():
+    return (
+        stats_families('market_data_cache', market_data_cache.stats(), ('hits', 'misses', 'coalesced', 'evictions'),
+                       'In-memory market data cache')
+        + stats_families('market_data_store', market_data_store.stats(), ('hits', 'partial_hits', 'misses'),
+                         'On-disk market data store')
+        + stats_families('backtest_result_cache', backtest_result_cache.stats(),
+                         ('hits', 'disk_hits', 'misses', 'evictions'), 'Backtest result cache')
+        + stats_families('signal_store', signal_store.stats(), ('hits', 'extensions', 'rebuilds'),
+                         'Materialized signal columns')
+        + stats_families('fetch_executor', fetch_executor.stats(), ('submitted', 'timeouts'),
+                         'Bounded pool for upstream market data fetches')
+        + stats_families('strategy_registry', strategy_registry.stats(), ('hits', 'misses'),
+                         'Shared strategy instances')
+    )
+
+
+def collect_publisher():
+    stats = price_publisher.stats()
+    return [
+        ('price_publisher_queue_depth', 'gauge', 'Undelivered price updates per symbol',
+         [({'symbol': symbol}, s['queue_depth']) for symbol, s in stats.items()]),
+        ('price_publisher_dispatched_total', 'counter', 'Price updates delivered per symbol',
+         [({'symbol': symbol}, s['dispatched']) for symbol, s in stats.items()]),
+        ('price_publisher_dropped_total', 'counter', 'Price updates dropped on full subscriber queues',
+         [({'symbol': symbol}, s['dropped']) for symbol, s in stats.items()]),
+        ('price_publisher_latency_avg_ms', 'gauge', 'Mean time from notify to callback start',
+         [({'symbol': symbol}, s['avg_latency_ms']) for symbol, s in stats.items()]),
+        ('price_publisher_latency_max_ms', 'gauge', 'Longest time from notify to callback start',
+         [({'symbol': symbol}, s['max_latency_ms']) for symbol, s in stats.items()])
+    ]
+
+
+def start_profiler(kind: str):
+    if kind == 'pyinstrument' and InstrumentProfiler is not None:
+        profiler = InstrumentProfiler()
+        profiler.start()
+        return 'pyinstrument', profiler
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return 'cprofile', profiler
+
+
+def profile_report(kind: str, profiler, sort: str, limit: int) -> str:
+    if kind == 'pyinstrument':
+        profiler.stop()
+        return profiler.output_text(unicode=True, color=False)
+    profiler.disable()
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    try:
+        stats.sort_stats(sort)
+    except KeyError:
+        stats.sort_stats('cumulative')
+    stats.print_stats(limit)
+    return out.getvalue()
+
+
+def configure_instrumentation(app):
+    """
+    Count and time every request, serve /metrics in the Prometheus text
+    format and profile single requests on demand
+    """
+    metrics.register_collector('caches', collect_caches)
+    metrics.register_collector('price_publisher', collect_publisher)
+
+    @app.before_request
+    def start_request():
+        g.request_started = time.perf_counter()
+        kind = request.headers.get(PROFILE_HEADER)
+        if kind and PROFILING_ENABLED:
+            g.profiler = start_profiler(kind.lower())
+
+    @app.after_request
+    def finish_request(response):
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        profiler = g.pop('profiler', None)
+        if profiler is not None and response.is_streamed:
+            # The body may never end, so there is nothing to profile
+            kind, active = profiler
+            active.stop() if kind == 'pyinstrument' else active.disable()
+            response.headers['X-Profiler'] = 'skipped: streamed response'
+        elif profiler is not None:
+            kind, active = profiler
+            limit = request.headers.get(PROFILE_LIMIT_HEADER, '50')
+            report = profile_report(kind, active, request.headers.get(PROFILE_SORT_HEADER, 'cumulative'),
+                                    int(limit) if limit.isdigit() else 50)
+            profiled_status = response.status_code
+            response = Response(report, status=200, mimetype='text/plain')
+            response.headers['X-Profiler'] = kind
+            response.headers['X-Profiled-Status'] = str(profiled_status)
+
+        started = g.pop('request_started', None)
+        if started is not None:
+            # Streamed responses are timed until their first byte is ready
+            metrics.observe('http_request_duration_seconds', time.perf_counter() - started,
+                            'Time to build the response', endpoint=endpoint)
+        metrics.increment('http_requests_total', help='Requests handled', method=request.method,
+                          endpoint=endpoint, status=response.status_code)
+        return response
+
+    @app.teardown_request
+    def stop_profiler(exc):
+        # after_request is skipped when the view raises; never leave a profiler running
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            kind, active = profiler
+            active.stop() if kind == 'pyinstrument' else active.disable()
+
+    @app.route('/metrics', methods=['GET'])
+    def get_metrics():
+        return Response(metrics.render(), content_type=PROMETHEUS_MIMETYPE)
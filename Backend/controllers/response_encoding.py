@@ -0,0 +1,102 @@
+import gzip
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List
+import numpy as np
+import pandas as pd
+from flask import Response, request
+from data_access.metrics import metrics
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+# Bodies smaller than this are sent as is; gzip costs more than it saves
+GZIP_MIN_BYTES = int(os.environ.get('RESPONSE_GZIP_MIN_BYTES', 64 * 1024))
+GZIP_LEVEL = int(os.environ.get('RESPONSE_GZIP_LEVEL', 1))
+
+
+def frame_to_records(data: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Same list of row dicts as data.to_dict(orient='records'), built from the
+    column arrays in one pass
+    """
+    names = list(data.columns)
+    columns = [data[name].to_numpy().tolist() for name in names]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def frame_to_columns(data: pd.DataFrame) -> Dict[str, list]:
+    """
+    Columnar layout, e.g. {"Date": [...], "Close": [...]}
+    """
+    return {name: data[name].to_numpy().tolist() for name in data.columns}
+
+
+def _to_builtin(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Type is not serializable: {type(value).__name__}")
+
+
+def encode_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_to_builtin, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, default=_to_builtin, separators=(',', ':')).encode('utf-8')
+
+
+def ndjson_chunks(chunks: Iterable[pd.DataFrame], layout: str = 'rows') -> Iterator[bytes]:
+    """
+    NDJSON body from a stream of frames: one line per row, or with
+    layout='columns' one columnar block per frame
+    """
+    for chunk in chunks:
+        if layout == 'columns':
+            yield encode_json(frame_to_columns(chunk)) + b'\n'
+        else:
+            yield b''.join(encode_json(record) + b'\n' for record in frame_to_records(chunk))
+
+
+def encode_msgpack(payload: Any) -> bytes:
+    return msgpack.packb(payload, default=_to_builtin, use_bin_type=True)
+
+
+def negotiate_mimetype() -> str:
+    """
+    JSON unless the client explicitly prefers msgpack and it is installed
+    """
+    if msgpack is None:
+        return JSON_MIMETYPE
+    best = request.accept_mimetypes.best_match((JSON_MIMETYPE,) + MSGPACK_MIMETYPES, default=JSON_MIMETYPE)
+    if best in MSGPACK_MIMETYPES and request.accept_mimetypes[best] > request.accept_mimetypes[JSON_MIMETYPE]:
+        return best
+    return JSON_MIMETYPE
+
+
+def encode_response(payload: Any, status: int = 200) -> Response:
+    """
+    Serialize the payload in the format the Accept header asks for,
+    gzip-compressed when it is large and the client accepts gzip
+    """
+    with metrics.stage('encode'):
+        mimetype = negotiate_mimetype()
+        body = encode_msgpack(payload) if mimetype in MSGPACK_MIMETYPES else encode_json(payload)
+
+        response = Response(body, status=status, mimetype=mimetype)
+        response.vary.add('Accept')
+        response.vary.add('Accept-Encoding')
+        if len(body) >= GZIP_MIN_BYTES and 'gzip' in request.accept_encodings:
+            response.set_data(gzip.compress(body, compresslevel=GZIP_LEVEL))
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
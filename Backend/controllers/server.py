@@ -1,11 +1,52 @@
+import json
 from datetime import datetime
-from flask import request, jsonify
+from flask import Response, request, jsonify, stream_with_context
 
-from data_access.models.market_data_adapter import MarketDataAdapter
-from data_access.models.trading_strategy import TradingStrategy
-from data_access.price_subscriber import price_subscriber
+from data_access.models.market_data_adapter import MarketDataAdapter, shared_data_service
+from data_access.models.trading_strategy import TradingStrategy, ALGORITHMS
+from data_access.models.strategy_pattern.registry import strategy_registry
+from data_access.models.parameter_sweep import expand_grid, run_sweep
+from data_access.models.walk_forward import run_walk_forward
+from data_access.models.monte_carlo import run_monte_carlo, METHODS as MONTE_CARLO_METHODS
+from data_access.models.batch_backtest import run_batch
+from data_access.models.portfolio_backtest import PortfolioBacktest, POSITION_SIZERS, fetch_frames
+from data_access.price_stream import StreamLimitError, price_stream_hub
+from data_access.backtest_result_cache import backtest_result_cache
+from data_access.signal_store import signal_store
+from data_access.symbols import is_valid_symbol
+from controllers.instrumentation import configure_instrumentation
+from controllers.response_encoding import encode_response, frame_to_records, frame_to_columns, ndjson_chunks
+
+def optional_int(data, name, default=None, minimum=1):
+    """
+    data[name] as an integer of at least minimum, or default when it is
+    missing; raises ValueError for anything else
+    """
+    value = data.get(name, default)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"{name} must be an integer.")
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer.")
+    if value < minimum:
+        raise ValueError(f"{name} must be at least {minimum}.")
+    return value
+
+def invalid_symbols(symbols):
+    """
+    A 400 response naming the symbols that are not plain tickers, or None
+    """
+    invalid = [symbol for symbol in symbols if not is_valid_symbol(symbol)]
+    if invalid:
+        return jsonify({'error': f"Invalid symbols: {', '.join(map(str, invalid))}"}), 400
+    return None
 
 def configure_routes(app):
+    configure_instrumentation(app)
+
     @app.route('/fetch_market_data', methods=['POST'])
     def fetch_market_data():
         try:
@@ -15,16 +56,39 @@ def configure_routes(app):
                 
             symbol = data.get('symbol')
             end_date = data.get('end_date')
-            start_date = '2021-01-01'
+            start_date = data.get('start_date') or '2021-01-01'
 
             if not symbol or not end_date:
                 return jsonify({'error': 'Symbol and end_date are required.'}), 400
+            error = invalid_symbols([symbol])
+            if error:
+                return error
+
+            try:
+                start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+                end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+                if end_dt < start_dt:
+                    return jsonify({'error': 'end_date must be after start_date.'}), 400
+            except ValueError:
+                return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+
+            if data.get('stream'):
+                try:
+                    chunk_rows = min(optional_int(data, 'chunk_rows', 5000), 100000)
+                except ValueError as e:
+                    return jsonify({'error': str(e)}), 400
+                return stream_market_data(symbol, start_date, end_date, chunk_rows, data)
 
             market_data = MarketDataAdapter(symbol, start_date, end_date)
             data_df = market_data.fetch_data()
-            market_data_json = data_df.to_dict(orient='records')
 
-            return jsonify({
+            # Rows for the frontend by default; 'columns' is much cheaper for long histories
+            if data.get('layout') == 'columns':
+                market_data_json = frame_to_columns(data_df)
+            else:
+                market_data_json = frame_to_records(data_df)
+
+            return encode_response({
                 'status': 'success',
                 'data': market_data_json,
                 'trade_log': [],
@@ -34,6 +98,24 @@ def configure_routes(app):
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
+    def stream_market_data(symbol, start_date, end_date, chunk_rows, data):
+        chunks = shared_data_service.iter_market_data(symbol, start_date, end_date, chunk_rows)
+
+        # Pull the first chunk now so fetch errors still get a proper status code
+        first = next(chunks, None)
+
+        def generate():
+            if first is not None:
+                yield from ndjson_chunks([first], data.get('layout', 'rows'))
+            yield from ndjson_chunks(chunks, data.get('layout', 'rows'))
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    @app.route('/strategies', methods=['GET'])
+    def list_strategies():
+        # Names, parameters with their defaults and required indicators
+        return encode_response({'status': 'success', 'strategies': strategy_registry.describe_all()}, 200)
+
     @app.route('/run_backtest', methods=['POST'])
     def run_backtest():
         data = request.get_json()
@@ -44,6 +126,14 @@ def configure_routes(app):
 
         if not symbol or not end_date or not algorithm:
             return jsonify({'error': 'Symbol, end_date, and algorithm are required.'}), 400
+        error = invalid_symbols([symbol])
+        if error:
+            return error
+        try:
+            # Checked the same way as sweep grids
+            params = strategy_registry.validate_params(algorithm, data.get('params'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         try:
             start_dt = datetime.strptime(start_date, '%Y-%m-%d')
@@ -58,26 +148,359 @@ def configure_routes(app):
             market_data = MarketDataAdapter(symbol, start_date, end_date)
             data_df = market_data.fetch_data()
 
-            # Run backtest
-            strategy = TradingStrategy(data_df, symbol, algorithm)
-            final_balance, trade_log, total_gain_loss, annual_return, total_return = strategy.run_backtest()
+            # Run backtest, reusing the result if this exact data was backtested
+            # before and otherwise the materialized signals for the series
+            def backtest():
+                signals = signal_store.get_signals(data_df, symbol, algorithm, params)
+                return TradingStrategy(data_df, symbol, algorithm, params, signals=signals).run_backtest(compact=True)
+
+            cache_key = backtest_result_cache.make_key(data_df, symbol, algorithm, params)
+            final_balance, trade_log, total_gain_loss, annual_return, total_return = backtest_result_cache.get_or_compute(
+                cache_key,
+                backtest
+            )
 
             response = {
                 'status': 'success',
-                'trade_log': trade_log,
+                'trade_log': trade_log.to_dicts(),
                 'final_balance': final_balance,
                 'total_gain_loss': total_gain_loss,
                 'annual_return': annual_return,
                 'total_return': total_return
             }
-            return jsonify(response), 200
+            return encode_response(response, 200)
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
-    def price_update_callback(symbol: str, price: float):
-        print(f"Price update for {symbol}: ${price:.2f}")
-        # Here you could emit the price via websocket if needed
-    
+    @app.route('/run_sweep', methods=['POST'])
+    def run_parameter_sweep():
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+
+        symbol = data.get('symbol')
+        end_date = data.get('end_date')
+        grids = data.get('grids')
+        start_date = '2021-01-01'
+
+        if not symbol or not end_date or not grids:
+            return jsonify({'error': 'Symbol, end_date, and grids are required.'}), 400
+        error = invalid_symbols([symbol])
+        if error:
+            return error
+        if not isinstance(grids, dict) or not all(isinstance(grid, dict) for grid in grids.values()):
+            return jsonify({'error': 'grids must map algorithm names to parameter grids.'}), 400
+        try:
+            # Checked before any market data is fetched
+            expand_grid(grids)
+            # Capped at the CPU count by run_sweep
+            processes = optional_int(data, 'processes')
+            top_n = optional_int(data, 'top_n')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+            end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+            if end_dt < start_dt:
+                return jsonify({'error': 'end_date must be after start_date.'}), 400
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+
+        try:
+            # Fetch market data once for every combination
+            market_data = MarketDataAdapter(symbol, start_date, end_date)
+            data_df = market_data.fetch_data()
+
+            results = run_sweep(
+                data_df,
+                grids,
+                processes=processes,
+                rank_by=data.get('rank_by', 'total_return'),
+                top_n=top_n
+            )
+            return jsonify({
+                'status': 'success',
+                'symbol': symbol,
+                'results': results
+            }), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/run_walk_forward', methods=['POST'])
+    def run_walk_forward_analysis():
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+
+        symbol = data.get('symbol')
+        end_date = data.get('end_date')
+        grids = data.get('grids')
+        start_date = data.get('start_date', '2021-01-01')
+        train_bars = data.get('train_bars')
+        test_bars = data.get('test_bars')
+
+        if not symbol or not end_date or not grids or not train_bars or not test_bars:
+            return jsonify({'error': 'Symbol, end_date, grids, train_bars and test_bars are required.'}), 400
+        error = invalid_symbols([symbol])
+        if error:
+            return error
+        if not isinstance(grids, dict) or not all(isinstance(grid, dict) for grid in grids.values()):
+            return jsonify({'error': 'grids must map algorithm names to parameter grids.'}), 400
+        try:
+            expand_grid(grids)
+            train_bars = optional_int(data, 'train_bars')
+            test_bars = optional_int(data, 'test_bars')
+            step_bars = optional_int(data, 'step_bars')
+            # Test windows are compounded one after another, so they may not overlap
+            if step_bars is not None and step_bars < test_bars:
+                raise ValueError(f"step_bars must be at least test_bars ({test_bars}).")
+            # Capped at the CPU count by run_walk_forward
+            processes = optional_int(data, 'processes')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+            end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+            if end_dt < start_dt:
+                return jsonify({'error': 'end_date must be after start_date.'}), 400
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+
+        try:
+            market_data = MarketDataAdapter(symbol, start_date, end_date)
+            data_df = market_data.fetch_data()
+
+            result = run_walk_forward(
+                data_df,
+                grids,
+                train_bars,
+                test_bars,
+                step_bars=step_bars,
+                anchored=bool(data.get('anchored', False)),
+                rank_by=data.get('rank_by', 'total_return'),
+                processes=processes
+            )
+            return jsonify({'status': 'success', 'symbol': symbol, **result}), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/run_monte_carlo', methods=['POST'])
+    def run_monte_carlo_simulation():
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+
+        symbol = data.get('symbol')
+        end_date = data.get('end_date')
+        algorithm = data.get('algorithm')
+        method = data.get('method', 'bootstrap')
+        start_date = data.get('start_date', '2021-01-01')
+
+        if not symbol or not end_date or not algorithm:
+            return jsonify({'error': 'Symbol, end_date, and algorithm are required.'}), 400
+        error = invalid_symbols([symbol])
+        if error:
+            return error
+        if algorithm not in ALGORITHMS:
+            return jsonify({'error': f"Invalid algorithm. Choose from {list(ALGORITHMS)}."}), 400
+        if method not in MONTE_CARLO_METHODS:
+            return jsonify({'error': f"Invalid method. Choose from {MONTE_CARLO_METHODS}."}), 400
+        try:
+            params = strategy_registry.validate_params(algorithm, data.get('params'))
+            runs = min(optional_int(data, 'runs', 1000), 100000)
+            block_bars = optional_int(data, 'block_bars', 20)
+            seed = optional_int(data, 'seed', minimum=0)
+            # Capped at the CPU count by run_monte_carlo
+            processes = optional_int(data, 'processes')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+            end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+            if end_dt < start_dt:
+                return jsonify({'error': 'end_date must be after start_date.'}), 400
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+
+        try:
+            market_data = MarketDataAdapter(symbol, start_date, end_date)
+            data_df = market_data.fetch_data()
+
+            result = run_monte_carlo(
+                data_df,
+                algorithm,
+                params=params,
+                method=method,
+                runs=runs,
+                block_bars=block_bars,
+                seed=seed,
+                processes=processes,
+                include_samples=bool(data.get('include_samples', False))
+            )
+            return jsonify({'status': 'success', 'symbol': symbol, **result}), 200
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/run_batch_backtest', methods=['POST'])
+    def run_batch_backtest():
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+
+        symbols = data.get('symbols')
+        algorithms = data.get('algorithms')
+        end_date = data.get('end_date')
+        start_date = '2021-01-01'
+
+        if not symbols or not algorithms or not end_date:
+            return jsonify({'error': 'Symbols, algorithms, and end_date are required.'}), 400
+        if not isinstance(symbols, list) or not isinstance(algorithms, list):
+            return jsonify({'error': 'Symbols and algorithms must be lists.'}), 400
+        error = invalid_symbols(symbols)
+        if error:
+            return error
+        if not all(isinstance(a, str) or (isinstance(a, dict) and isinstance(a.get('params') or {}, dict))
+                   for a in algorithms):
+            return jsonify({'error': 'Algorithms must be names or {"algorithm", "params"} objects.'}), 400
+        names = [a if isinstance(a, str) else a.get('algorithm') for a in algorithms]
+        if any(not isinstance(name, str) or name not in ALGORITHMS for name in names):
+            return jsonify({'error': f"Invalid algorithm. Choose from {list(ALGORITHMS)}."}), 400
+        try:
+            max_workers = min(optional_int(data, 'max_workers', 16), 64)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+            end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+            if end_dt < start_dt:
+                return jsonify({'error': 'end_date must be after start_date.'}), 400
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+
+        results = run_batch(
+            shared_data_service,
+            symbols,
+            algorithms,
+            start_date,
+            end_date,
+            max_workers=max_workers,
+            include_trades=bool(data.get('include_trades', False))
+        )
+
+        # One JSON document per line, sent as each symbol finishes
+        def generate():
+            for result in results:
+                yield json.dumps(result, default=lambda value: value.item()) + '\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    @app.route('/run_portfolio_backtest', methods=['POST'])
+    def run_portfolio_backtest():
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+
+        symbols = data.get('symbols')
+        algorithm = data.get('algorithm')
+        end_date = data.get('end_date')
+        start_date = data.get('start_date', '2021-01-01')
+        sizing = data.get('sizing', 'equal_weight')
+        rebalance_every = data.get('rebalance_every')
+
+        if not symbols or not algorithm or not end_date:
+            return jsonify({'error': 'Symbols, algorithm, and end_date are required.'}), 400
+        if not isinstance(symbols, list):
+            return jsonify({'error': 'Symbols must be a list.'}), 400
+        error = invalid_symbols(symbols)
+        if error:
+            return error
+        if sizing not in POSITION_SIZERS:
+            return jsonify({'error': f"Invalid sizing. Choose from {list(POSITION_SIZERS)}."}), 400
+        if rebalance_every is not None and (not isinstance(rebalance_every, int) or rebalance_every < 1):
+            return jsonify({'error': 'rebalance_every must be a positive number of bars.'}), 400
+        try:
+            params = strategy_registry.validate_params(algorithm, data.get('params'))
+            max_workers = min(optional_int(data, 'max_workers', 16), 64)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+            end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+            if end_dt < start_dt:
+                return jsonify({'error': 'end_date must be after start_date.'}), 400
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+
+        try:
+            frames, errors = fetch_frames(
+                shared_data_service,
+                symbols,
+                start_date,
+                end_date,
+                max_workers=max_workers
+            )
+            if not frames:
+                return jsonify({'error': 'No market data for any symbol.', 'errors': errors}), 404
+
+            portfolio = PortfolioBacktest.from_frames(
+                frames,
+                algorithm,
+                params=params,
+                sizing=sizing,
+                sizing_params=data.get('sizing_params'),
+                rebalance_every=rebalance_every,
+                commission=float(data.get('commission', 0.0))
+            )
+            result = portfolio.run(include_trades=bool(data.get('include_trades', False)))
+            result['status'] = 'success'
+            result['errors'] = errors
+            return encode_response(result, 200)
+        except (ValueError, TypeError) as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/stream_prices', methods=['GET'])
+    def stream_prices():
+        symbols = [symbol.strip() for symbol in request.args.get('symbols', '').split(',') if symbol.strip()]
+        if not symbols:
+            return jsonify({'error': 'At least one symbol is required.'}), 400
+
+        try:
+            client = price_stream_hub.connect(symbols)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except StreamLimitError as e:
+            # Keeps threads free for every other request on this worker
+            return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+
+        # Server-sent events; the keep-alive comment lets us notice clients that went away
+        def generate():
+            try:
+                yield 'retry: 2000\n\n'
+                while True:
+                    updates = client.next_batch(timeout=15)
+                    if not updates:
+                        yield ': keep-alive\n\n'
+                        continue
+                    for symbol, price in updates:
+                        yield f"event: price\ndata: {json.dumps({'symbol': symbol, 'price': float(price)})}\n\n"
+            finally:
+                price_stream_hub.disconnect(client)
+
+        return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
     @app.route('/get_last_closing_price', methods=['POST'])
     def get_last_closing_price():
         try:
@@ -86,13 +509,12 @@ def configure_routes(app):
             
             if not symbol:
                 return jsonify({'error': 'Symbol is required.'}), 400
+            error = invalid_symbols([symbol])
+            if error:
+                return error
 
             from data_access.simulate_market_price import price_simulator
-            
-            # Subscribe to price updates
-            price_subscriber.symbol = symbol
-            price_subscriber.subscribe(price_update_callback)
-            
+
             # Get initial price
             price = price_simulator.get_last_closing_price(symbol)
             print(f"Initial price for {symbol}: ${price:.2f}")
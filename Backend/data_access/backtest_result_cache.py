@@ -0,0 +1,201 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from data_access.models.trade_log import TradeLog
+from data_access.models.trading_strategy import ALGORITHMS
+
+logger = logging.getLogger(__name__)
+
+BacktestResult = Tuple[float, Union[TradeLog, list], float, float, float]
+
+
+def data_digest(data: pd.DataFrame) -> str:
+    """
+    Content hash of a market data frame; any changed value, added bar or
+    renamed column gives a different digest
+    """
+    digest = hashlib.sha256()
+    for name in data.columns:
+        values = data[name].to_numpy()
+        digest.update(f"{name}:{values.dtype}:{len(values)}".encode('utf-8'))
+        if values.dtype == object:
+            # Hashing the joined strings is several times faster than hash_pandas_object
+            digest.update('\x00'.join(map(str, values.tolist())).encode('utf-8'))
+        else:
+            digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+def canonical_params(algorithm: str, params: Optional[Dict]) -> Dict:
+    """
+    Params with the algorithm's defaults filled in, so {} and the explicit
+    default values share a cache entry
+    """
+    params = dict(params or {})
+    if algorithm not in ALGORITHMS:
+        return params
+    try:
+        bound = inspect.signature(ALGORITHMS[algorithm]).bind(**params)
+    except TypeError:
+        return params
+    bound.apply_defaults()
+    return dict(bound.arguments)
+
+
+def _to_builtin(value):
+    if isinstance(value, TradeLog):
+        return value.to_dicts()
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Type is not serializable: {type(value).__name__}")
+
+
+class BacktestResultCache:
+    """
+    Thread-safe LRU cache of run_backtest results.
+
+    Results computed with compact=True keep their TradeLog, which is what
+    makes holding a thousand entries affordable; entries read back from
+    disk are turned into a TradeLog as well.
+
+    Keys hash the market data itself together with the symbol, algorithm and
+    params, so when the stored data changes (new bars, corrections) the next
+    request simply misses and stale entries age out of the LRU. With a
+    directory the results are also written there as JSON, so a restarted
+    server starts warm.
+    """
+
+    def __init__(self, max_entries: int = 1024, directory: Optional[str] = None, max_disk_entries: int = 10000):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, BacktestResult]' = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def make_key(self, data: pd.DataFrame, symbol: str, algorithm: str, params: Optional[Dict] = None) -> str:
+        payload = json.dumps({
+            'symbol': symbol,
+            'algorithm': algorithm,
+            'params': canonical_params(algorithm, params),
+            'data': data_digest(data)
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_or_compute(self, key: str, compute: Callable[[], BacktestResult]) -> BacktestResult:
+        """
+        Return the cached result for key, running compute on a miss
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._copy(result)
+
+        result = self._read(key)
+        if result is not None:
+            with self._lock:
+                self.disk_hits += 1
+                self._put(key, result)
+            return self._copy(result)
+
+        with self._lock:
+            self.misses += 1
+        result = compute()
+        with self._lock:
+            self._put(key, result)
+        self._write(key, result)
+        return self._copy(result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries
+            }
+
+    def _put(self, key: str, result: BacktestResult) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _copy(self, result: BacktestResult) -> BacktestResult:
+        # Copying keeps callers from editing the cached log
+        final_balance, trade_log, total_gain_loss, annual_return, total_return = result
+        if isinstance(trade_log, TradeLog):
+            trade_log = trade_log.copy()
+        else:
+            trade_log = [dict(trade) for trade in trade_log]
+        return final_balance, trade_log, total_gain_loss, annual_return, total_return
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, key: str) -> Optional[BacktestResult]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), 'r') as f:
+                final_balance, trade_log, total_gain_loss, annual_return, total_return = json.load(f)
+            return final_balance, TradeLog.from_dicts(trade_log), total_gain_loss, annual_return, total_return
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Error reading cached backtest {key}: {str(e)}")
+            return None
+
+    def _write(self, key: str, result: BacktestResult) -> None:
+        if not self.directory:
+            return
+        tmp_path = f"{self._path(key)}.tmp-{uuid.uuid4().hex}"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(list(result), f, default=_to_builtin)
+            os.replace(tmp_path, self._path(key))
+            self._prune_disk()
+        except Exception as e:
+            logger.warning(f"Error writing cached backtest {key}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _prune_disk(self) -> None:
+        files = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.json')]
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:len(files) - self.max_disk_entries]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+# Create a global instance
+backtest_result_cache = BacktestResultCache(
+    max_entries=int(os.environ.get('BACKTEST_CACHE_ENTRIES', 1024)),
+    directory=os.environ.get('BACKTEST_CACHE_DIR') or None
+)
@@ -0,0 +1,173 @@
+import json
+import os
+from typing import Optional, Union
+import numpy as np
+import pandas as pd
+from .columnar_io import save_columns, load_columns, read_manifest, MANIFEST_FILE
+
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close')
+BAR_COLUMNS = ('Timestamp',) + PRICE_COLUMNS + ('Volume',)
+
+
+def to_nanoseconds(interval: Union[str, int, pd.Timedelta]) -> int:
+    """
+    Bar size in nanoseconds from e.g. '5min', '1h', pd.Timedelta or an int
+    """
+    if isinstance(interval, (int, np.integer)):
+        return int(interval)
+    return int(pd.Timedelta(interval).value)
+
+
+class BarSeries:
+    """
+    OHLCV bars held as plain arrays: int64 epoch-nanosecond timestamps (UTC),
+    float32 or float64 prices and volumes.
+
+    Unlike the ISO-string Date frames the daily pipeline uses, nothing has to
+    be parsed per row, and a saved series is memory-mapped on load, so tens of
+    millions of minute bars or ticks cost no RAM until a slice is touched.
+    tz is only used to turn timestamps back into local dates.
+    """
+
+    def __init__(self, timestamps, open, high, low, close, volume, tz: str = 'UTC'):
+        self.timestamps = np.asanyarray(timestamps, dtype=np.int64)
+        self.open = np.asanyarray(open)
+        self.high = np.asanyarray(high)
+        self.low = np.asanyarray(low)
+        self.close = np.asanyarray(close)
+        self.volume = np.asanyarray(volume)
+        self.tz = tz
+        lengths = {len(column) for column in self._columns()}
+        if len(lengths) > 1:
+            raise ValueError("All bar columns must have the same length.")
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, price_dtype=np.float64, tz: str = 'America/New_York') -> 'BarSeries':
+        """
+        Convert a market data frame with a Date column (ISO strings or
+        datetimes). tz is the exchange time zone: naive dates are taken to be
+        local to it, and it is used to turn timestamps back into dates.
+        """
+        first = pd.Timestamp(data['Date'].iloc[0]) if len(data) else None
+        if first is not None and first.tz is None:
+            dates = pd.to_datetime(data['Date']).dt.tz_localize(tz)
+        else:
+            dates = pd.to_datetime(data['Date'], utc=True)
+        volume = data['Volume'].to_numpy() if 'Volume' in data else np.zeros(len(data), dtype=np.int64)
+        return cls(
+            dates.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy().astype('datetime64[ns]').view(np.int64),
+            *(data[name].to_numpy(dtype=price_dtype) if name in data else data['Close'].to_numpy(dtype=price_dtype)
+              for name in PRICE_COLUMNS),
+            volume,
+            tz=tz
+        )
+
+    @classmethod
+    def from_ticks(cls, timestamps, prices, sizes=None, tz: str = 'UTC') -> 'BarSeries':
+        """
+        One zero-length bar per trade; resample() turns them into real bars
+        """
+        prices = np.asarray(prices)
+        sizes = np.zeros(len(prices), dtype=np.int64) if sizes is None else np.asarray(sizes)
+        return cls(timestamps, prices, prices, prices, prices, sizes, tz=tz)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'BarSeries':
+        manifest = read_manifest(directory)
+        if manifest is None:
+            raise FileNotFoundError(f"No bar data in {directory}")
+        columns = load_columns(directory, mmap=mmap)
+        return cls(*(columns[name] for name in BAR_COLUMNS), tz=manifest.get('tz', 'UTC'))
+
+    @classmethod
+    def allocate(cls, directory: str, rows: int, price_dtype=np.float64, tz: str = 'UTC') -> 'BarSeries':
+        """
+        Create writable memory-mapped columns on disk to fill in place, e.g.
+        chunk by chunk from a tick feed larger than RAM. Call flush() when done.
+        """
+        os.makedirs(directory, exist_ok=True)
+        dtypes = {'Timestamp': np.int64, 'Volume': np.int64}
+        columns = {
+            name: np.lib.format.open_memmap(os.path.join(directory, f"{name}.npy"), mode='w+',
+                                            dtype=dtypes.get(name, price_dtype), shape=(rows,))
+            for name in BAR_COLUMNS
+        }
+        with open(os.path.join(directory, MANIFEST_FILE), 'w') as f:
+            json.dump({'columns': list(BAR_COLUMNS), 'rows': rows, 'tz': tz}, f)
+        return cls(*(columns[name] for name in BAR_COLUMNS), tz=tz)
+
+    def save(self, directory: str) -> None:
+        save_columns(pd.DataFrame(dict(zip(BAR_COLUMNS, self._columns())), copy=False), directory, extra={'tz': self.tz})
+
+    def flush(self) -> None:
+        for column in self._columns():
+            if isinstance(column, np.memmap):
+                column.flush()
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def slice(self, start: int, stop: Optional[int] = None) -> 'BarSeries':
+        """
+        Rows [start, stop) as views; nothing is copied
+        """
+        return BarSeries(*(column[start:stop] for column in self._columns()), tz=self.tz)
+
+    def locate(self, when) -> int:
+        """
+        Index of the first bar at or after when (timestamp, string or ns)
+        """
+        if not isinstance(when, (int, np.integer)):
+            when = pd.Timestamp(when)
+            when = (when.tz_localize(self.tz) if when.tz is None else when).value
+        return int(np.searchsorted(self.timestamps, when, side='left'))
+
+    def resample(self, interval: Union[str, int, pd.Timedelta]) -> 'BarSeries':
+        """
+        Aggregate into bars of a fixed size counted from the Unix epoch
+        (open=first, high=max, low=min, close=last, volume=sum); empty
+        intervals produce no bar. Timestamps must be sorted.
+        """
+        if len(self) == 0:
+            return self.slice(0, 0)
+        bar_ns = to_nanoseconds(interval)
+        if bar_ns <= 0:
+            raise ValueError("Resample interval must be positive.")
+        buckets = np.floor_divide(self.timestamps, bar_ns)
+        starts = np.flatnonzero(np.diff(buckets)) + 1
+        starts = np.concatenate(([0], starts))
+        ends = np.concatenate((starts[1:], [len(self)])) - 1
+        return BarSeries(
+            buckets[starts] * bar_ns,
+            self.open[starts],
+            np.maximum.reduceat(self.high, starts),
+            np.minimum.reduceat(self.low, starts),
+            self.close[ends],
+            np.add.reduceat(self.volume, starts),
+            tz=self.tz
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Frame in the daily pipeline's layout, with ISO Date strings in tz
+        """
+        dates = pd.to_datetime(self.timestamps, utc=True).tz_convert(self.tz)
+        return pd.DataFrame({
+            'Date': [date.isoformat() for date in dates],
+            **{name: np.asarray(column) for name, column in zip(PRICE_COLUMNS, self._columns()[1:5])},
+            'Volume': np.asarray(self.volume)
+        })
+
+    def format_dates(self, indices, fmt: str = '%m/%d/%Y') -> list:
+        """
+        Local calendar dates of the given rows, formatted like the trade log
+        """
+        dates = pd.to_datetime(self.timestamps[np.asarray(indices, dtype=np.int64)], utc=True).tz_convert(self.tz)
+        if fmt != '%m/%d/%Y':
+            return list(dates.strftime(fmt))
+        # strftime costs microseconds per row; slicing ISO day strings is far cheaper
+        days = np.datetime_as_string(dates.tz_localize(None).to_numpy().astype('datetime64[D]'))
+        return [f"{day[5:7]}/{day[8:10]}/{day[:4]}" for day in days.tolist()]
+
+    def _columns(self):
+        return (self.timestamps, self.open, self.high, self.low, self.close, self.volume)
@@ -0,0 +1,170 @@
+import json
+import os
+import shutil
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+MANIFEST_FILE = 'columns.json'
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock on the file at path (created if missing), so
+    server processes sharing a store directory, e.g. gunicorn workers, take
+    turns. Every call opens its own descriptor, so threads exclude each other
+    too. Without fcntl (Windows) this does not lock.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a') as f:
+        if HAS_FCNTL:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        # Closing the file releases the lock
+        yield
+
+
+def save_columns(data: pd.DataFrame, directory: str, extra: Optional[dict] = None) -> None:
+    """
+    Write every column of the frame to its own .npy file inside directory.
+
+    The files are written to a sibling temp directory first and swapped in, so
+    readers never see a half-written set of columns.
+    """
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = f"{directory}.tmp-{uuid.uuid4().hex}"
+    os.makedirs(tmp_dir)
+
+    try:
+        columns = []
+        for name in data.columns:
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), frame_column(data, name), allow_pickle=False)
+            columns.append(name)
+
+        _write_manifest(tmp_dir, columns, len(data), extra)
+        _swap_directory(tmp_dir, directory)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def save_column_parts(parts: List[Dict[str, np.ndarray]], directory: str, extra: Optional[dict] = None,
+                      chunk_rows: int = 65536) -> None:
+    """
+    Write the row-wise concatenation of parts, which must share their column
+    names, the way save_columns writes a frame. Each column is copied out a
+    chunk at a time, so memory-mapped parts (e.g. the stored columns a fetched
+    span is merged around) are never loaded whole.
+    """
+    names = list(parts[0])
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = f"{directory}.tmp-{uuid.uuid4().hex}"
+    os.makedirs(tmp_dir)
+
+    try:
+        rows = sum(len(part[names[0]]) for part in parts)
+        for name in names:
+            dtype = np.result_type(*(part[name].dtype for part in parts))
+            header = {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (rows,)}
+            with open(os.path.join(tmp_dir, f"{name}.npy"), 'wb') as f:
+                np.lib.format.write_array_header_1_0(f, header)
+                for part in parts:
+                    values = part[name]
+                    for start in range(0, len(values), chunk_rows):
+                        f.write(np.ascontiguousarray(values[start:start + chunk_rows], dtype=dtype).tobytes())
+
+        _write_manifest(tmp_dir, names, rows, extra)
+        _swap_directory(tmp_dir, directory)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def frame_column(data: pd.DataFrame, name: str) -> np.ndarray:
+    """
+    A frame column as save_columns stores it; strings become fixed-width unicode
+    """
+    values = data[name].to_numpy()
+    if values.dtype == object:
+        values = values.astype(str)
+    return values
+
+
+def _write_manifest(directory: str, columns: List[str], rows: int, extra: Optional[dict]) -> None:
+    manifest = {'columns': columns, 'rows': rows}
+    if extra:
+        manifest.update(extra)
+    with open(os.path.join(directory, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f)
+
+
+def _swap_directory(new_dir: str, directory: str) -> None:
+    try:
+        # A single atomic rename when nothing is stored there yet
+        os.rename(new_dir, directory)
+        return
+    except OSError:
+        if not os.path.isdir(directory):
+            raise
+
+    # Replacing takes two renames; another process swapping the same
+    # directory between them would make the second one fail
+    old_dir = f"{directory}.old-{uuid.uuid4().hex}"
+    with file_lock(f"{directory}.swap.lock"):
+        if os.path.exists(directory):
+            os.rename(directory, old_dir)
+        os.rename(new_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def read_manifest(directory: str) -> Optional[dict]:
+    """
+    Read the manifest written by save_columns, or None if nothing is stored
+    """
+    path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def load_columns(directory: str, mmap: bool = True, names: Optional[List[str]] = None,
+                 writable: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Load the stored columns, memory-mapped by default; only names if given.
+    writable maps them copy-on-write: writes stay private to this process.
+    """
+    if names is None:
+        manifest = read_manifest(directory)
+        if manifest is None:
+            raise FileNotFoundError(f"No columnar data in {directory}")
+        names = manifest['columns']
+    mmap_mode = ('c' if writable else 'r') if mmap else None
+    return {
+        name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+        for name in names
+    }
+
+
+def columns_to_frame(columns: Dict[str, np.ndarray], start: int = 0, stop: Optional[int] = None,
+                     copy: bool = True) -> pd.DataFrame:
+    """
+    Copy a row range of the loaded columns into a DataFrame. With copy=False
+    numeric columns are wrapped as they are, so memory-mapped ones stay
+    mapped; string columns always become Python strings.
+    """
+    return pd.DataFrame({
+        name: values[start:stop].tolist() if values.dtype.kind == 'U' else (
+            np.array(values[start:stop]) if copy else values[start:stop].view(np.ndarray))
+        for name, values in columns.items()
+    }, copy=copy)
@@ -1,40 +1,64 @@
-from typing import Optional
+from datetime import date
+from typing import Iterator, Optional
 import pandas as pd
 from .data_source_interface import DataSourceInterface
+from .market_data_cache import MarketDataCache
+from .fetch_executor import FetchExecutor
+from .market_data_files import DEFAULT_FORMAT, market_data_path, find_market_data
+from .metrics import metrics
 
 class DataAccessService:
-    def __init__(self, data_source: DataSourceInterface):
+    def __init__(self, data_source: DataSourceInterface, cache: Optional[MarketDataCache] = None,
+                 executor: Optional[FetchExecutor] = None):
         self.data_source = data_source
-        self._cache = {}
+        self._cache = cache if cache is not None else MarketDataCache()
+        # Without an executor data source calls run on the caller's thread
+        self._executor = executor
 
     def get_market_data(self, symbol: str, start_date: str, end_date: str, use_cache: bool = True) -> pd.DataFrame:
         """
         Get market data either from cache or data source
         """
+        with metrics.stage('fetch'):
+            return self._get_market_data(symbol, start_date, end_date, use_cache)
+
+    def _get_market_data(self, symbol: str, start_date: str, end_date: str, use_cache: bool) -> pd.DataFrame:
+        if not use_cache:
+            return self._call(lambda: self.data_source.fetch_market_data(symbol, start_date, end_date))
+
+        # Ranges reaching today still change as new bars arrive, so they expire
+        ttl = None
+        if end_date is None or end_date >= date.today().isoformat():
+            ttl = self._cache.live_ttl
+
         cache_key = f"{symbol}_{start_date}_{end_date}"
-        
-        if use_cache and cache_key in self._cache:
-            return self._cache[cache_key]
-            
-        data = self.data_source.fetch_market_data(symbol, start_date, end_date)
-        
-        if use_cache:
-            self._cache[cache_key] = data
-            
-        return data
-
-    def save_market_data(self, data: pd.DataFrame, symbol: str) -> None:
-        """
-        Save market data to storage
-        """
-        filename = f"{symbol}_market_data.json"
+        return self._cache.get_or_fetch(
+            cache_key,
+            lambda: self._call(lambda: self.data_source.fetch_market_data(symbol, start_date, end_date)),
+            ttl=ttl
+        )
+
+    def iter_market_data(self, symbol: str, start_date: str, end_date: str, chunk_rows: int = 10000) -> Iterator[pd.DataFrame]:
+        """
+        Stream market data in chunks straight from the data source. Long
+        ranges are not worth holding in the cache, so this bypasses it.
+        """
+        return self.data_source.iter_market_data(symbol, start_date, end_date, chunk_rows)
+
+    def save_market_data(self, data: pd.DataFrame, symbol: str, format: str = DEFAULT_FORMAT) -> None:
+        """
+        Save market data to storage as npy columns, parquet, feather or json
+        """
+        filename = market_data_path(f"{symbol}_market_data", format)
         self.data_source.save_data(data, filename)
 
-    def load_market_data(self, symbol: str) -> Optional[pd.DataFrame]:
+    def load_market_data(self, symbol: str, format: Optional[str] = None) -> Optional[pd.DataFrame]:
         """
-        Load market data from storage
+        Load market data from storage, picking up whichever format was saved
         """
-        filename = f"{symbol}_market_data.json"
+        filename = find_market_data(f"{symbol}_market_data", format)
+        if filename is None:
+            return None
         try:
             return self.data_source.load_data(filename)
         except FileNotFoundError:
@@ -44,4 +68,9 @@ class DataAccessService:
         """
         Get live price from data source
         """
-        return self.data_source.get_live_price(symbol)
\ No newline at end of file
+        return self._call(lambda: self.data_source.get_live_price(symbol))
+
+    def _call(self, fetch):
+        if self._executor is None:
+            return fetch()
+        return self._executor.run(fetch)
\ No newline at end of file
@@ -0,0 +1,158 @@
+import os
+import random
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, Optional
+import numpy as np
+import pandas as pd
+from ..data_source_interface import DataSourceInterface
+from ..market_data_files import DEFAULT_FORMAT, find_market_data, load_frame, market_data_path, save_frame
+
+
+# First bar of every synthetic walk; ranges starting earlier begin here
+SYNTHETIC_EPOCH = '2000-01-01'
+
+
+def synthetic_bars(symbol: str, start_date: str, end_date: str, tz: str = 'America/New_York') -> pd.DataFrame:
+    """
+    Seeded random walk over the business days in [start_date, end_date), in
+    the layout Yahoo returns (ISO Date strings with the exchange offset).
+    Each symbol has one walk starting at SYNTHETIC_EPOCH and a range is a
+    slice of it, so overlapping ranges agree on the bars they share.
+    """
+    start_date = max(pd.Timestamp(start_date), pd.Timestamp(SYNTHETIC_EPOCH))
+    dates = pd.bdate_range(start_date, end_date, inclusive='left', tz=tz)
+    if len(dates) == 0:
+        raise ValueError(f"No data found for symbol {symbol}")
+    # Bars of the walk before start_date, and in total up to end_date
+    first = int(np.busday_count(SYNTHETIC_EPOCH, start_date.date()))
+    bars = first + len(dates)
+    # One generator per column, so a bar's draws do not depend on how many
+    # bars follow it
+    seed = zlib.crc32(symbol.encode('utf-8'))
+    returns, spreads, opens, volumes = (np.random.default_rng([seed, column]) for column in range(4))
+    close = 100 * np.cumprod(1 + returns.normal(0.0003, 0.02, bars))
+    spread = np.abs(spreads.normal(0, 0.01, bars)) * close
+    open_ = close + opens.normal(0, 0.25, bars) * spread
+    volume = volumes.integers(100000, 10000000, bars)
+    return pd.DataFrame({
+        'Date': [date.isoformat() for date in dates],
+        'Open': open_[first:],
+        'High': (close + spread)[first:],
+        'Low': (close - spread)[first:],
+        'Close': close[first:],
+        'Volume': volume[first:]
+    })
+
+
+def record_fixtures(source: DataSourceInterface, directory: str, symbols: Iterable[str], start_date: str,
+                    end_date: str, format: str = DEFAULT_FORMAT) -> Dict[str, str]:
+    """
+    Fetch symbols from source (e.g. YahooFinanceAdaptee) once and save them
+    as fixtures for ReplayAdaptee; returns the path written per symbol
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for symbol in symbols:
+        path = market_data_path(os.path.join(directory, symbol), format)
+        save_frame(source.fetch_market_data(symbol, start_date, end_date), path)
+        paths[symbol] = path
+    return paths
+
+
+class ReplayAdaptee(DataSourceInterface):
+    """
+    Offline data source for tests, benchmarks and load tests.
+
+    Serves the bars recorded in fixtures_dir (one market data file per
+    symbol, as written by record_fixtures) and, with synthetic=True, a
+    seeded random walk for symbols that have none, so runs are repeatable
+    without a network. latency (plus up to jitter) seconds are slept per
+    call to stand in for the upstream round trip, and failure_rate of the
+    calls raise like a failed download. Arguments left as None come from
+    the REPLAY_* environment variables, which is how MARKET_DATA_SOURCE=replay
+    configures the server.
+    """
+
+    def __init__(self, fixtures_dir: Optional[str] = None, synthetic: Optional[bool] = None,
+                 latency: Optional[float] = None, jitter: Optional[float] = None,
+                 failure_rate: Optional[float] = None, seed: Optional[int] = None, tz: str = 'America/New_York'):
+        env = os.environ
+        self.fixtures_dir = fixtures_dir if fixtures_dir is not None else env.get('REPLAY_FIXTURES') or None
+        self.synthetic = synthetic if synthetic is not None else env.get('REPLAY_SYNTHETIC', '1') != '0'
+        self.latency = latency if latency is not None else float(env.get('REPLAY_LATENCY', '0'))
+        self.jitter = jitter if jitter is not None else float(env.get('REPLAY_JITTER', '0'))
+        self.failure_rate = failure_rate if failure_rate is not None else float(env.get('REPLAY_FAILURE_RATE', '0'))
+        self.tz = tz
+        self.fetches = 0
+        self.failures = 0
+        self._random = random.Random(seed if seed is not None else int(env.get('REPLAY_SEED', '0')))
+        self._fixtures: Dict[str, Optional[pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+
+    def fetch_market_data(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        self._call(f"fetching data for {symbol}")
+        # A fresh frame per call, like a real download
+        return self._bars(symbol, start_date, end_date).copy()
+
+    def save_data(self, data: pd.DataFrame, filename: str) -> None:
+        save_frame(data, filename)
+
+    def load_data(self, filename: str) -> pd.DataFrame:
+        return load_frame(filename)
+
+    def get_live_price(self, symbol: str) -> float:
+        """
+        The last close up to today: the newest recorded bar for fixtures,
+        otherwise the synthetic walk's
+        """
+        self._call(f"fetching live price for {symbol}")
+        fixture = self._fixture(symbol)
+        if fixture is not None:
+            return float(fixture['Close'].iloc[-1])
+        today = pd.Timestamp.today().normalize()
+        data = self._bars(symbol, (today - pd.Timedelta(days=10)).strftime('%Y-%m-%d'),
+                          (today + pd.Timedelta(days=1)).strftime('%Y-%m-%d'))
+        return float(data['Close'].iloc[-1])
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'fetches': self.fetches, 'failures': self.failures}
+
+    def _call(self, action: str) -> None:
+        with self._lock:
+            self.fetches += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            fail = self.failure_rate > 0 and self._random.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise Exception(f"Error {action} from replay source: injected failure")
+
+    def _bars(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        fixture = self._fixture(symbol)
+        if fixture is None:
+            if not self.synthetic:
+                raise ValueError(f"No data found for symbol {symbol}")
+            return synthetic_bars(symbol, start_date, end_date, self.tz)
+        # ISO dates compare as strings; the end date is exclusive, as with Yahoo
+        days = fixture['Date'].str[:10]
+        data = fixture[(days >= start_date) & (days < end_date)].reset_index(drop=True)
+        if data.empty:
+            raise ValueError(f"No data found for symbol {symbol}")
+        return data
+
+    def _fixture(self, symbol: str) -> Optional[pd.DataFrame]:
+        if not self.fixtures_dir:
+            return None
+        with self._lock:
+            if symbol in self._fixtures:
+                return self._fixtures[symbol]
+        path = find_market_data(os.path.join(self.fixtures_dir, symbol))
+        # Loaded into memory once; fixtures are small next to a request's work
+        fixture = load_frame(path, mmap=False) if path else None
+        with self._lock:
+            return self._fixtures.setdefault(symbol, fixture)
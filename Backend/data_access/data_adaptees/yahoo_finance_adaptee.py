@@ -1,19 +1,25 @@
 import yfinance as yf
 import pandas as pd
-import json
-import os
 from ..data_source_interface import DataSourceInterface
+from ..market_data_files import save_frame, load_frame
 
 class YahooFinanceAdaptee(DataSourceInterface):
+    def __init__(self, interval: str = '1d'):
+        # Any yfinance interval, e.g. '1m', '5m', '1h', '1d'. Yahoo only serves
+        # minute bars for recent weeks.
+        self.interval = interval
+
     def fetch_market_data(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
         try:
             ticker = yf.Ticker(symbol)
-            data = ticker.history(start=start_date, end=end_date)
+            data = ticker.history(start=start_date, end=end_date, interval=self.interval)
             
             if data.empty:
                 raise ValueError(f"No data found for symbol {symbol}")
                 
             filtered_data = data[['Open', 'High', 'Low', 'Close', 'Volume']].reset_index()
+            # Intraday history names its index Datetime rather than Date
+            filtered_data = filtered_data.rename(columns={'Datetime': 'Date'})
             filtered_data['Date'] = filtered_data['Date'].apply(lambda x: x.isoformat())
             return filtered_data
             
@@ -22,20 +28,15 @@ class YahooFinanceAdaptee(DataSourceInterface):
 
     def save_data(self, data: pd.DataFrame, filename: str) -> None:
         try:
-            json_data = data.to_dict(orient='records')
-            with open(filename, 'w') as f:
-                json.dump(json_data, f, indent=4)
+            save_frame(data, filename)
         except Exception as e:
             raise Exception(f"Error saving data: {str(e)}")
 
     def load_data(self, filename: str) -> pd.DataFrame:
         try:
-            if not os.path.exists(filename):
-                raise FileNotFoundError(f"File {filename} not found")
-                
-            with open(filename, 'r') as f:
-                json_data = json.load(f)
-            return pd.DataFrame(json_data)
+            return load_frame(filename)
+        except FileNotFoundError:
+            raise
         except Exception as e:
             raise Exception(f"Error loading data: {str(e)}")
 
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
 import pandas as pd
 
 class DataSourceInterface(ABC):
@@ -7,6 +8,12 @@ class DataSourceInterface(ABC):
         """Fetch market data for a given symbol between start and end dates"""
         pass
 
+    def iter_market_data(self, symbol: str, start_date: str, end_date: str, chunk_rows: int = 10000) -> Iterator[pd.DataFrame]:
+        """Yield market data in frames of at most chunk_rows rows"""
+        data = self.fetch_market_data(symbol, start_date, end_date)
+        for start in range(0, len(data), chunk_rows):
+            yield data.iloc[start:start + chunk_rows].reset_index(drop=True)
+
     @abstractmethod
     def save_data(self, data: pd.DataFrame, filename: str) -> None:
         """Save market data to storage"""
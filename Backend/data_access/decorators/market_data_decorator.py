@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 import pandas as pd
 from ..data_source_interface import DataSourceInterface
 
@@ -10,6 +10,9 @@ class MarketDataDecorator(DataSourceInterface):
     def fetch_market_data(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
         return self._data_source.fetch_market_data(symbol, start_date, end_date)
 
+    def iter_market_data(self, symbol: str, start_date: str, end_date: str, chunk_rows: int = 10000) -> Iterator[pd.DataFrame]:
+        return self._data_source.iter_market_data(symbol, start_date, end_date, chunk_rows)
+
     def save_data(self, data: pd.DataFrame, filename: str) -> None:
         self._data_source.save_data(data, filename)
 
@@ -0,0 +1,16 @@
+from typing import Iterator
+import pandas as pd
+from .market_data_decorator import MarketDataDecorator
+from ..data_source_interface import DataSourceInterface
+from ..market_data_store import MarketDataStore
+
+class StorageDecorator(MarketDataDecorator):
+    def __init__(self, data_source: DataSourceInterface, store: MarketDataStore):
+        super().__init__(data_source)
+        self._store = store
+
+    def fetch_market_data(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        return self._store.get_market_data(symbol, start_date, end_date, super().fetch_market_data)
+
+    def iter_market_data(self, symbol: str, start_date: str, end_date: str, chunk_rows: int = 10000) -> Iterator[pd.DataFrame]:
+        return self._store.iter_market_data(symbol, start_date, end_date, super().fetch_market_data, chunk_rows)
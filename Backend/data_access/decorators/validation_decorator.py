@@ -1,17 +1,31 @@
+import time
 from datetime import datetime
+from typing import Iterator
 import pandas as pd
 from .market_data_decorator import MarketDataDecorator
+from ..metrics import metrics
+from ..symbols import validate_symbol
 
 class ValidationDecorator(MarketDataDecorator):
     def fetch_market_data(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        started = time.perf_counter()
         self._validate_inputs(symbol, start_date, end_date)
+        elapsed = time.perf_counter() - started
         data = super().fetch_market_data(symbol, start_date, end_date)
+        # Only the checks themselves count towards the validate stage
+        started = time.perf_counter()
         self._validate_data(data)
+        metrics.observe_stage('validate', elapsed + time.perf_counter() - started)
         return data
 
+    def iter_market_data(self, symbol: str, start_date: str, end_date: str, chunk_rows: int = 10000) -> Iterator[pd.DataFrame]:
+        self._validate_inputs(symbol, start_date, end_date)
+        for chunk in super().iter_market_data(symbol, start_date, end_date, chunk_rows):
+            self._validate_data(chunk)
+            yield chunk
+
     def _validate_inputs(self, symbol: str, start_date: str, end_date: str) -> None:
-        if not symbol or not isinstance(symbol, str):
-            raise ValueError("Invalid symbol")
+        validate_symbol(symbol)
 
         try:
             start_dt = datetime.strptime(start_date, '%Y-%m-%d')
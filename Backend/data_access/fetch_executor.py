@@ -0,0 +1,71 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class FetchExecutor:
+    """
+    Bounded thread pool for blocking upstream calls (yfinance downloads).
+
+    Request threads hand their fetch to the pool and wait at most timeout
+    seconds for it, so however many requests are being served at most
+    max_workers downloads run at once, and a hung download frees the
+    request after the timeout instead of holding it (and its worker
+    thread) forever. A fetch still queued when its caller gives up is
+    cancelled.
+    """
+
+    def __init__(self, max_workers: int = 8, timeout: Optional[float] = 30.0):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.submitted = 0
+        self.timeouts = 0
+        self.running = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='market-data-fetch')
+        self._lock = threading.Lock()
+
+    def run(self, fetch: Callable[[], T]) -> T:
+        """
+        Run fetch on the pool and return its result, re-raising its error
+        """
+        with self._lock:
+            self.submitted += 1
+        future = self._executor.submit(self._call, fetch)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise TimeoutError(f"Market data fetch took longer than {self.timeout}s")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'timeouts': self.timeouts,
+                'running': self.running,
+                'max_workers': self.max_workers
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _call(self, fetch: Callable[[], T]) -> T:
+        with self._lock:
+            self.running += 1
+        try:
+            return fetch()
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+# Create a global instance
+fetch_executor = FetchExecutor(
+    max_workers=int(os.environ.get('FETCH_WORKERS', '8')),
+    timeout=float(os.environ.get('FETCH_TIMEOUT', '30'))
+)
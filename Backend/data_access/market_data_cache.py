@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+import pandas as pd
+
+
+class _CacheEntry:
+    __slots__ = ('data', 'nbytes', 'expires_at')
+
+    def __init__(self, data: pd.DataFrame, nbytes: int, expires_at: Optional[float]):
+        self.data = data
+        self.nbytes = nbytes
+        self.expires_at = expires_at
+
+
+class MarketDataCache:
+    """
+    Thread-safe LRU cache of market data frames bounded by their memory footprint.
+
+    Concurrent lookups of a key that is not cached yet share a single call to
+    the fetch function instead of each going upstream. Callers always get their
+    own copy of the frame, since strategies add columns to the data they get.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, live_ttl: float = 300.0):
+        self.max_bytes = max_bytes
+        self.live_ttl = live_ttl
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, _CacheEntry]' = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], pd.DataFrame], ttl: Optional[float] = None) -> pd.DataFrame:
+        """
+        Return the cached frame for key, calling fetch once on a miss.
+        Entries with a ttl (in seconds) are refetched once it has elapsed.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry.expires_at is None or entry.expires_at > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.data.copy()
+            if entry is not None:
+                self._remove(key)
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result().copy()
+
+        try:
+            data = fetch()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._inflight[key]
+            self._put(key, data, ttl)
+        future.set_result(data)
+        return data.copy()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    def _put(self, key: str, data: pd.DataFrame, ttl: Optional[float]) -> None:
+        nbytes = int(data.memory_usage(index=True, deep=True).sum())
+        if nbytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = _CacheEntry(data, nbytes, expires_at)
+        self.current_bytes += nbytes
+        while self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.current_bytes -= entry.nbytes
+
+
+# Create a global instance
+market_data_cache = MarketDataCache(
+    max_bytes=int(os.environ.get('MARKET_DATA_CACHE_MB', 256)) * 1024 * 1024,
+    live_ttl=float(os.environ.get('MARKET_DATA_CACHE_TTL', 300))
+)
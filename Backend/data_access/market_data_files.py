@@ -0,0 +1,105 @@
+import json
+import os
+from typing import List, Optional
+import pandas as pd
+from .columnar_io import MANIFEST_FILE, save_columns, load_columns, read_manifest, columns_to_frame
+
+try:
+    import pyarrow  # noqa: F401  (needed by pandas for parquet/feather)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# File suffix per format; 'npy' is a directory of one .npy file per column
+FORMAT_SUFFIXES = {
+    'npy': '.columns',
+    'parquet': '.parquet',
+    'feather': '.feather',
+    'json': '.json'
+}
+
+DEFAULT_FORMAT = 'npy'
+
+
+def available_formats() -> List[str]:
+    """
+    Formats usable in this environment, most compact/fastest first
+    """
+    if HAS_PYARROW:
+        return ['npy', 'parquet', 'feather', 'json']
+    return ['npy', 'json']
+
+
+def market_data_path(base: str, format: str) -> str:
+    if format not in FORMAT_SUFFIXES:
+        raise ValueError(f"Invalid format '{format}'. Choose from {list(FORMAT_SUFFIXES)}.")
+    return f"{base}{FORMAT_SUFFIXES[format]}"
+
+
+def detect_format(path: str) -> str:
+    for format, suffix in FORMAT_SUFFIXES.items():
+        if path.endswith(suffix):
+            return format
+    raise ValueError(f"Unknown market data file type: {path}")
+
+
+def save_frame(data: pd.DataFrame, path: str) -> None:
+    """
+    Write the frame in the format implied by the path's suffix
+    """
+    format = detect_format(path)
+    if format in ('parquet', 'feather') and not HAS_PYARROW:
+        raise ValueError(f"The {format} format requires pyarrow to be installed.")
+
+    if format == 'npy':
+        save_columns(data, path)
+    elif format == 'parquet':
+        data.to_parquet(path, index=False)
+    elif format == 'feather':
+        data.reset_index(drop=True).to_feather(path)
+    else:
+        with open(path, 'w') as f:
+            json.dump(data.to_dict(orient='records'), f, indent=4)
+
+
+def load_frame(path: str, mmap: bool = True) -> pd.DataFrame:
+    """
+    Read a frame written by save_frame. The numeric npy columns are wrapped
+    without copying; with mmap they stay memory-mapped copy-on-write, so only
+    the pages actually used are read from disk and writes to the frame never
+    reach the file. The Date strings are always read in full.
+    """
+    format = detect_format(path)
+    if format == 'npy':
+        if read_manifest(path) is None:
+            raise FileNotFoundError(f"File {path} not found")
+        return columns_to_frame(load_columns(path, mmap=mmap, writable=True), copy=False)
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File {path} not found")
+    if format == 'parquet':
+        return pd.read_parquet(path)
+    if format == 'feather':
+        return pd.read_feather(path)
+    with open(path, 'r') as f:
+        return pd.DataFrame(json.load(f))
+
+
+def find_market_data(base: str, format: Optional[str] = None) -> Optional[str]:
+    """
+    Path of the stored file for base, or of the newest one if it was saved
+    in several formats (binary before JSON on a tie), unless a format is given
+    """
+    formats = [format] if format else available_formats()
+    found = []
+    for rank, candidate in enumerate(formats):
+        path = market_data_path(base, candidate)
+        if os.path.exists(path):
+            found.append((_modified(path), -rank, path))
+    return max(found)[2] if found else None
+
+
+def _modified(path: str) -> float:
+    # An npy directory counts as written when its manifest was
+    manifest = os.path.join(path, MANIFEST_FILE)
+    return os.path.getmtime(manifest if os.path.isdir(path) and os.path.exists(manifest) else path)
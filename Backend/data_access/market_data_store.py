@@ -0,0 +1,215 @@
+import os
+import threading
+from datetime import date
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .columnar_io import file_lock, save_columns, save_column_parts, load_columns, read_manifest, columns_to_frame, frame_column
+from .symbols import validate_symbol
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'market_data')
+
+FetchFunction = Callable[[str, str, str], pd.DataFrame]
+
+
+def _combine(frames: List[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """
+    Frames as one, sorted by Date with later frames winning on equal dates
+    """
+    if not frames:
+        return None
+    merged = pd.concat(frames, ignore_index=True)
+    merged = merged.drop_duplicates(subset='Date', keep='last')
+    return merged.sort_values('Date', kind='stable').reset_index(drop=True)
+
+
+def _no_bars(error: Exception, start_date: str, end_date: str) -> bool:
+    """
+    Whether error means [start_date, end_date) simply has no bars. Sources
+    raise "No data found for symbol ..." for that, but yfinance says the
+    same after a transient or rate-limited failure, so it is only believed
+    for spans without a business day (weekends); anything else is retried.
+    """
+    return 'No data found' in str(error) and np.busday_count(start_date, end_date) == 0
+
+
+class MarketDataStore:
+    """
+    Persistent per-symbol OHLCV store kept as memory-mapped .npy columns.
+
+    Each symbol remembers the [start, end) date span it has been fetched for,
+    so a request only goes upstream for the part of its range that is not on
+    disk yet. Dates are compared as YYYY-MM-DD strings, end exclusive, the same
+    way yfinance treats history(start, end). Updates hold a lock file next to
+    the symbol's directory, so server processes sharing the root take turns.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def get_market_data(self, symbol: str, start_date: str, end_date: str, fetch: FetchFunction) -> pd.DataFrame:
+        """
+        Serve the range from disk, fetching and merging only the missing spans
+        """
+        with self._lock_for(symbol), file_lock(self._lock_path(symbol)):
+            directory, failure = self._update(symbol, start_date, end_date, fetch)
+            data = self._slice(directory, start_date, end_date)
+            if failure is not None and data.empty:
+                raise failure
+            return data
+
+    def iter_market_data(self, symbol: str, start_date: str, end_date: str, fetch: FetchFunction,
+                         chunk_rows: int = 10000) -> Iterator[pd.DataFrame]:
+        """
+        Like get_market_data, but yield the range in frames of at most
+        chunk_rows rows copied out of the memory-mapped columns, so memory
+        stays bounded by the chunk size rather than the length of the range
+        """
+        with self._lock_for(symbol), file_lock(self._lock_path(symbol)):
+            directory, failure = self._update(symbol, start_date, end_date, fetch)
+            # The mapping stays valid even if a later update swaps the directory out
+            columns = load_columns(directory)
+            start, stop = self._bounds(columns, start_date, end_date)
+            if failure is not None and start == stop:
+                raise failure
+
+        for chunk_start in range(start, stop, chunk_rows):
+            yield columns_to_frame(columns, chunk_start, min(chunk_start + chunk_rows, stop))
+
+    def _update(self, symbol: str, start_date: str, end_date: str, fetch: FetchFunction) -> Tuple[str, Optional[Exception]]:
+        """
+        Fetch whatever part of the range is missing and merge it into the
+        symbol's columns. Returns the symbol directory and the error of a
+        failed span, if any. Must be called with the symbol locks held.
+        """
+        directory = self._symbol_dir(symbol)
+        manifest = read_manifest(directory)
+        stored_coverage = covered = (manifest['start'], manifest['end']) if manifest else None
+
+        spans = self._missing_spans(start_date, end_date, covered)
+        if not spans:
+            self.hits += 1
+            return directory, None
+
+        if covered is None:
+            self.misses += 1
+        else:
+            self.partial_hits += 1
+
+        # Memory-mapped: a partial hit only reads the stored rows while
+        # copying them around the fetched spans, never the whole history
+        stored = load_columns(directory) if manifest else None
+        head: List[pd.DataFrame] = []
+        tail: List[pd.DataFrame] = []
+        failure = None
+        for span_start, span_end in spans:
+            try:
+                frame = fetch(symbol, span_start, span_end)
+            except Exception as e:
+                if stored is None or not _no_bars(e, span_start, span_end):
+                    # Keep the coverage unchanged so the span is retried next time
+                    failure = e
+                    continue
+                # A weekend span has no bars; mark it covered so it is not
+                # fetched again on every request
+            else:
+                (head if stored is not None and span_end <= stored_coverage[0] else tail).append(frame)
+            covered = self._extend(covered, span_start, span_end)
+
+        if head or tail or covered != stored_coverage:
+            extra = {'start': covered[0], 'end': covered[1]}
+            if stored is None:
+                save_columns(_combine(tail), directory, extra=extra)
+            else:
+                self._merge(directory, stored, _combine(head), _combine(tail), extra)
+
+        if failure is not None and stored is None:
+            raise failure
+        return directory, failure
+
+    def _merge(self, directory: str, stored: Dict[str, np.ndarray], head: Optional[pd.DataFrame],
+               tail: Optional[pd.DataFrame], extra: Dict[str, str]) -> None:
+        """
+        Save the fetched head and tail around the stored columns. Fetched bars
+        replace stored ones on the same dates, e.g. today's, which is stored
+        while it forms but never covered.
+        """
+        names = list(stored)
+        head, tail = [frame if frame is not None and len(frame) else None for frame in (head, tail)]
+        if any(frame is not None and sorted(frame.columns) != sorted(names) for frame in (head, tail)):
+            # Columns changed upstream; merge as frames rather than guess
+            frames = [frame for frame in (head, columns_to_frame(stored), tail) if frame is not None]
+            save_columns(_combine(frames), directory, extra=extra)
+            return
+
+        dates = stored['Date']
+        start = int(np.searchsorted(dates, head['Date'].iloc[-1], side='right')) if head is not None else 0
+        stop = int(np.searchsorted(dates, tail['Date'].iloc[0], side='left')) if tail is not None else len(dates)
+        parts = [{name: values[start:max(start, stop)] for name, values in stored.items()}]
+        if head is not None:
+            parts.insert(0, {name: frame_column(head, name) for name in names})
+        if tail is not None:
+            parts.append({name: frame_column(tail, name) for name in names})
+        save_column_parts(parts, directory, extra=extra)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Hit/miss counters since the store was created
+        """
+        return {
+            'hits': self.hits,
+            'partial_hits': self.partial_hits,
+            'misses': self.misses
+        }
+
+    def _missing_spans(self, start_date: str, end_date: str, covered: Optional[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        if covered is None:
+            return [(start_date, end_date)]
+        spans = []
+        if start_date < covered[0]:
+            spans.append((start_date, covered[0]))
+        if end_date > covered[1]:
+            spans.append((covered[1], end_date))
+        return spans
+
+    def _extend(self, covered: Optional[Tuple[str, str]], span_start: str, span_end: str) -> Tuple[str, str]:
+        # Bars for today are still forming, so never mark today as covered
+        span_end = min(span_end, date.today().isoformat())
+        span_end = max(span_end, span_start)
+        if covered is None:
+            return span_start, span_end
+        return min(covered[0], span_start), max(covered[1], span_end)
+
+    def _slice(self, directory: str, start_date: str, end_date: str) -> pd.DataFrame:
+        columns = load_columns(directory)
+        start, stop = self._bounds(columns, start_date, end_date)
+        return columns_to_frame(columns, start, stop)
+
+    def _bounds(self, columns: Dict[str, np.ndarray], start_date: str, end_date: str) -> Tuple[int, int]:
+        # A bare YYYY-MM-DD sorts before every timestamp on that day, so a
+        # binary search over the full ISO strings finds day boundaries while
+        # only touching a handful of pages of the mapped column
+        dates = columns['Date']
+        start = int(np.searchsorted(dates, start_date, side='left'))
+        stop = int(np.searchsorted(dates, end_date, side='left'))
+        return start, max(start, stop)
+
+    def _symbol_dir(self, symbol: str) -> str:
+        # Checked here too, so no caller can reach outside the root
+        return os.path.join(self.root, validate_symbol(symbol).upper())
+
+    def _lock_path(self, symbol: str) -> str:
+        return f"{self._symbol_dir(symbol)}.lock"
+
+    def _lock_for(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(symbol.upper(), threading.Lock())
+
+
+# Create a global instance
+market_data_store = MarketDataStore(os.environ.get('MARKET_DATA_DIR', DEFAULT_STORE_DIR))
@@ -0,0 +1,198 @@
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers a cache hit (well under a millisecond) up to a cold fetch
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+STAGE_METRIC = 'stage_duration_seconds'
+STAGES = ('fetch', 'validate', 'signals', 'simulate', 'encode')
+
+Labels = Tuple[Tuple[str, str], ...]
+# (labels, value) pairs of one metric family, as returned by collectors
+Samples = List[Tuple[Dict[str, str], float]]
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = labels + ((extra,) if extra else ())
+    if not items:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in items) + '}'
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if value != value:
+        return 'NaN'
+    if value in (float('inf'), float('-inf')):
+        return '+Inf' if value > 0 else '-Inf'
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Counters and latency histograms kept in process, rendered in the
+    Prometheus text exposition format.
+
+    Code being measured calls increment/observe (or times a block with
+    timer/stage); components that already keep their own counters, such as
+    the caches and the price publisher, are read through collectors only
+    when the metrics are rendered, so they cost nothing per request.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[Tuple[str, str, str, Samples]]]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: float = 1.0, help: str = '', **labels) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+            if help:
+                self._help.setdefault(name, help)
+
+    def observe(self, name: str, seconds: float, help: str = '', **labels) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self.buckets)
+            histogram.observe(seconds)
+            if help:
+                self._help.setdefault(name, help)
+
+    @contextmanager
+    def timer(self, name: str, help: str = '', **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, help, **labels)
+
+    def stage(self, stage: str) -> ContextManager[None]:
+        """
+        Time one request stage: fetch, validate, signals, simulate or encode
+        """
+        return self.timer(STAGE_METRIC, 'Time spent in each stage of request handling', stage=stage)
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        self.observe(STAGE_METRIC, seconds, 'Time spent in each stage of request handling', stage=stage)
+
+    def register_collector(self, name: str, collect: Callable[[], Iterable[Tuple[str, str, str, Samples]]]) -> None:
+        """
+        collect() returns (metric name, type, help, samples) families; a
+        collector registered again under the same name replaces the old one
+        """
+        with self._lock:
+            self._collectors[name] = collect
+
+    def counter_value(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0.0)
+
+    def histogram_count(self, name: str, **labels) -> int:
+        with self._lock:
+            histogram = self._histograms.get(name, {}).get(_labels(labels))
+            return histogram.count if histogram else 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {
+                name: {key: (list(h.counts), h.total, h.count) for key, h in series.items()}
+                for name, series in self._histograms.items()
+            }
+            help_text = dict(self._help)
+            collectors = list(self._collectors.items())
+
+        lines = []
+        for name in sorted(counters):
+            lines += self._header(name, 'counter', help_text.get(name, ''))
+            for key, value in sorted(counters[name].items()):
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+        for name in sorted(histograms):
+            lines += self._header(name, 'histogram', help_text.get(name, ''))
+            for key, (counts, total, count) in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(key)} {count}")
+
+        for collector_name, collect in collectors:
+            try:
+                families = list(collect())
+            except Exception as e:
+                logger.warning(f"Error collecting {collector_name} metrics: {str(e)}")
+                continue
+            for name, metric_type, help, samples in families:
+                lines += self._header(name, metric_type, help)
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(_labels(labels))} {_format_value(value)}")
+
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _header(name: str, metric_type: str, help: str) -> List[str]:
+        lines = [f"# HELP {name} {help}"] if help else []
+        lines.append(f"# TYPE {name} {metric_type}")
+        return lines
+
+
+def stats_families(prefix: str, stats: Dict[str, float], counters: Iterable[str],
+                   help: str = '') -> List[Tuple[str, str, str, Samples]]:
+    """
+    Turn a component's stats() dict into metric families: the keys listed in
+    counters become <prefix>_<key>_total counters, the rest gauges
+    """
+    counters = set(counters)
+    families = []
+    for key, value in stats.items():
+        if key in counters:
+            families.append((f"{prefix}_{key}_total", 'counter', help, [({}, value)]))
+        else:
+            families.append((f"{prefix}_{key}", 'gauge', help, [({}, value)]))
+    return families
+
+
+# Create a global instance
+metrics = MetricsRegistry()
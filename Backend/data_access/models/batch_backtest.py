@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Union
+from data_access.data_access_service import DataAccessService
+from data_access.models.trading_strategy import TradingStrategy
+from data_access.models.parameter_sweep import required_indicators
+from data_access.models.trade_sinks import TradeSink
+from data_access.models.strategy_pattern.indicators import IndicatorCache
+
+AlgorithmSpec = Union[str, Dict]
+
+
+def _normalize_algorithms(algorithms: List[AlgorithmSpec]) -> List[Dict]:
+    specs = []
+    for algorithm in algorithms:
+        if isinstance(algorithm, str):
+            specs.append({'algorithm': algorithm, 'params': {}})
+        else:
+            specs.append({'algorithm': algorithm['algorithm'], 'params': algorithm.get('params') or {}})
+    return specs
+
+
+def backtest_symbol(data_service: DataAccessService, symbol: str, algorithms: List[Dict],
+                    start_date: str, end_date: str, include_trades: bool = False) -> Dict:
+    """
+    Fetch one symbol and run every requested algorithm over it.
+    Errors are reported in the result instead of raised so one bad ticker
+    does not abort the rest of the batch. With include_trades the results
+    carry their TradeLog; run_batch turns it into dicts.
+    """
+    try:
+        data = data_service.get_market_data(symbol, start_date, end_date)
+    except Exception as e:
+        return {'symbol': symbol, 'status': 'error', 'error': str(e)}
+
+    results = []
+    # Algorithms no longer modify the frame, so they share it and its indicators
+    indicators = IndicatorCache(data['Close'].to_numpy()) if 'Close' in data else None
+    if indicators is not None:
+        # Everything the algorithms read, each computed once before any signals
+        try:
+            indicators.prefetch(required_indicators((spec['algorithm'], spec['params']) for spec in algorithms))
+        except Exception:
+            # e.g. a window that is not a number; that algorithm reports it below
+            pass
+    for spec in algorithms:
+        try:
+            strategy = TradingStrategy(data, symbol, spec['algorithm'], spec['params'], indicators)
+            final_balance, trade_log, total_gain_loss, annual_return, total_return = strategy.run_backtest(compact=True)
+        except Exception as e:
+            results.append({'algorithm': spec['algorithm'], 'params': spec['params'], 'error': str(e)})
+            continue
+
+        result = {
+            'algorithm': spec['algorithm'],
+            'params': spec['params'],
+            'final_balance': final_balance,
+            'total_gain_loss': total_gain_loss,
+            'annual_return': annual_return,
+            'total_return': total_return,
+            'num_trades': len(trade_log)
+        }
+        if include_trades:
+            result['trade_log'] = trade_log
+        results.append(result)
+
+    return {'symbol': symbol, 'status': 'success', 'results': results}
+
+
+def run_batch(data_service: DataAccessService, symbols: List[str], algorithms: List[AlgorithmSpec],
+              start_date: str, end_date: str, max_workers: int = 16,
+              include_trades: bool = False, sink: Optional[TradeSink] = None) -> Iterator[Dict]:
+    """
+    Backtest many symbols concurrently, yielding each symbol's result as soon
+    as it is done. Fetches run on a bounded thread pool, so at most max_workers
+    requests are in flight against the data source at once. With a sink,
+    every trade log is written to it as its symbol finishes, and the trades
+    are only kept in the results if include_trades is set.
+    """
+    specs = _normalize_algorithms(algorithms)
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols))))
+    try:
+        futures = [
+            executor.submit(backtest_symbol, data_service, symbol, specs, start_date, end_date,
+                            include_trades or sink is not None)
+            for symbol in symbols
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            _finish_trades(result, sink, include_trades)
+            yield result
+    finally:
+        # Stops queued work if the consumer goes away early
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _finish_trades(result: Dict, sink: Optional[TradeSink], include_trades: bool) -> None:
+    # Sinks take the compact log as is; only trades that are returned are
+    # converted to dicts
+    for run in result.get('results', []):
+        if 'trade_log' not in run:
+            continue
+        trade_log = run.pop('trade_log')
+        if sink is not None:
+            sink.write_run(result['symbol'], run['algorithm'], run['params'], trade_log, run['final_balance'],
+                           run['total_gain_loss'], run['annual_return'], run['total_return'])
+        if include_trades:
+            run['trade_log'] = trade_log.to_dicts()
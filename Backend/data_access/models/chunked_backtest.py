@@ -0,0 +1,100 @@
+import numpy as np
+from data_access.bar_series import BarSeries
+from data_access.models.trade_log import BUY
+from data_access.models.trading_strategy import TradingStrategy, create_algo, trade_points
+from data_access.models.strategy_pattern.indicators import IndicatorCache
+
+NANOSECONDS_PER_DAY = 86400 * 10 ** 9
+
+
+class ChunkedTradingStrategy(TradingStrategy):
+    """
+    TradingStrategy over a BarSeries too long to hold in memory at once.
+
+    The bars (typically memory-mapped minute or tick data) are processed
+    chunk_rows at a time. Each chunk's signals are computed over the chunk
+    plus the strategy's warmup_bars() of history, and the position, balance
+    and trade log carry over from one chunk to the next, so the result equals
+    run_backtest on the whole series while memory stays bounded by the chunk
+    size. With keep_trades=False only the summary is kept, which also bounds
+    the trade log.
+    """
+
+    def __init__(self, bars: BarSeries, symbol, algorithm, params=None, chunk_rows: int = 1000000,
+                 keep_trades: bool = True):
+        super().__init__(None, symbol, algorithm, params)
+        if len(bars) == 0:
+            raise ValueError("No bars to backtest.")
+        self.bars = bars
+        self.chunk_rows = chunk_rows
+        self.keep_trades = keep_trades
+        self.num_trades = 0
+        # Set once a buy could not afford a single share; from then on every
+        # buy signal is an (empty) fill, exactly like the row-by-row loop
+        self._unaffordable = False
+
+    def run_backtest(self, compact: bool = False):
+        algo = create_algo(self.algorithm, **self.params)
+        warmup = algo.warmup_bars()
+        total = len(self.bars)
+
+        for start in range(0, total, self.chunk_rows):
+            stop = min(start + self.chunk_rows, total)
+            lead = max(0, start - warmup)
+            close = np.array(self.bars.close[lead:stop], dtype=np.float64)
+            signal = algo.generate_signals(IndicatorCache(close))[start - lead:]
+            self._simulate_chunk(close[start - lead:], signal, start)
+
+        if self.shares > 0:
+            self._sell(total - 1, np.float64(self.bars.close[total - 1]))
+        self.trade_log.format_dates(self.bars.format_dates)
+
+        return self._summarize(compact)
+
+    def _simulate_chunk(self, close: np.ndarray, signal: np.ndarray, offset: int) -> None:
+        if self._unaffordable:
+            points = np.flatnonzero(signal)
+        else:
+            points = trade_points(signal, 1 if self.shares > 0 else -1)
+
+        position = 0
+        while position < len(points):
+            i = points[position]
+            position += 1
+            price = close[i]
+            if signal[i] == 1 and self.shares == 0:
+                self.shares = self.balance // price
+                transaction_amount = self.shares * price
+                self.balance -= transaction_amount
+                self._log_trade(offset + i, BUY, price, transaction_amount, None)
+                if self.shares == 0 and not self._unaffordable:
+                    self._unaffordable = True
+                    points = np.flatnonzero(signal[i + 1:]) + i + 1
+                    position = 0
+            elif signal[i] == -1 and self.shares > 0:
+                self._sell(offset + i, price)
+
+        self.trade_log.format_dates(self.bars.format_dates)
+
+    def _log_trade(self, bar, action, price, transaction_amount, gain_loss):
+        # The total is kept as it goes since without keep_trades the log
+        # only ever holds the last trade
+        self.num_trades += 1
+        if gain_loss is not None:
+            self.total_gain_loss += gain_loss
+        if not self.keep_trades:
+            self.trade_log.clear()
+        super()._log_trade(bar, action, price, transaction_amount, gain_loss)
+
+    def _summarize(self, compact: bool = False):
+        timestamps = self.bars.timestamps
+        total_years = ((int(timestamps[-1]) - int(timestamps[0])) // NANOSECONDS_PER_DAY) / 365.25
+        self.total_return = (self.balance / self.INITIAL_BALANCE - 1) * 100
+        self.annual_return = ((self.balance / self.INITIAL_BALANCE) ** (1 / total_years) - 1) * 100 if total_years > 0 else 0
+
+        if compact:
+            self.trade_log.trim()
+            trade_log = self.trade_log
+        else:
+            trade_log = self.trade_log.to_dicts()
+        return self.balance, trade_log, self.total_gain_loss, self.annual_return, self.total_return
@@ -1,17 +1,47 @@
+import importlib
+import os
 from data_access.data_access_service import DataAccessService
+from data_access.data_source_interface import DataSourceInterface
 from data_access.data_adaptees.yahoo_finance_adaptee import YahooFinanceAdaptee
+from data_access.data_adaptees.replay_adaptee import ReplayAdaptee
 from data_access.decorators.validation_decorator import ValidationDecorator
+from data_access.decorators.storage_decorator import StorageDecorator
+from data_access.market_data_store import market_data_store
+from data_access.market_data_cache import market_data_cache
+from data_access.fetch_executor import fetch_executor
+
+def create_data_source() -> DataSourceInterface:
+    """
+    The upstream source named by MARKET_DATA_SOURCE: 'yahoo' (the default),
+    'replay' for the offline ReplayAdaptee (configured by the REPLAY_*
+    variables) or 'package.module:ClassName' of a DataSourceInterface taking
+    no arguments
+    """
+    name = os.environ.get('MARKET_DATA_SOURCE', 'yahoo')
+    if name == 'yahoo':
+        return YahooFinanceAdaptee()
+    if name == 'replay':
+        return ReplayAdaptee()
+    module_name, _, class_name = name.partition(':')
+    if not class_name:
+        raise ValueError(f"Invalid MARKET_DATA_SOURCE '{name}'. Use 'yahoo', 'replay' or 'module:ClassName'.")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+def build_data_service():
+    """Create the decorated data access service shared by every adapter"""
+    base_source = create_data_source()
+    stored_source = StorageDecorator(base_source, market_data_store)
+    validated_source = ValidationDecorator(stored_source)
+    return DataAccessService(validated_source, cache=market_data_cache, executor=fetch_executor)
+
+shared_data_service = build_data_service()
 
 class MarketDataAdapter:
     def __init__(self, symbol, start_date, end_date):
         self.symbol = symbol
         self.start_date = start_date
         self.end_date = end_date
-        
-        # Create base data source with decorators
-        base_source = YahooFinanceAdaptee()
-        validated_source = ValidationDecorator(base_source)
-        self.data_service = DataAccessService(validated_source)
+        self.data_service = shared_data_service
 
     def fetch_data(self):
         """Fetch market data using the decorated data access service"""
@@ -0,0 +1,212 @@
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from data_access.models.shared_arrays import SharedArray
+from data_access.models.worker_pool import create_pool, pool_size
+from data_access.models.strategy_pattern.indicators import IndicatorCache
+from data_access.models.parameter_sweep import summarize_signals
+from data_access.models.trade_log import SELL, TradeLog
+from data_access.models.trading_strategy import TradingStrategy, create_algo, years_between
+
+METHODS = ['bootstrap', 'trades', 'shuffle']
+# Synthetic price paths per task; fixed so the results only depend on the seed
+PATHS_PER_TASK = 64
+
+# Per-worker state set up by _init_worker
+_worker_returns = None
+_worker_shared = None
+_worker_setup = None
+
+
+def distribution(values: np.ndarray) -> Dict[str, float]:
+    """
+    Mean, spread and percentiles of one simulated metric
+    """
+    values = np.asarray(values, dtype=np.float64)
+    p5, p25, p50, p75, p95 = np.percentile(values, [5, 25, 50, 75, 95])
+    return {
+        'mean': float(values.mean()),
+        'std': float(values.std()),
+        'min': float(values.min()),
+        'p5': float(p5),
+        'p25': float(p25),
+        'p50': float(p50),
+        'p75': float(p75),
+        'p95': float(p95),
+        'max': float(values.max())
+    }
+
+
+def trade_growth(trade_log: Union[TradeLog, List[Dict]]) -> np.ndarray:
+    """
+    Growth factor of the whole account over each round trip in trade_log:
+    the balance after a sell over the equity before its buy
+    """
+    if not isinstance(trade_log, TradeLog):
+        trade_log = TradeLog.from_dicts(trade_log)
+    records = trade_log.records
+    # A sell always directly follows the buy that opened the position
+    sells = np.flatnonzero(records['action'] == SELL)
+    equity = records['balance'][sells - 1] + records['transaction_amount'][sells - 1]
+    return records['balance'][sells] / equity
+
+
+def max_drawdowns(equity: np.ndarray) -> np.ndarray:
+    """
+    Largest peak-to-trough fall, in percent, of each row of equity curves
+    """
+    peaks = np.maximum.accumulate(equity, axis=1)
+    return ((equity - peaks) / peaks).min(axis=1) * 100
+
+
+def resample_trades(growth: np.ndarray, runs: int, rng: np.random.Generator, shuffle: bool,
+                    initial_balance: float = TradingStrategy.INITIAL_BALANCE) -> np.ndarray:
+    """
+    Equity after each trade for runs reorderings of the round trips (shuffle)
+    or draws of as many round trips with replacement; runs x (trades + 1)
+    """
+    if shuffle:
+        paths = rng.permuted(np.broadcast_to(growth, (runs, len(growth))), axis=1)
+    else:
+        paths = rng.choice(growth, size=(runs, len(growth)), replace=True)
+    equity = np.empty((runs, len(growth) + 1))
+    equity[:, 0] = initial_balance
+    np.cumprod(paths, axis=1, out=equity[:, 1:])
+    equity[:, 1:] *= initial_balance
+    return equity
+
+
+def bootstrap_closes(log_returns: np.ndarray, first_close: float, paths: int, block_bars: int,
+                     rng: np.random.Generator) -> np.ndarray:
+    """
+    Synthetic close paths, bars x paths, built from blocks of block_bars
+    consecutive log returns drawn with replacement (a moving block bootstrap,
+    which keeps short-range autocorrelation and volatility clustering)
+    """
+    bars = len(log_returns)
+    block_bars = max(1, min(block_bars, bars))
+    blocks = -(-bars // block_bars)
+    starts = rng.integers(0, bars - block_bars + 1, size=(paths, blocks))
+    index = (starts[:, :, None] + np.arange(block_bars)).reshape(paths, -1)[:, :bars]
+    close = np.empty((bars + 1, paths))
+    close[0] = first_close
+    close[1:] = first_close * np.exp(np.cumsum(log_returns[index].T, axis=0))
+    return close
+
+
+def simulate_bootstrap(log_returns: np.ndarray, setup: Dict, task: Tuple[int, np.random.SeedSequence, int]) -> Dict:
+    """
+    Backtest the algorithm over one task's worth of bootstrapped price paths
+    """
+    n, seed, paths = task
+    close = bootstrap_closes(log_returns, setup['first_close'], paths, setup['block_bars'],
+                             np.random.default_rng(seed))
+    # Every path is a column, so the indicators are computed for all at once
+    signal = create_algo(setup['algorithm'], **setup['params']).generate_signals(IndicatorCache(close))
+    results = [summarize_signals(close[:, j], signal[:, j], setup['total_years']) for j in range(paths)]
+    return {
+        'task': n,
+        'total_return': [result['total_return'] for result in results],
+        'annual_return': [result['annual_return'] for result in results],
+        'num_trades': [result['num_trades'] for result in results]
+    }
+
+
+def _init_worker(descriptor: Dict, setup: Dict) -> None:
+    global _worker_returns, _worker_shared, _worker_setup
+    _worker_shared = SharedArray.attach(descriptor)
+    _worker_returns = _worker_shared.array
+    _worker_setup = setup
+
+
+def _simulate_in_worker(task: Tuple[int, np.random.SeedSequence, int]) -> Dict:
+    return simulate_bootstrap(_worker_returns, _worker_setup, task)
+
+
+def run_monte_carlo(data: pd.DataFrame, algorithm: str, params: Optional[Dict] = None, method: str = 'bootstrap',
+                    runs: int = 1000, block_bars: int = 20, seed: Optional[int] = None,
+                    processes: Optional[int] = None, include_samples: bool = False) -> Dict:
+    """
+    Distributions of total_return and annual_return around the backtest of
+    algorithm over data.
+
+    - bootstrap: rerun the strategy on runs price paths resampled from the
+      series' own returns in blocks of block_bars. Paths are simulated in
+      tasks of PATHS_PER_TASK on a process pool reading the returns from
+      shared memory.
+    - trades: redraw the backtest's round trips with replacement.
+    - shuffle: replay the round trips in random orders. Compounding does
+      not depend on the order, so the returns are those of the backtest
+      every time and only max_drawdown varies.
+
+    The same seed gives the same results whatever the number of processes.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Invalid method '{method}'. Choose from {METHODS}.")
+    if runs < 1:
+        raise ValueError("runs must be positive.")
+    params = params or {}
+    close = np.ascontiguousarray(data['Close'].to_numpy(dtype=np.float64))
+    if len(close) < 2:
+        raise ValueError("At least two bars are needed.")
+    total_years = years_between(data['Date'].iloc[0], data['Date'].iloc[-1])
+
+    final_balance, trade_log, _, annual_return, total_return = TradingStrategy(
+        data, 'MONTE_CARLO', algorithm, params).run_backtest(compact=True)
+    result = {
+        'method': method,
+        'runs': runs,
+        'algorithm': algorithm,
+        'params': params,
+        'backtest': {'total_return': float(total_return), 'annual_return': float(annual_return),
+                     'num_trades': len(trade_log)}
+    }
+
+    if method == 'bootstrap':
+        samples = _run_bootstrap(close, algorithm, params, runs, block_bars, total_years, seed, processes)
+    else:
+        growth = trade_growth(trade_log)
+        if len(growth) == 0:
+            raise ValueError("The backtest made no round trips to resample.")
+        equity = resample_trades(growth, runs, np.random.default_rng(seed), shuffle=method == 'shuffle')
+        final = equity[:, -1] / TradingStrategy.INITIAL_BALANCE
+        samples = {
+            'total_return': (final - 1) * 100,
+            'annual_return': (final ** (1 / total_years) - 1) * 100 if total_years > 0 else np.zeros(runs),
+            'max_drawdown': max_drawdowns(equity)
+        }
+
+    for metric, values in samples.items():
+        result[metric] = distribution(values)
+    result['probability_of_loss'] = float(np.mean(np.asarray(samples['total_return']) < 0))
+    if include_samples:
+        result['samples'] = {metric: np.asarray(values).tolist() for metric, values in samples.items()}
+    return result
+
+
+def _run_bootstrap(close: np.ndarray, algorithm: str, params: Dict, runs: int, block_bars: int,
+                   total_years: float, seed: Optional[int], processes: Optional[int]) -> Dict[str, np.ndarray]:
+    log_returns = np.diff(np.log(close))
+    setup = {
+        'algorithm': algorithm,
+        'params': params,
+        'first_close': float(close[0]),
+        'block_bars': block_bars,
+        'total_years': total_years
+    }
+    sizes = [min(PATHS_PER_TASK, runs - start) for start in range(0, runs, PATHS_PER_TASK)]
+    tasks = list(zip(range(len(sizes)), np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+    processes = pool_size(processes, len(tasks))
+
+    if processes == 1:
+        parts = [simulate_bootstrap(log_returns, setup, task) for task in tasks]
+    else:
+        with SharedArray.create(log_returns) as shared:
+            with create_pool(processes, _init_worker, (shared.descriptor(), setup)) as pool:
+                parts = list(pool.imap_unordered(_simulate_in_worker, tasks))
+    parts.sort(key=lambda part: part['task'])
+
+    return {
+        metric: np.concatenate([part[metric] for part in parts])
+        for metric in ('total_return', 'annual_return', 'num_trades')
+    }
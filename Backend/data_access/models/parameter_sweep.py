@@ -0,0 +1,200 @@
+import itertools
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from data_access.models.shared_arrays import SharedArray
+from data_access.models.worker_pool import create_pool, pool_size
+from data_access.models.strategy_pattern.indicators import IndicatorCache
+from data_access.models.strategy_pattern.registry import strategy_registry
+from data_access.models.trading_strategy import ALGORITHMS, TradingStrategy, create_algo, trade_points, years_between
+
+RANK_METRICS = ['total_return', 'annual_return', 'final_balance', 'total_gain_loss', 'num_trades']
+
+# Most combinations one sweep may expand to
+MAX_SWEEP_COMBOS = int(os.environ.get('MAX_SWEEP_COMBOS', 10000))
+
+# Per-worker state set up by _init_worker
+_worker_close = None
+_worker_years = None
+_worker_shared = None
+_worker_indicators = None
+
+
+def expand_grid(grids: Dict[str, Dict[str, Iterable]]) -> List[Tuple[str, Dict]]:
+    """
+    Turn {'SMA': {'short_window': [20, 50], 'long_window': [100, 200]}, ...}
+    into a list of (algorithm, params) combinations.
+    """
+    if not isinstance(grids, dict):
+        raise ValueError("grids must map algorithm names to parameter grids.")
+    expanded = []
+    total = 0
+    for algorithm, grid in grids.items():
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Invalid algorithm '{algorithm}'. Choose from {list(ALGORITHMS)}.")
+        grid = grid or {}
+        if not isinstance(grid, dict):
+            raise ValueError(f"The grid for {algorithm} must map parameter names to values.")
+        names = list(grid)
+        values = [v if isinstance(v, (list, tuple)) else [v] for v in grid.values()]
+        # Counted before anything is expanded, so a huge grid costs nothing
+        total += int(np.prod([len(v) for v in values], dtype=np.float64))
+        if total > MAX_SWEEP_COMBOS:
+            raise ValueError(f"grids expand to more than {MAX_SWEEP_COMBOS} combinations.")
+        expanded.append((algorithm, names, values))
+
+    combos = []
+    for algorithm, names, values in expanded:
+        for combo in itertools.product(*values):
+            params = strategy_registry.validate_params(algorithm, dict(zip(names, combo)))
+            combos.append((algorithm, params))
+    return combos
+
+
+def required_indicators(combos: Iterable[Tuple[str, Dict]]) -> List[Tuple]:
+    """
+    Union of the IndicatorCache keys the combinations' strategies read, in
+    first-seen order
+    """
+    keys = {}
+    for algorithm, params in combos:
+        try:
+            keys.update(dict.fromkeys(create_algo(algorithm, **params).required_indicators()))
+        except (ValueError, TypeError):
+            # Reported when the combination itself is evaluated
+            continue
+    return list(keys)
+
+
+def group_by_indicators(combos: List[Tuple[str, Dict]]) -> List[Tuple[str, Dict]]:
+    """
+    combos reordered so that those reading the same first indicator (e.g.
+    SMA combinations with the same short window) are adjacent and end up in
+    the same worker's chunk and IndicatorCache
+    """
+    groups = {}
+    for combo in combos:
+        keys = required_indicators([combo])
+        groups.setdefault(keys[0] if keys else None, []).append(combo)
+    return [combo for group in groups.values() for combo in group]
+
+
+def summarize_signals(close: np.ndarray, signal: np.ndarray, total_years: float,
+                      initial_balance: float = TradingStrategy.INITIAL_BALANCE) -> Dict:
+    """
+    Run the all-in / all-out simulation without building a trade log.
+
+    Uses the same arithmetic as TradingStrategy.run_backtest so the balances
+    and returns match it exactly.
+    """
+    balance = initial_balance
+    shares = 0
+    entry_price = None
+    gains = []
+    num_trades = 0
+
+    points = trade_points(signal)
+    position = 0
+    while position < len(points):
+        i = points[position]
+        position += 1
+        price = close[i]
+        if signal[i] == 1 and shares == 0:
+            shares = balance // price
+            balance -= shares * price
+            entry_price = price
+            num_trades += 1
+            if shares == 0:
+                # Still flat, so every later signal matters again
+                points = np.flatnonzero(signal[i + 1:]) + i + 1
+                position = 0
+        elif signal[i] == -1 and shares > 0:
+            transaction_amount = shares * price
+            gains.append(transaction_amount - (shares * entry_price))
+            balance += transaction_amount
+            shares = 0
+            num_trades += 1
+
+    if shares > 0:
+        transaction_amount = shares * close[-1]
+        gains.append(transaction_amount - (shares * entry_price))
+        balance += transaction_amount
+        num_trades += 1
+
+    total_return = (balance / initial_balance - 1) * 100
+    annual_return = ((balance / initial_balance) ** (1 / total_years) - 1) * 100 if total_years > 0 else 0
+    return {
+        'final_balance': float(balance),
+        'total_gain_loss': float(sum(gains)),
+        'total_return': float(total_return),
+        'annual_return': float(annual_return),
+        'num_trades': num_trades
+    }
+
+
+def evaluate_combo(close: np.ndarray, total_years: float, algorithm: str, params: Dict,
+                   indicators: Optional[IndicatorCache] = None) -> Dict:
+    """
+    Compute the signals for one parameter combination and summarize the backtest.
+    Combinations evaluated with the same IndicatorCache share their indicators.
+    """
+    if indicators is None:
+        indicators = IndicatorCache(close)
+    signals = create_algo(algorithm, **params).generate_signals(indicators)
+    result = {'algorithm': algorithm, 'params': params}
+    result.update(summarize_signals(close, signals, total_years))
+    return result
+
+
+def _init_worker(descriptor: Dict, total_years: float) -> None:
+    global _worker_close, _worker_years, _worker_shared, _worker_indicators
+    _worker_shared = SharedArray.attach(descriptor)
+    _worker_close = _worker_shared.array
+    _worker_years = total_years
+    _worker_indicators = IndicatorCache(_worker_close)
+
+
+def _evaluate_in_worker(combo: Tuple[str, Dict]) -> Dict:
+    algorithm, params = combo
+    return evaluate_combo(_worker_close, _worker_years, algorithm, params, _worker_indicators)
+
+
+def run_sweep(data: pd.DataFrame, grids: Dict[str, Dict[str, Iterable]], processes: Optional[int] = None,
+              rank_by: str = 'total_return', top_n: Optional[int] = None) -> List[Dict]:
+    """
+    Backtest every parameter combination in grids over the same price data and
+    return the results ranked best first by rank_by.
+
+    The close prices are placed in shared memory once and read in place by the
+    worker processes, each of which keeps one IndicatorCache. Combinations
+    are handed out grouped by the indicators they read, so those sharing a
+    window mostly land in one worker and compute it once. processes=1 runs
+    everything in the calling process on one cache, filled with every
+    required indicator up front.
+    """
+    if rank_by not in RANK_METRICS:
+        raise ValueError(f"Invalid rank_by '{rank_by}'. Choose from {RANK_METRICS}.")
+    combos = expand_grid(grids)
+    if not combos:
+        return []
+
+    close = np.ascontiguousarray(data['Close'].to_numpy(dtype=np.float64))
+    total_years = years_between(data['Date'].iloc[0], data['Date'].iloc[-1])
+    processes = pool_size(processes, len(combos))
+
+    if processes == 1:
+        indicators = IndicatorCache(close)
+        indicators.prefetch(required_indicators(combos))
+        results = [evaluate_combo(close, total_years, algorithm, params, indicators) for algorithm, params in combos]
+    else:
+        with SharedArray.create(close) as shared:
+            chunksize = max(1, len(combos) // (processes * 4))
+            with create_pool(processes, _init_worker, (shared.descriptor(), total_years)) as pool:
+                results = list(pool.imap_unordered(_evaluate_in_worker, group_by_indicators(combos),
+                                                   chunksize=chunksize))
+
+    results.sort(key=lambda result: result[rank_by], reverse=True)
+    for rank, result in enumerate(results, start=1):
+        result['rank'] = rank
+    return results[:top_n] if top_n else results
@@ -0,0 +1,275 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from data_access.data_access_service import DataAccessService
+from data_access.models.trading_strategy import TradingStrategy, create_algo, format_trade_date, years_between
+from data_access.models.strategy_pattern.indicators import IndicatorCache, rolling_std
+
+
+def align_closes(frames: Dict[str, pd.DataFrame]) -> Tuple[np.ndarray, List[str], np.ndarray]:
+    """
+    Put every symbol's Close on the union of their bar dates.
+
+    Returns (dates, symbols, close) with close shaped dates x symbols. Dates
+    are matched as the ISO strings the store keeps, gaps are forward filled
+    and bars before a symbol's first one stay NaN.
+    """
+    series = {}
+    for symbol, data in frames.items():
+        closes = pd.Series(data['Close'].to_numpy(dtype=np.float64), index=data['Date'].astype(str).to_numpy())
+        series[symbol] = closes[~closes.index.duplicated(keep='last')]
+    closes = pd.DataFrame(series).sort_index().ffill()
+    return closes.index.to_numpy(), list(closes.columns), closes.to_numpy()
+
+
+def fetch_frames(data_service: DataAccessService, symbols: List[str], start_date: str, end_date: str,
+                 max_workers: int = 16) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    """
+    Fetch every symbol on a bounded thread pool. Symbols that fail or have no
+    data are left out of the frames and reported in the errors instead.
+    """
+    symbols = list(dict.fromkeys(symbols))
+
+    def fetch(symbol):
+        try:
+            return data_service.get_market_data(symbol, start_date, end_date), None
+        except Exception as e:
+            return None, str(e)
+
+    frames, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as executor:
+        for symbol, (data, error) in zip(symbols, executor.map(fetch, symbols)):
+            if error is not None:
+                errors[symbol] = error
+            elif data is None or len(data) == 0 or 'Close' not in data:
+                errors[symbol] = 'No data found'
+            else:
+                frames[symbol] = data
+    return frames, errors
+
+
+def holding_state(signal: np.ndarray) -> np.ndarray:
+    """
+    Whether each symbol is held on each date: the last non-zero signal so far
+    was a buy. Matches the all-in / all-out rule of TradingStrategy.
+    """
+    rows = np.arange(signal.shape[0])[:, None]
+    last = np.where(signal != 0, rows, -1)
+    np.maximum.accumulate(last, axis=0, out=last)
+    columns = np.arange(signal.shape[1])[None, :]
+    return (last >= 0) & (signal[np.maximum(last, 0), columns] == 1)
+
+
+def equal_weight(state: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    Split equity evenly across the symbols currently held
+    """
+    held = state.sum(axis=1, keepdims=True)
+    return np.divide(state, held, out=np.zeros(state.shape), where=held > 0)
+
+
+def fixed_fraction(state: np.ndarray, close: np.ndarray, fraction: float = 0.1) -> np.ndarray:
+    """
+    Give each held symbol the same fraction of equity, scaled down when the
+    positions would add up to more than the whole account
+    """
+    weights = state * float(fraction)
+    total = weights.sum(axis=1, keepdims=True)
+    return np.divide(weights, total, out=weights.copy(), where=total > 1)
+
+
+def inverse_volatility(state: np.ndarray, close: np.ndarray, lookback: int = 20) -> np.ndarray:
+    """
+    Weight held symbols by 1 / rolling standard deviation of daily returns
+    """
+    returns = np.full(close.shape, np.nan)
+    returns[1:] = close[1:] / close[:-1] - 1
+    volatility = rolling_std(returns, lookback)
+    inverse = np.divide(1.0, volatility, out=np.zeros(close.shape), where=volatility > 0)
+    weights = state * inverse
+    total = weights.sum(axis=1, keepdims=True)
+    return np.divide(weights, total, out=np.zeros(state.shape), where=total > 0)
+
+
+POSITION_SIZERS: Dict[str, Callable[..., np.ndarray]] = {
+    'equal_weight': equal_weight,
+    'fixed_fraction': fixed_fraction,
+    'inverse_volatility': inverse_volatility
+}
+
+
+class PortfolioBacktest:
+    """
+    Backtest one TradingAlgo over many symbols sharing a single cash balance.
+
+    Signals come from the algorithm run over the whole dates x symbols close
+    matrix at once. A symbol is held from a buy signal until the next sell,
+    the sizing rule turns the held set into target weights, and the book is
+    rebalanced to those targets whenever the held set changes (and every
+    rebalance_every bars if set). Trades fill whole shares at the close;
+    sells go first so buys can use the freed cash, and buys are scaled down
+    if they still cost more than the cash available.
+    """
+
+    INITIAL_BALANCE = TradingStrategy.INITIAL_BALANCE
+
+    def __init__(self, dates, symbols: List[str], close: np.ndarray, algorithm: str, params: Optional[Dict] = None,
+                 sizing: str = 'equal_weight', sizing_params: Optional[Dict] = None,
+                 rebalance_every: Optional[int] = None, commission: float = 0.0,
+                 initial_balance: float = INITIAL_BALANCE):
+        if sizing not in POSITION_SIZERS:
+            raise ValueError(f"Invalid sizing '{sizing}'. Choose from {list(POSITION_SIZERS)}.")
+        close = np.asarray(close, dtype=np.float64)
+        if close.ndim != 2 or close.shape != (len(dates), len(symbols)):
+            raise ValueError("close must be shaped (dates, symbols).")
+        if len(dates) == 0:
+            raise ValueError("No dates to backtest.")
+        self.dates = np.asarray(dates)
+        self.symbols = list(symbols)
+        self.close = close
+        self.algorithm = algorithm
+        self.params = params or {}
+        self.sizing = sizing
+        self.sizing_params = sizing_params or {}
+        self.rebalance_every = rebalance_every
+        self.commission = commission
+        self.initial_balance = initial_balance
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame], algorithm: str, **kwargs) -> 'PortfolioBacktest':
+        dates, symbols, close = align_closes(frames)
+        return cls(dates, symbols, close, algorithm, **kwargs)
+
+    def target_weights(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Held state and target weights, both dates x symbols
+        """
+        signal = create_algo(self.algorithm, **self.params).generate_signals(IndicatorCache(self.close))
+        state = holding_state(signal) & ~np.isnan(self.close)
+        weights = POSITION_SIZERS[self.sizing](state, self.close, **self.sizing_params)
+        return state, weights
+
+    def rebalance_days(self, state: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Days when some symbol enters or leaves the book, and the scheduled
+        days when every position is resized to its target weight
+        """
+        changed = np.empty(len(state), dtype=bool)
+        changed[0] = state[0].any()
+        changed[1:] = (state[1:] != state[:-1]).any(axis=1)
+        scheduled = np.zeros(len(state), dtype=bool)
+        if self.rebalance_every:
+            scheduled[::self.rebalance_every] = True
+            scheduled &= state.any(axis=1)
+        return changed | scheduled, scheduled
+
+    def run(self, include_trades: bool = True) -> Dict:
+        state, weights = self.target_weights()
+        trading_days, scheduled = self.rebalance_days(state)
+        close = self.close
+        tradable = ~np.isnan(close)
+        marks = np.where(tradable, close, 0.0)
+        commission = self.commission
+
+        cash = float(self.initial_balance)
+        shares = np.zeros(len(self.symbols))
+        no_position = np.zeros(len(self.symbols), dtype=bool)
+        days = np.flatnonzero(trading_days)
+        book_shares = np.zeros((len(days), len(self.symbols)))
+        book_cash = np.zeros(len(days))
+        trades: List[Tuple[np.ndarray, ...]] = []
+        num_trades = 0
+        fees = 0.0
+
+        for n, t in enumerate(days):
+            prices = close[t]
+            equity = cash + shares @ marks[t]
+            if scheduled[t]:
+                resize = tradable[t]
+            else:
+                # Only symbols entering or leaving the book trade
+                resize = tradable[t] & (state[t] != (state[t - 1] if t > 0 else no_position))
+
+            delta = np.zeros(len(shares))
+            delta[resize] = np.floor_divide(weights[t, resize] * equity, prices[resize]) - shares[resize]
+
+            selling = delta < 0
+            if selling.any():
+                proceeds = (-delta[selling] * prices[selling]).sum()
+                cash += proceeds - proceeds * commission
+                fees += proceeds * commission
+
+            buying = delta > 0
+            if buying.any():
+                cost = (delta[buying] * prices[buying]).sum()
+                if cost * (1 + commission) > cash:
+                    # Not enough cash for every buy: scale them all down
+                    delta[buying] = np.floor(delta[buying] * (cash / (cost * (1 + commission))))
+                    cost = (delta[buying] * prices[buying]).sum()
+                cash -= cost + cost * commission
+                fees += cost * commission
+
+            shares += delta
+            book_shares[n] = shares
+            book_cash[n] = cash
+
+            filled = np.flatnonzero(delta)
+            num_trades += len(filled)
+            if include_trades and len(filled):
+                trades.append((np.full(len(filled), t), filled, delta[filled], prices[filled], shares[filled]))
+
+        equity_curve = self._mark_to_market(trading_days, book_shares, book_cash, marks)
+        return self._summarize(equity_curve, trades if include_trades else None, num_trades, fees)
+
+    def _mark_to_market(self, trading_days: np.ndarray, book_shares: np.ndarray, book_cash: np.ndarray,
+                        marks: np.ndarray) -> np.ndarray:
+        # Positions only change on trading days, so every day is valued with
+        # the book as of the latest trading day at or before it
+        book = np.cumsum(trading_days) - 1
+        opened = book >= 0
+        equity = np.full(len(marks), float(self.initial_balance))
+        equity[opened] = book_cash[book[opened]] + np.einsum(
+            'ij,ij->i', book_shares[book[opened]], marks[opened])
+        return equity
+
+    def _summarize(self, equity_curve: np.ndarray, trades: Optional[List[Tuple[np.ndarray, ...]]],
+                   num_trades: int, fees: float) -> Dict:
+        final_balance = float(equity_curve[-1])
+        total_years = years_between(self.dates[0], self.dates[-1])
+        total_return = (final_balance / self.initial_balance - 1) * 100
+        annual_return = ((final_balance / self.initial_balance) ** (1 / total_years) - 1) * 100 if total_years > 0 else 0
+        peaks = np.maximum.accumulate(equity_curve)
+        max_drawdown = float(((equity_curve - peaks) / peaks).min() * 100)
+
+        result = {
+            'algorithm': self.algorithm,
+            'params': self.params,
+            'sizing': self.sizing,
+            'symbols': self.symbols,
+            'final_balance': final_balance,
+            'total_return': float(total_return),
+            'annual_return': float(annual_return),
+            'max_drawdown': max_drawdown,
+            'num_trades': num_trades,
+            'fees': float(fees),
+            'equity_curve': {
+                'dates': [format_trade_date(date) for date in self.dates],
+                'equity': equity_curve.tolist()
+            }
+        }
+        if trades is not None:
+            # Trades were collected as one batch of arrays per trading day
+            columns = [np.concatenate(parts).tolist() for parts in zip(*trades)] if trades else [[]] * 5
+            result['trades'] = [
+                {
+                    'date': result['equity_curve']['dates'][t],
+                    'symbol': self.symbols[j],
+                    'action': 'BUY' if delta > 0 else 'SELL',
+                    'price': price,
+                    'shares': abs(delta),
+                    'position': position
+                }
+                for t, j, delta, price, position in zip(*columns)
+            ]
+        return result
@@ -0,0 +1,51 @@
+from multiprocessing import shared_memory
+from typing import Dict, Tuple
+import numpy as np
+
+
+class SharedArray:
+    """
+    A NumPy array placed in a named shared memory block.
+
+    The owning process creates it with SharedArray.create(array) and passes
+    descriptor() to worker processes, which call SharedArray.attach() to get a
+    read-only view onto the same memory without copying it.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, shape: Tuple[int, ...], dtype: str, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        self.array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        if not owner:
+            self.array.flags.writeable = False
+
+    @classmethod
+    def create(cls, array: np.ndarray) -> 'SharedArray':
+        array = np.ascontiguousarray(array)
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared = cls(shm, array.shape, array.dtype.str, owner=True)
+        shared.array[...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, descriptor: Dict) -> 'SharedArray':
+        shm = shared_memory.SharedMemory(name=descriptor['name'])
+        return cls(shm, tuple(descriptor['shape']), descriptor['dtype'], owner=False)
+
+    def descriptor(self) -> Dict:
+        return {'name': self._shm.name, 'shape': self.array.shape, 'dtype': self.array.dtype.str}
+
+    def close(self) -> None:
+        """
+        Release this process's view; the owner also frees the shared block
+        """
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self) -> 'SharedArray':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
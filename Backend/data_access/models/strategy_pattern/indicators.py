@@ -0,0 +1,133 @@
+import math
+import threading
+from typing import Callable, Dict, Hashable, Iterable, Tuple, Union
+import numpy as np
+import pandas as pd
+
+
+def _frame(values: np.ndarray) -> Union[pd.Series, pd.DataFrame]:
+    # 1D series or (dates x symbols) matrix; pandas computes column by column,
+    # so every column matches the single-series result exactly
+    return pd.Series(values, copy=False) if values.ndim == 1 else pd.DataFrame(values, copy=False)
+
+
+def rolling_mean(values: np.ndarray, window: int, min_periods: int = None) -> np.ndarray:
+    return _frame(values).rolling(window=window, min_periods=min_periods).mean().to_numpy()
+
+
+def rolling_std(values: np.ndarray, window: int, min_periods: int = None) -> np.ndarray:
+    return _frame(values).rolling(window=window, min_periods=min_periods).std().to_numpy()
+
+
+def ema(values: np.ndarray, span: float) -> np.ndarray:
+    return _frame(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def ema_warmup_bars(span: float, tolerance: float = 2.0 ** -60) -> int:
+    """
+    Bars after which the starting value's weight in an adjust=False EMA
+    falls below tolerance
+    """
+    alpha = 2.0 / (span + 1.0)
+    if alpha >= 1:
+        return 1
+    return int(math.ceil(math.log(tolerance) / math.log(1.0 - alpha)))
+
+
+def shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """
+    Same as Series.shift(periods) along the first axis, NaN filled
+    """
+    shifted = np.full(values.shape, np.nan)
+    if periods < len(values):
+        shifted[periods:] = values[:len(values) - periods]
+    return shifted
+
+
+class IndicatorCache:
+    """
+    Computes each indicator of one price series (or dates x symbols matrix)
+    at most once and hands it out as a read-only array.
+
+    Strategies ask for what they need, e.g. cache.sma(50) or cache.ema(12),
+    so running several strategies or parameter combinations over the same
+    prices reuses the rolling windows they share. Derived indicators are
+    memoized the same way through get(key, compute).
+    """
+
+    # Indicators compute() and prefetch() know by name
+    KINDS = ('sma', 'std', 'ema', 'macd', 'macd_signal')
+
+    def __init__(self, close):
+        close = np.asarray(close, dtype=np.float64)
+        if close.ndim not in (1, 2):
+            raise ValueError("Indicator input must be a 1D series or a 2D (dates x symbols) array.")
+        self.close = self._freeze(close)
+        self.hits = 0
+        self.misses = 0
+        self._values: Dict[Hashable, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        with self._lock:
+            values = self._values.get(key)
+            if values is not None:
+                self.hits += 1
+                return values
+            self.misses += 1
+        values = self._freeze(np.asarray(compute(), dtype=np.float64))
+        with self._lock:
+            return self._values.setdefault(key, values)
+
+    def sma(self, window: int, min_periods: int = None) -> np.ndarray:
+        # pandas treats min_periods=None as min_periods=window
+        min_periods = window if min_periods is None else min_periods
+        return self.get(('sma', window, min_periods), lambda: rolling_mean(self.close, window, min_periods))
+
+    def std(self, window: int, min_periods: int = None) -> np.ndarray:
+        min_periods = window if min_periods is None else min_periods
+        return self.get(('std', window, min_periods), lambda: rolling_std(self.close, window, min_periods))
+
+    def ema(self, span: float) -> np.ndarray:
+        return self.get(('ema', span), lambda: ema(self.close, span))
+
+    def macd(self, short_span: float, long_span: float) -> np.ndarray:
+        return self.get(('macd', short_span, long_span), lambda: self.ema(short_span) - self.ema(long_span))
+
+    def macd_signal(self, short_span: float, long_span: float, signal_span: float) -> np.ndarray:
+        return self.get(('macd_signal', short_span, long_span, signal_span),
+                        lambda: ema(self.macd(short_span, long_span), signal_span))
+
+    def compute(self, key: Tuple) -> np.ndarray:
+        """
+        The indicator for a key as listed by TradingAlgo.required_indicators,
+        e.g. ('sma', 50, 50) or ('ema', 12)
+        """
+        kind, *args = key
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown indicator '{kind}'.")
+        return getattr(self, kind)(*args)
+
+    def prefetch(self, keys: Iterable[Tuple]) -> None:
+        """
+        Compute every missing indicator among keys, each once. Keys of other
+        kinds, which a strategy computes itself, are skipped.
+        """
+        for key in dict.fromkeys(keys):
+            if key[0] in self.KINDS:
+                self.compute(key)
+
+    def keys(self) -> Tuple[Hashable, ...]:
+        with self._lock:
+            return tuple(self._values)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._values)}
+
+    @staticmethod
+    def _freeze(values: np.ndarray) -> np.ndarray:
+        if values.flags.writeable:
+            values = values.view()
+            values.flags.writeable = False
+        return values
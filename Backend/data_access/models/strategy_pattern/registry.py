@@ -0,0 +1,214 @@
+import importlib
+import inspect
+import json
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from importlib.metadata import entry_points
+from typing import Dict, Iterator, List, Optional, Union
+
+# Installed packages can add strategies by declaring, e.g. in pyproject.toml,
+#   [project.entry-points.trading_strategies]
+#   RSI = "my_package.strategies:RSIStrategy"
+ENTRY_POINT_GROUP = 'trading_strategies'
+
+logger = logging.getLogger(__name__)
+
+# Built in strategies as 'module:Class', imported the first time they are used
+BUILTIN_STRATEGIES = {
+    'SMA': 'data_access.models.strategy_pattern.tradingAlgos:SMAStrategy',
+    'BollingerBands': 'data_access.models.strategy_pattern.tradingAlgos:BollingerBandsStrategy',
+    'MACD': 'data_access.models.strategy_pattern.tradingAlgos:MACDStrategy'
+}
+
+
+def load_target(target: str) -> type:
+    """
+    Import 'module:Class'
+    """
+    module_name, _, class_name = target.partition(':')
+    if not module_name or not class_name:
+        raise ValueError(f"Strategy target '{target}' must be 'module:Class'.")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class StrategyRegistry(Mapping):
+    """
+    Name -> TradingAlgo class for every known strategy.
+
+    Strategies come from BUILTIN_STRATEGIES, the ENTRY_POINT_GROUP entry
+    points of installed packages (built in names win) and register(). A
+    strategy's module is only imported when it is first looked up, so
+    listing names is cheap. As a Mapping it drops in wherever the plain
+    ALGORITHMS dict was used.
+
+    Strategies only hold their parameters, so create() hands out one shared
+    instance per (name, params), keeping up to max_instances of them.
+    """
+
+    def __init__(self, targets: Optional[Dict[str, Union[str, type]]] = None,
+                 entry_point_group: Optional[str] = ENTRY_POINT_GROUP, max_instances: int = 1024):
+        self.entry_point_group = entry_point_group
+        self.max_instances = max_instances
+        self.hits = 0
+        self.misses = 0
+        self._targets: Dict[str, Union[str, type]] = dict(BUILTIN_STRATEGIES if targets is None else targets)
+        self._sources = {name: 'builtin' for name in self._targets}
+        self._classes: Dict[str, type] = {}
+        self._instances: 'OrderedDict[str, object]' = OrderedDict()
+        self._discovered = entry_point_group is None
+        self._lock = threading.RLock()
+
+    def register(self, name: str, target: Union[str, type]) -> None:
+        """
+        Add or replace a strategy; target is a class or 'module:Class'
+        """
+        with self._lock:
+            self._targets[name] = target
+            self._sources[name] = 'registered'
+            self._classes.pop(name, None)
+            for key in [key for key in self._instances if key.startswith(f"{name}\x00")]:
+                del self._instances[key]
+
+    def create(self, name: str, **params):
+        """
+        The strategy instance for these parameters
+        """
+        key = f"{name}\x00{json.dumps(params, sort_keys=True, default=str)}"
+        with self._lock:
+            algo = self._instances.get(key)
+            if algo is not None:
+                self._instances.move_to_end(key)
+                self.hits += 1
+                return algo
+        if name not in self:
+            raise ValueError(f"Invalid algorithm. Choose from {list(self)}.")
+        algo = self[name](**params)
+        with self._lock:
+            self.misses += 1
+            self._instances[key] = algo
+            while len(self._instances) > self.max_instances:
+                self._instances.popitem(last=False)
+        return algo
+
+    def validate_params(self, name: str, params) -> Dict:
+        """
+        Params for the named strategy as a dict, or ValueError if a name is
+        unknown or a value is not positive. Parameters annotated float take
+        any positive number; every other one is a positive whole number of
+        bars.
+        """
+        if not isinstance(name, str) or name not in self:
+            raise ValueError(f"Invalid algorithm. Choose from {list(self)}.")
+        if params is None:
+            return {}
+        if not isinstance(params, dict):
+            raise ValueError(f"params for {name} must be an object.")
+        accepted = {
+            parameter.name: parameter for parameter in inspect.signature(self[name]).parameters.values()
+            if parameter.kind not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+        }
+        unknown = [key for key in params if key not in accepted]
+        if unknown:
+            raise ValueError(f"Unknown parameters for {name}: {unknown}")
+        for key, value in params.items():
+            kinds = (int, float) if accepted[key].annotation in (float, 'float') else (int,)
+            if isinstance(value, bool) or not isinstance(value, kinds) or not 0 < value < float('inf'):
+                kind = 'number' if float in kinds else 'integer'
+                raise ValueError(f"{name} {key} must be a positive {kind}, got {value!r}.")
+        return dict(params)
+
+    def describe(self, name: str) -> Dict:
+        """
+        Parameters with their defaults and what the default configuration
+        needs, for listing the strategies
+        """
+        cls = self[name]
+        parameters = {
+            parameter.name: None if parameter.default is inspect.Parameter.empty else parameter.default
+            for parameter in inspect.signature(cls).parameters.values()
+            if parameter.kind not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+        }
+        description = {
+            'name': name,
+            'source': self._sources.get(name),
+            # The class's own docstring; getdoc would fall back to TradingAlgo's
+            'description': inspect.cleandoc(cls.__dict__['__doc__']) if cls.__dict__.get('__doc__') else None,
+            'parameters': parameters
+        }
+        try:
+            algo = self.create(name)
+            description['required_indicators'] = [list(key) for key in algo.required_indicators()]
+            description['warmup_bars'] = algo.warmup_bars()
+        except TypeError:
+            # Some parameters have no default
+            pass
+        return description
+
+    def describe_all(self) -> List[Dict]:
+        descriptions = []
+        for name in self:
+            try:
+                descriptions.append(self.describe(name))
+            except Exception as e:
+                descriptions.append({'name': name, 'source': self._sources.get(name), 'error': str(e)})
+        return descriptions
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'strategies': len(self._targets),
+                'loaded': len(self._classes),
+                'instances': len(self._instances),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def __getitem__(self, name: str) -> type:
+        with self._lock:
+            cls = self._classes.get(name)
+            if cls is not None:
+                return cls
+            self._discover()
+            target = self._targets[name]
+            cls = target.load() if hasattr(target, 'load') else (
+                load_target(target) if isinstance(target, str) else target)
+            self._classes[name] = cls
+            return cls
+
+    def __contains__(self, name) -> bool:
+        with self._lock:
+            self._discover()
+            return name in self._targets
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            self._discover()
+            return iter(list(self._targets))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._discover()
+            return len(self._targets)
+
+    def _discover(self) -> None:
+        # Entry points are only read, not imported, until a strategy is used
+        if self._discovered:
+            return
+        self._discovered = True
+        try:
+            found = entry_points(group=self.entry_point_group)
+        except Exception as e:
+            logger.warning(f"Error reading {self.entry_point_group} entry points: {str(e)}")
+            return
+        for entry_point in found:
+            if entry_point.name in self._targets:
+                logger.warning(f"Ignoring entry point strategy {entry_point.name}: the name is already taken")
+                continue
+            self._targets[entry_point.name] = entry_point
+            self._sources[entry_point.name] = f"entry point {entry_point.value}"
+
+
+# Create a global instance
+strategy_registry = StrategyRegistry()
@@ -0,0 +1,192 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional
+from .streaming_indicators import RollingMean, RollingVariance, ExponentialMovingAverage, StreamingIndicator
+
+
+class StreamingTradingAlgo(ABC):
+    """
+    Tick-by-tick counterpart of TradingAlgo. Each update costs O(1) and the
+    signals equal those calculate_signals produces over the same series.
+    """
+
+    @abstractmethod
+    def update(self, price: float) -> int:
+        """Consume one price and return the signal for it (1 buy, -1 sell, 0 hold)"""
+        pass
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Forget all prices seen so far"""
+        pass
+
+    @abstractmethod
+    def indicator_values(self) -> Dict[str, float]:
+        """Indicators after the latest update, named like TradingAlgo.indicator_columns"""
+        pass
+
+    @abstractmethod
+    def get_strategy_name(self) -> str:
+        """Get the name of the strategy"""
+        pass
+
+    def warm_up(self, prices: Iterable[float]) -> List[int]:
+        """Feed historical prices, e.g. the Close column, and return their signals"""
+        return [self.update(float(price)) for price in prices]
+
+    def state(self) -> Dict[str, object]:
+        """
+        Everything update depends on (the indicators' running sums, windows
+        and EMAs and the previous values) as JSON-serializable values
+        """
+        return {name: value.state() if isinstance(value, StreamingIndicator) else value
+                for name, value in vars(self).items()}
+
+    def restore(self, state: Dict[str, object]) -> None:
+        """Continue from a state() taken from an algorithm with the same parameters"""
+        for name, value in state.items():
+            current = getattr(self, name)
+            if isinstance(current, StreamingIndicator):
+                current.restore(value)
+            else:
+                setattr(self, name, value)
+
+
+class StreamingSMAStrategy(StreamingTradingAlgo):
+    def __init__(self, short_window=50, long_window=200):
+        self.short_window = short_window
+        self.long_window = long_window
+        self._short = RollingMean(short_window)
+        self._long = RollingMean(long_window)
+        self.reset()
+
+    def reset(self) -> None:
+        self._short.reset()
+        self._long.reset()
+        self._prev_short = float('nan')
+        self._prev_long = float('nan')
+
+    def update(self, price: float) -> int:
+        short = self._short.update(price)
+        long = self._long.update(price)
+        signal = 0
+        if self._prev_short < self._prev_long and short > long:
+            signal = 1
+        if self._prev_short > self._prev_long and short < long:
+            signal = -1
+        self._prev_short = short
+        self._prev_long = long
+        return signal
+
+    def indicator_values(self) -> Dict[str, float]:
+        return {'SMA50': self._prev_short, 'SMA200': self._prev_long}
+
+    def get_strategy_name(self) -> str:
+        return "SMA"
+
+
+class StreamingBollingerBandsStrategy(StreamingTradingAlgo):
+    def __init__(self, window=20, num_std_dev=2):
+        self.window = window
+        self.num_std_dev = num_std_dev
+        self._mean = RollingMean(window)
+        self._std = RollingVariance(window)
+        self.reset()
+
+    def reset(self) -> None:
+        self._mean.reset()
+        self._std.reset()
+        self.mean = float('nan')
+        self.std_dev = float('nan')
+        self.upper = float('nan')
+        self.lower = float('nan')
+
+    def update(self, price: float) -> int:
+        self.mean = mean = self._mean.update(price)
+        self.std_dev = std = self._std.update(price)
+        self.upper = mean + (std * self.num_std_dev)
+        self.lower = mean - (std * self.num_std_dev)
+        if price > self.upper:
+            return -1
+        if price < self.lower:
+            return 1
+        return 0
+
+    def indicator_values(self) -> Dict[str, float]:
+        return {'SMA20': self.mean, 'std_dev': self.std_dev, 'Upper_BB': self.upper, 'Lower_BB': self.lower}
+
+    def get_strategy_name(self) -> str:
+        return "BollingerBands"
+
+
+class StreamingMACDStrategy(StreamingTradingAlgo):
+    def __init__(self, short_ema=12, long_ema=26, signal_line=9):
+        self.short_ema = short_ema
+        self.long_ema = long_ema
+        self.signal_line = signal_line
+        self._short = ExponentialMovingAverage(short_ema)
+        self._long = ExponentialMovingAverage(long_ema)
+        self._signal = ExponentialMovingAverage(signal_line)
+        self.reset()
+
+    def reset(self) -> None:
+        self._short.reset()
+        self._long.reset()
+        self._signal.reset()
+        self.short_value = float('nan')
+        self.long_value = float('nan')
+        self.macd = float('nan')
+        self.signal_value = float('nan')
+
+    def update(self, price: float) -> int:
+        self.short_value = self._short.update(price)
+        self.long_value = self._long.update(price)
+        self.macd = self.short_value - self.long_value
+        self.signal_value = self._signal.update(self.macd)
+        return 1 if self.macd > self.signal_value else -1
+
+    def indicator_values(self) -> Dict[str, float]:
+        return {'EMA12': self.short_value, 'EMA26': self.long_value, 'MACD': self.macd,
+                'Signal_Line': self.signal_value}
+
+    def get_strategy_name(self) -> str:
+        return "MACD"
+
+
+STREAMING_ALGORITHMS = {
+    'SMA': StreamingSMAStrategy,
+    'BollingerBands': StreamingBollingerBandsStrategy,
+    'MACD': StreamingMACDStrategy
+}
+
+
+def create_streaming_algo(algorithm: str, **params) -> StreamingTradingAlgo:
+    if algorithm not in STREAMING_ALGORITHMS:
+        raise ValueError("Invalid algorithm. Choose 'SMA', 'BollingerBands', or 'MACD'.")
+    return STREAMING_ALGORITHMS[algorithm](**params)
+
+
+class LiveSignalTracker:
+    """
+    Publisher callback that keeps one streaming algorithm per symbol and
+    remembers the latest signal, e.g.
+        tracker = LiveSignalTracker('MACD')
+        price_publisher.subscribe('AAPL', tracker)
+    """
+
+    def __init__(self, algorithm: str, on_signal: Optional[Callable[[str, int], None]] = None, **params):
+        self.algorithm = algorithm
+        self.params = params
+        self.on_signal = on_signal
+        self._algos: Dict[str, StreamingTradingAlgo] = {}
+        self.signals: Dict[str, int] = {}
+
+    def algo_for(self, symbol: str) -> StreamingTradingAlgo:
+        if symbol not in self._algos:
+            self._algos[symbol] = create_streaming_algo(self.algorithm, **self.params)
+        return self._algos[symbol]
+
+    def __call__(self, symbol: str, price: float) -> None:
+        signal = self.algo_for(symbol).update(price)
+        self.signals[symbol] = signal
+        if self.on_signal is not None and signal != 0:
+            self.on_signal(symbol, signal)
@@ -0,0 +1,222 @@
+import math
+from typing import Dict
+
+NaN = float('nan')
+
+
+class StreamingIndicator:
+    """
+    Base for the indicators below: their whole state is plain floats, ints
+    and a list, so it round-trips through JSON
+    """
+
+    def state(self) -> Dict[str, object]:
+        return {name: list(value) if isinstance(value, list) else value for name, value in vars(self).items()}
+
+    def restore(self, state: Dict[str, object]) -> None:
+        for name, value in state.items():
+            setattr(self, name, list(value) if isinstance(value, list) else value)
+
+
+class RollingMean(StreamingIndicator):
+    """
+    O(1) rolling mean over a ring buffer.
+
+    Follows pandas' roll_mean step for step (Kahan-compensated running sum,
+    separate compensation for adds and removes, same-value and sign fix-ups),
+    so the values are bit-identical to Series.rolling(window, min_periods).mean().
+    """
+
+    def __init__(self, window: int, min_periods: int = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.reset()
+
+    def reset(self) -> None:
+        self._buffer = [NaN] * self.window
+        self._head = 0
+        self._count = 0
+        self._nobs = 0
+        self._neg_ct = 0
+        self._sum = 0.0
+        self._compensation_add = 0.0
+        self._compensation_remove = 0.0
+        self._same_value_count = 0
+        self._prev_value = NaN
+        self.value = NaN
+
+    def update(self, value: float) -> float:
+        if self._count == self.window:
+            self._remove(self._buffer[self._head])
+        else:
+            self._count += 1
+        self._buffer[self._head] = value
+        self._head = (self._head + 1) % self.window
+        self._add(value)
+
+        if self._nobs >= self.min_periods and self._nobs > 0:
+            result = self._sum / self._nobs
+            if self._same_value_count >= self._nobs:
+                result = self._prev_value
+            elif self._neg_ct == 0 and result < 0:
+                result = 0.0
+            elif self._neg_ct == self._nobs and result > 0:
+                result = 0.0
+        else:
+            result = NaN
+        self.value = result
+        return result
+
+    def _add(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs += 1
+        y = value - self._compensation_add
+        t = self._sum + y
+        self._compensation_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._neg_ct += 1
+        if value == self._prev_value:
+            self._same_value_count += 1
+        else:
+            self._same_value_count = 1
+        self._prev_value = value
+
+    def _remove(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs -= 1
+        y = -value - self._compensation_remove
+        t = self._sum + y
+        self._compensation_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._neg_ct -= 1
+
+
+class RollingVariance(StreamingIndicator):
+    """
+    O(1) rolling sample variance / standard deviation using Welford's method.
+
+    Mirrors pandas' roll_var (Kahan-compensated Welford updates on add and
+    remove), so std matches Series.rolling(window).std() exactly.
+    """
+
+    def __init__(self, window: int, min_periods: int = None, ddof: int = 1):
+        self.window = window
+        self.min_periods = max(window if min_periods is None else min_periods, 1)
+        self.ddof = ddof
+        self.reset()
+
+    def reset(self) -> None:
+        self._buffer = [NaN] * self.window
+        self._head = 0
+        self._count = 0
+        self._nobs = 0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._compensation_add = 0.0
+        self._compensation_remove = 0.0
+        self._same_value_count = 0
+        self._prev_value = NaN
+        self.variance = NaN
+        self.std = NaN
+
+    def update(self, value: float) -> float:
+        """
+        Add a value and return the current standard deviation
+        """
+        if self._count == self.window:
+            self._remove(self._buffer[self._head])
+        else:
+            self._count += 1
+        self._buffer[self._head] = value
+        self._head = (self._head + 1) % self.window
+        self._add(value)
+
+        if self._nobs >= self.min_periods and self._nobs > self.ddof:
+            if self._nobs == 1 or self._same_value_count >= self._nobs:
+                variance = 0.0
+            else:
+                variance = self._ssqdm / (self._nobs - self.ddof)
+        else:
+            variance = NaN
+        self.variance = variance
+        # Same as pandas' zsqrt: negative round-off clamps to zero
+        self.std = variance if variance != variance else (math.sqrt(variance) if variance >= 0 else 0.0)
+        return self.std
+
+    def _add(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs += 1
+        if value == self._prev_value:
+            self._same_value_count += 1
+        else:
+            self._same_value_count = 1
+        self._prev_value = value
+
+        prev_mean = self._mean - self._compensation_add
+        y = value - self._compensation_add
+        t = y - self._mean
+        self._compensation_add = t + self._mean - y
+        self._mean = self._mean + t / self._nobs
+        self._ssqdm = self._ssqdm + (value - prev_mean) * (value - self._mean)
+
+    def _remove(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs -= 1
+        if self._nobs:
+            prev_mean = self._mean - self._compensation_remove
+            y = value - self._compensation_remove
+            t = y - self._mean
+            self._compensation_remove = t + self._mean - y
+            self._mean = self._mean - t / self._nobs
+            self._ssqdm = self._ssqdm - (value - prev_mean) * (value - self._mean)
+        else:
+            self._mean = 0.0
+            self._ssqdm = 0.0
+
+
+class ExponentialMovingAverage(StreamingIndicator):
+    """
+    Recursive EMA equal to Series.ewm(span=span, adjust=False).mean().
+    """
+
+    def __init__(self, span: float):
+        self.span = span
+        com = (span - 1) / 2.0
+        self.alpha = 1.0 / (1.0 + com)
+        self._old_wt_factor = 1.0 - self.alpha
+        self.reset()
+
+    def reset(self) -> None:
+        self._started = False
+        self._weighted = NaN
+        self._old_wt = 1.0
+        self._nobs = 0
+        self.value = NaN
+
+    def update(self, value: float) -> float:
+        is_observation = value == value
+        if not self._started:
+            self._started = True
+            self._weighted = value
+            self._nobs = int(is_observation)
+        else:
+            self._nobs += is_observation
+            if self._weighted == self._weighted:
+                self._old_wt *= self._old_wt_factor
+                if is_observation:
+                    # Constant series are left untouched to avoid round-off
+                    if self._weighted != value:
+                        weighted = self._old_wt * self._weighted + self.alpha * value
+                        self._weighted = weighted / (self._old_wt + self.alpha)
+                    self._old_wt = 1.0
+            elif is_observation:
+                self._weighted = value
+
+        self.value = self._weighted if self._nobs >= 1 else NaN
+        return self.value
@@ -1,11 +1,45 @@
 from abc import ABC, abstractmethod
+from typing import Dict, Hashable, Optional, Tuple
 import pandas as pd
 import numpy as np
+from .indicators import IndicatorCache, shift, ema_warmup_bars
 
 class TradingAlgo(ABC):
+    def calculate_signals(self, data: pd.DataFrame, indicators: Optional[IndicatorCache] = None) -> pd.DataFrame:
+        """
+        Return a copy of data with the strategy's indicator columns and a
+        'signal' column added; data itself is left untouched. Pass a shared
+        IndicatorCache of data['Close'] to reuse indicators across strategies.
+        """
+        if indicators is None:
+            indicators = IndicatorCache(data['Close'].to_numpy())
+        result = data.copy(deep=False)
+        for name, values in self.indicator_columns(indicators).items():
+            result[name] = np.array(values)
+        result['signal'] = self.generate_signals(indicators)
+        return result
+
+    @abstractmethod
+    def generate_signals(self, indicators: IndicatorCache) -> np.ndarray:
+        """Signals (1 buy, -1 sell, 0 hold) for every bar of the cached series"""
+        pass
+
     @abstractmethod
-    def calculate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Calculate trading signals based on the strategy"""
+    def indicator_columns(self, indicators: IndicatorCache) -> Dict[str, np.ndarray]:
+        """Intermediate indicator columns included in calculate_signals' output"""
+        pass
+
+    def required_indicators(self) -> Tuple[Hashable, ...]:
+        """
+        IndicatorCache keys of the base indicators generate_signals reads,
+        so they can be computed up front (IndicatorCache.prefetch) and
+        strategies sharing them scheduled together
+        """
+        return ()
+
+    @abstractmethod
+    def warmup_bars(self) -> int:
+        """Bars of history needed before a bar for its signal to match a full-series run"""
         pass
 
     @abstractmethod
@@ -14,55 +48,99 @@ class TradingAlgo(ABC):
         pass 
 
 class SMAStrategy(TradingAlgo):
+    """Buy when the short moving average crosses above the long one, sell when it crosses below"""
+
     def __init__(self, short_window=50, long_window=200):
         self.short_window = short_window
         self.long_window = long_window
 
-    def calculate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
-        data['SMA50'] = data['Close'].rolling(window=self.short_window, min_periods=self.short_window).mean()
-        data['SMA200'] = data['Close'].rolling(window=self.long_window, min_periods=self.long_window).mean()
-        data['signal'] = np.where(
-            (data['SMA50'].shift(1) < data['SMA200'].shift(1)) & 
-            (data['SMA50'] > data['SMA200']), 1, 0)
-        data['signal'] = np.where(
-            (data['SMA50'].shift(1) > data['SMA200'].shift(1)) & 
-            (data['SMA50'] < data['SMA200']), -1, data['signal'])
-        return data
+    def indicator_columns(self, indicators: IndicatorCache) -> Dict[str, np.ndarray]:
+        return {
+            'SMA50': indicators.sma(self.short_window, self.short_window),
+            'SMA200': indicators.sma(self.long_window, self.long_window)
+        }
+
+    def generate_signals(self, indicators: IndicatorCache) -> np.ndarray:
+        short = indicators.sma(self.short_window, self.short_window)
+        long = indicators.sma(self.long_window, self.long_window)
+        prev_short = shift(short)
+        prev_long = shift(long)
+        signal = np.where((prev_short < prev_long) & (short > long), 1, 0)
+        return np.where((prev_short > prev_long) & (short < long), -1, signal)
+
+    def required_indicators(self) -> Tuple[Hashable, ...]:
+        return (('sma', self.short_window, self.short_window), ('sma', self.long_window, self.long_window))
+
+    def warmup_bars(self) -> int:
+        # The crossover also looks at the previous bar's averages
+        return max(self.short_window, self.long_window)
 
     def get_strategy_name(self) -> str:
         return "SMA"
 
 class BollingerBandsStrategy(TradingAlgo):
-    def __init__(self, window=20, num_std_dev=2):
+    """Buy below the lower band and sell above the upper one, num_std_dev standard deviations from the mean"""
+
+    def __init__(self, window=20, num_std_dev: float = 2):
         self.window = window
         self.num_std_dev = num_std_dev
 
-    def calculate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
-        data['SMA20'] = data['Close'].rolling(window=self.window).mean()
-        data['std_dev'] = data['Close'].rolling(window=self.window).std()
-        data['Upper_BB'] = data['SMA20'] + (data['std_dev'] * self.num_std_dev)
-        data['Lower_BB'] = data['SMA20'] - (data['std_dev'] * self.num_std_dev)
-        data['signal'] = np.where(
-            data['Close'] > data['Upper_BB'], -1, 
-            np.where(data['Close'] < data['Lower_BB'], 1, 0))
-        return data
+    def _bands(self, indicators: IndicatorCache):
+        mean = indicators.sma(self.window)
+        std_dev = indicators.std(self.window)
+        upper = indicators.get(('bollinger_upper', self.window, self.num_std_dev),
+                               lambda: mean + (std_dev * self.num_std_dev))
+        lower = indicators.get(('bollinger_lower', self.window, self.num_std_dev),
+                               lambda: mean - (std_dev * self.num_std_dev))
+        return mean, std_dev, upper, lower
+
+    def indicator_columns(self, indicators: IndicatorCache) -> Dict[str, np.ndarray]:
+        mean, std_dev, upper, lower = self._bands(indicators)
+        return {'SMA20': mean, 'std_dev': std_dev, 'Upper_BB': upper, 'Lower_BB': lower}
+
+    def generate_signals(self, indicators: IndicatorCache) -> np.ndarray:
+        _, _, upper, lower = self._bands(indicators)
+        close = indicators.close
+        return np.where(close > upper, -1, np.where(close < lower, 1, 0))
+
+    def required_indicators(self) -> Tuple[Hashable, ...]:
+        return (('sma', self.window, self.window), ('std', self.window, self.window))
+
+    def warmup_bars(self) -> int:
+        return self.window
 
     def get_strategy_name(self) -> str:
         return "BollingerBands"
 
 class MACDStrategy(TradingAlgo):
+    """Buy while the MACD line is above its signal line, sell while it is below"""
+
     def __init__(self, short_ema=12, long_ema=26, signal_line=9):
         self.short_ema = short_ema
         self.long_ema = long_ema
         self.signal_line = signal_line
 
-    def calculate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
-        data['EMA12'] = data['Close'].ewm(span=self.short_ema, adjust=False).mean()
-        data['EMA26'] = data['Close'].ewm(span=self.long_ema, adjust=False).mean()
-        data['MACD'] = data['EMA12'] - data['EMA26']
-        data['Signal_Line'] = data['MACD'].ewm(span=self.signal_line, adjust=False).mean()
-        data['signal'] = np.where(data['MACD'] > data['Signal_Line'], 1, -1)
-        return data
+    def indicator_columns(self, indicators: IndicatorCache) -> Dict[str, np.ndarray]:
+        return {
+            'EMA12': indicators.ema(self.short_ema),
+            'EMA26': indicators.ema(self.long_ema),
+            'MACD': indicators.macd(self.short_ema, self.long_ema),
+            'Signal_Line': indicators.macd_signal(self.short_ema, self.long_ema, self.signal_line)
+        }
+
+    def generate_signals(self, indicators: IndicatorCache) -> np.ndarray:
+        macd = indicators.macd(self.short_ema, self.long_ema)
+        signal_line = indicators.macd_signal(self.short_ema, self.long_ema, self.signal_line)
+        return np.where(macd > signal_line, 1, -1)
+
+    def required_indicators(self) -> Tuple[Hashable, ...]:
+        return (('ema', self.short_ema), ('ema', self.long_ema), ('macd', self.short_ema, self.long_ema),
+                ('macd_signal', self.short_ema, self.long_ema, self.signal_line))
+
+    def warmup_bars(self) -> int:
+        # EMAs never forget, but the weight of bars older than this drops
+        # below 2**-60, far under float64 resolution
+        return ema_warmup_bars(max(self.short_ema, self.long_ema)) + ema_warmup_bars(self.signal_line)
 
     def get_strategy_name(self) -> str:
-        return "MACD" 
\ No newline at end of file
+        return "MACD"
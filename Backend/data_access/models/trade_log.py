@@ -0,0 +1,152 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+import numpy as np
+
+BUY = 1
+SELL = -1
+ACTION_NAMES = {BUY: 'BUY', SELL: 'SELL'}
+
+# One fill. bar is the row it happened on (-1 when unknown, e.g. for logs
+# read back from JSON); gain/loss is NaN on buys.
+TRADE_LOG_DTYPE = np.dtype([
+    ('bar', np.int64),
+    ('date', 'U10'),
+    ('action', np.int8),
+    ('price', np.float64),
+    ('shares', np.float64),
+    ('transaction_amount', np.float64),
+    ('gain/loss', np.float64),
+    ('balance', np.float64)
+])
+
+
+class TradeLog:
+    """
+    Trades of one backtest held in a growable NumPy structured array, about
+    90 bytes a trade instead of a dict of eight boxed values each.
+
+    The symbol is stored once, dates are formatted for many trades at a time
+    with format_dates, and to_dicts gives the familiar list of
+    {'date', 'symbol', 'action', ...} dicts for JSON responses and callers
+    that expect them. Indexing and iteration also yield those dicts.
+    """
+
+    def __init__(self, symbol: str, capacity: int = 16):
+        self.symbol = symbol
+        self._records = np.zeros(max(capacity, 1), dtype=TRADE_LOG_DTYPE)
+        self._size = 0
+        # Trades before this one already have their date filled in
+        self._dated = 0
+
+    @classmethod
+    def from_dicts(cls, trades: Sequence[Dict], symbol: Optional[str] = None) -> 'TradeLog':
+        """
+        Build a log from trade dicts, e.g. as read back from JSON
+        """
+        log = cls(symbol if symbol is not None else (trades[0]['symbol'] if trades else ''), len(trades))
+        records = log._records[:len(trades)]
+        records['bar'] = -1
+        records['date'] = [trade['date'] for trade in trades]
+        records['action'] = [BUY if trade['action'] == 'BUY' else SELL for trade in trades]
+        for name in ('price', 'shares', 'transaction_amount', 'balance'):
+            records[name] = [trade[name] for trade in trades]
+        records['gain/loss'] = [np.nan if trade['gain/loss'] is None else trade['gain/loss'] for trade in trades]
+        log._size = log._dated = len(trades)
+        return log
+
+    @property
+    def records(self) -> np.ndarray:
+        """The filled part of the array (a view)"""
+        return self._records[:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        return self._records.nbytes
+
+    def append(self, bar: int, action: int, price: float, shares: float, transaction_amount: float,
+               gain_loss: Optional[float], balance: float) -> None:
+        if self._size == len(self._records):
+            grown = np.zeros(2 * len(self._records), dtype=TRADE_LOG_DTYPE)
+            grown[:self._size] = self._records
+            self._records = grown
+        self._records[self._size] = (bar, '', action, price, shares, transaction_amount,
+                                     np.nan if gain_loss is None else gain_loss, balance)
+        self._size += 1
+
+    def trim(self) -> None:
+        """Drop the spare capacity, e.g. before the log is kept around"""
+        if len(self._records) > max(self._size, 1):
+            self._records = self._records[:max(self._size, 1)].copy()
+
+    def clear(self) -> None:
+        self._size = 0
+        self._dated = 0
+
+    def format_dates(self, formatter: Callable[[np.ndarray], Iterable[str]]) -> None:
+        """
+        Fill in the dates of the trades appended since the last call;
+        formatter maps an array of bars to their MM/DD/YYYY dates
+        """
+        if self._dated == self._size:
+            return
+        pending = self._records[self._dated:self._size]
+        pending['date'] = list(formatter(pending['bar']))
+        self._dated = self._size
+
+    def total_gain_loss(self) -> float:
+        """
+        Sum of the sells' gains and losses. cumsum adds strictly left to
+        right, so this is bit-for-bit the running total of a Python loop.
+        """
+        gains = self.records['gain/loss']
+        gains = gains[~np.isnan(gains)]
+        return float(np.cumsum(gains)[-1]) if len(gains) else 0
+
+    def copy(self) -> 'TradeLog':
+        log = TradeLog(self.symbol, self._size)
+        log._records[:self._size] = self.records
+        log._size = self._size
+        log._dated = self._dated
+        return log
+
+    def to_dicts(self) -> List[Dict]:
+        return self._dicts(self.records)
+
+    def _dicts(self, records: np.ndarray) -> List[Dict]:
+        columns = zip(records['date'].tolist(), records['action'].tolist(), records['price'].tolist(),
+                      records['shares'].tolist(), records['transaction_amount'].tolist(),
+                      records['gain/loss'].tolist(), records['balance'].tolist())
+        return [
+            {
+                'date': date,
+                'symbol': self.symbol,
+                'action': ACTION_NAMES[action],
+                'price': price,
+                'shares': shares,
+                'transaction_amount': transaction_amount,
+                'gain/loss': None if gain_loss != gain_loss else gain_loss,
+                'balance': balance
+            }
+            for date, action, price, shares, transaction_amount, gain_loss, balance in columns
+        ]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Dict:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("trade index out of range")
+        return self._dicts(self._records[index:index + 1])[0]
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.to_dicts())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TradeLog):
+            return self.symbol == other.symbol and self.to_dicts() == other.to_dicts()
+        if isinstance(other, list):
+            return self.to_dicts() == other
+        return NotImplemented
+
+    __hash__ = None
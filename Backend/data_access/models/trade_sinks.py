@@ -0,0 +1,305 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Union
+import numpy as np
+import pandas as pd
+from data_access.models.trade_log import BUY, TradeLog
+
+try:
+    import pyarrow
+    import pyarrow.parquet as parquet
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Column names of the exported trades, as in the trade_log dicts
+TRADE_COLUMNS = ['date', 'symbol', 'action', 'price', 'shares', 'transaction_amount', 'gain/loss', 'balance']
+
+# One buffered trade; run ties it to its summary record, which also holds
+# the symbol, so no fixed-width field limits how long a symbol may be. A
+# sell's missing gain/loss (on buys) is NaN here and empty/NULL in the files.
+TRADE_DTYPE = np.dtype([
+    ('run', np.int32),
+    ('date', 'U10'),
+    ('action', 'U4'),
+    ('price', np.float64),
+    ('shares', np.float64),
+    ('transaction_amount', np.float64),
+    ('gain/loss', np.float64),
+    ('balance', np.float64)
+])
+
+SUMMARY_COLUMNS = ['run', 'symbol', 'algorithm', 'params', 'final_balance', 'total_gain_loss', 'annual_return',
+                   'total_return', 'num_trades']
+
+SINK_SUFFIXES = {
+    'csv': ('.csv',),
+    'parquet': ('.parquet',),
+    'sqlite': ('.sqlite', '.sqlite3', '.db')
+}
+
+
+def summary_path(path: str) -> str:
+    """
+    Sidecar file holding the summary records of a CSV or Parquet export
+    """
+    base, suffix = os.path.splitext(path)
+    return f"{base}.summary{suffix}"
+
+
+class TradeSink(ABC):
+    """
+    Streaming destination for the trades of many backtests.
+
+    Trades are copied into a preallocated structured array of batch_rows
+    rows and written out a whole batch at a time, so exporting millions of
+    trades needs one buffer of memory rather than every trade log at once.
+    Each backtest's summary metrics go to a separate record (a sidecar file
+    or table) instead of being mixed into the trade rows. Writes are
+    serialized, so backtests running on several threads can share a sink.
+    """
+
+    def __init__(self, path: str, batch_rows: int = 65536):
+        self.path = path
+        self.batch_rows = batch_rows
+        self.trades_written = 0
+        self.batches_written = 0
+        self._buffer = np.zeros(batch_rows, dtype=TRADE_DTYPE)
+        self._rows = 0
+        self._summaries: List[Dict] = []
+        # Symbol of every run, indexed by run
+        self._symbols: List[str] = []
+        self._next_run = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def write_run(self, symbol: str, algorithm: str, params: Optional[Dict],
+                  trade_log: Union[TradeLog, Iterable[Dict]], final_balance: float, total_gain_loss: float, annual_return: float, total_return: float) -> int:
+        """
+        Record one backtest's trades and summary; returns its run id
+        """
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"Trade sink {self.path} is closed.")
+            run = self._next_run
+            self._next_run += 1
+            self._symbols.append(symbol)
+            if isinstance(trade_log, TradeLog):
+                num_trades = self._append_log(run, trade_log)
+            else:
+                num_trades = 0
+                for trade in trade_log:
+                    self._append(run, trade)
+                    num_trades += 1
+            self._summaries.append({
+                'run': run,
+                'symbol': symbol,
+                'algorithm': algorithm,
+                'params': json.dumps(params or {}, sort_keys=True),
+                'final_balance': float(final_balance),
+                'total_gain_loss': float(total_gain_loss),
+                'annual_return': float(annual_return),
+                'total_return': float(total_return),
+                'num_trades': num_trades
+            })
+            return run
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._flush()
+            self._write_summaries(pd.DataFrame(self._summaries, columns=SUMMARY_COLUMNS))
+            self._close()
+            self._closed = True
+
+    def __enter__(self) -> 'TradeSink':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _append(self, run: int, trade: Dict) -> None:
+        gain_loss = trade['gain/loss']
+        self._buffer[self._rows] = (
+            run, trade['date'], trade['action'], trade['price'], trade['shares'],
+            trade['transaction_amount'], np.nan if gain_loss is None else gain_loss, trade['balance']
+        )
+        self._rows += 1
+        if self._rows == self.batch_rows:
+            self._flush()
+
+    def _append_log(self, run: int, trade_log: TradeLog) -> int:
+        # Whole column slices at a time instead of a row per trade
+        records = trade_log.records
+        start = 0
+        while start < len(records):
+            rows = min(len(records) - start, self.batch_rows - self._rows)
+            part = records[start:start + rows]
+            target = self._buffer[self._rows:self._rows + rows]
+            target['run'] = run
+            target['action'] = np.where(part['action'] == BUY, 'BUY', 'SELL')
+            for name in ('date', 'price', 'shares', 'transaction_amount', 'gain/loss', 'balance'):
+                target[name] = part[name]
+            self._rows += rows
+            start += rows
+            if self._rows == self.batch_rows:
+                self._flush()
+        return len(records)
+
+    def _flush(self) -> None:
+        if self._rows == 0:
+            return
+        self._write_batch(self._buffer[:self._rows])
+        self.trades_written += self._rows
+        self.batches_written += 1
+        self._rows = 0
+
+    def _batch_symbols(self, batch: np.ndarray) -> np.ndarray:
+        return np.asarray(self._symbols, dtype=str)[batch['run']]
+
+    def _batch_frame(self, batch: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame({
+            name: self._batch_symbols(batch) if name == 'symbol' else batch[name]
+            for name in ('run',) + tuple(TRADE_COLUMNS)
+        })
+
+    @abstractmethod
+    def _write_batch(self, batch: np.ndarray) -> None:
+        """Append a batch of buffered trades to the destination"""
+        pass
+
+    @abstractmethod
+    def _write_summaries(self, summaries: pd.DataFrame) -> None:
+        """Write the summary record of every run"""
+        pass
+
+    def _close(self) -> None:
+        pass
+
+
+class CsvTradeSink(TradeSink):
+    """
+    Plain CSV with a header row and nothing else, so it bulk loads as is;
+    the summaries go to a .summary.csv sidecar
+    """
+
+    def __init__(self, path: str, batch_rows: int = 65536, include_run: bool = True):
+        super().__init__(path, batch_rows)
+        self.include_run = include_run
+        self._file = open(path, 'w', newline='')
+        columns = (['run'] if include_run else []) + TRADE_COLUMNS
+        self._file.write(','.join(columns) + '\n')
+
+    def _write_batch(self, batch: np.ndarray) -> None:
+        frame = self._batch_frame(batch)
+        if not self.include_run:
+            frame = frame.drop(columns='run')
+        frame.to_csv(self._file, header=False, index=False, lineterminator='\n')
+
+    def _write_summaries(self, summaries: pd.DataFrame) -> None:
+        summaries.to_csv(summary_path(self.path), index=False, lineterminator='\n')
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class ParquetTradeSink(TradeSink):
+    """
+    Parquet with one row group per batch; the summaries go to a
+    .summary.parquet sidecar
+    """
+
+    def __init__(self, path: str, batch_rows: int = 65536):
+        if not HAS_PYARROW:
+            raise ValueError("The parquet format requires pyarrow to be installed.")
+        super().__init__(path, batch_rows)
+        self._writer = None
+
+    def _write_batch(self, batch: np.ndarray) -> None:
+        table = pyarrow.Table.from_pandas(self._batch_frame(batch), preserve_index=False)
+        if self._writer is None:
+            self._writer = parquet.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+
+    def _write_summaries(self, summaries: pd.DataFrame) -> None:
+        summaries.to_parquet(summary_path(self.path), index=False)
+
+    def _close(self) -> None:
+        if self._writer is None:
+            # No trades at all: still leave a readable, empty file
+            self._write_batch(self._buffer[:0])
+        self._writer.close()
+
+
+class SqliteTradeSink(TradeSink):
+    """
+    trades and summaries tables in one SQLite database, one transaction per
+    batch
+    """
+
+    def __init__(self, path: str, batch_rows: int = 65536):
+        super().__init__(path, batch_rows)
+        # Batches can be flushed from whichever thread fills the buffer
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        # Like the file sinks, an export replaces the previous one
+        self._connection.execute('DROP TABLE IF EXISTS trades')
+        self._connection.execute('DROP TABLE IF EXISTS summaries')
+        self._connection.execute(
+            'CREATE TABLE trades (run INTEGER, date TEXT, symbol TEXT, action TEXT, price REAL, '
+            'shares REAL, transaction_amount REAL, gain_loss REAL, balance REAL)'
+        )
+        self._connection.execute(
+            'CREATE TABLE summaries (run INTEGER PRIMARY KEY, symbol TEXT, algorithm TEXT, '
+            'params TEXT, final_balance REAL, total_gain_loss REAL, annual_return REAL, total_return REAL, '
+            'num_trades INTEGER)'
+        )
+        self._connection.commit()
+
+    def _write_batch(self, batch: np.ndarray) -> None:
+        gain_loss = batch['gain/loss'].astype(object)
+        gain_loss[np.isnan(batch['gain/loss'])] = None
+        rows = zip(batch['run'].tolist(), batch['date'].tolist(), self._batch_symbols(batch).tolist(),
+                   batch['action'].tolist(), batch['price'].tolist(), batch['shares'].tolist(),
+                   batch['transaction_amount'].tolist(), gain_loss.tolist(), batch['balance'].tolist())
+        with self._connection:
+            self._connection.executemany('INSERT INTO trades VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def _write_summaries(self, summaries: pd.DataFrame) -> None:
+        with self._connection:
+            self._connection.executemany(
+                'INSERT INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                summaries[SUMMARY_COLUMNS].itertuples(index=False, name=None)
+            )
+
+    def _close(self) -> None:
+        self._connection.close()
+
+
+TRADE_SINKS = {
+    'csv': CsvTradeSink,
+    'parquet': ParquetTradeSink,
+    'sqlite': SqliteTradeSink
+}
+
+
+def create_trade_sink(path: str, format: Optional[str] = None, **kwargs) -> TradeSink:
+    """
+    Open the sink for path, picking the format from its suffix unless given
+    """
+    if format is None:
+        format = next((name for name, suffixes in SINK_SUFFIXES.items() if path.endswith(suffixes)), None)
+        if format is None:
+            raise ValueError(f"Unknown trade export file type: {path}")
+    if format not in TRADE_SINKS:
+        raise ValueError(f"Invalid format '{format}'. Choose from {list(TRADE_SINKS)}.")
+    return TRADE_SINKS[format](path, **kwargs)
@@ -1,18 +1,79 @@
+import os
+import re
+from typing import Optional
 import pandas as pd
 import numpy as np
-import csv
-from data_access.models.strategy_pattern.tradingAlgos import SMAStrategy, BollingerBandsStrategy, MACDStrategy
+from data_access.models.strategy_pattern.registry import strategy_registry
+from data_access.models.strategy_pattern.indicators import IndicatorCache
+from data_access.models.trade_log import BUY, SELL, TradeLog
+from data_access.models.trade_sinks import CsvTradeSink
+from data_access.metrics import metrics
+
+# Name -> strategy class, loaded on first use
+ALGORITHMS = strategy_registry
+
+_ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}(?:[T ]|$)')
+
+
+def format_trade_date(value) -> str:
+    """
+    Format a bar date as MM/DD/YYYY, slicing ISO strings instead of parsing them.
+    """
+    if isinstance(value, str) and _ISO_DATE.match(value):
+        return f"{value[5:7]}/{value[8:10]}/{value[:4]}"
+    return pd.to_datetime(value).strftime('%m/%d/%Y')
+
+
+def create_algo(algorithm: str, **params):
+    """
+    The TradingAlgo registered under the given name with the given parameters,
+    shared with every other caller asking for the same combination.
+    """
+    return strategy_registry.create(algorithm, **params)
+
+
+def years_between(start_date, end_date) -> float:
+    """
+    Length of the backtest period in years, as used for the annual return.
+    """
+    total_days = (pd.to_datetime(end_date) - pd.to_datetime(start_date)).days
+    return total_days / 365.25
+
+
+def trade_points(signal: np.ndarray, previous_signal: int = -1) -> np.ndarray:
+    """
+    Return the bar indices where the all-in / all-out strategy actually trades.
+
+    A buy only fills while flat and a sell only while holding, so the fills are
+    the non-zero signals that differ from the previous non-zero signal, with
+    the position starting flat (as if the last signal was a sell) unless
+    previous_signal=1 says a position is already open.
+    """
+    nonzero = np.flatnonzero(signal)
+    if len(nonzero) == 0:
+        return nonzero
+    values = signal[nonzero]
+    previous = np.empty_like(values)
+    previous[0] = previous_signal
+    previous[1:] = values[:-1]
+    return nonzero[values != previous]
+
 
 class TradingStrategy:
     INITIAL_BALANCE = 100000
 
-    def __init__(self, data, symbol, algorithm):
+    def __init__(self, data, symbol, algorithm, params=None, indicators: IndicatorCache = None,
+                 signals: np.ndarray = None):
         self.data = data
         self.symbol = symbol
         self.algorithm = algorithm
+        self.params = params or {}
+        self.indicators = indicators
+        # Precomputed signal column, e.g. from the signal store
+        self.signals = signals
         self.balance = self.INITIAL_BALANCE
         self.shares = 0
-        self.trade_log = []
+        self.trade_log = TradeLog(symbol)
         self.total_gain_loss = 0
         self.annual_return = 0
         self.total_return = 0
@@ -21,100 +82,121 @@ class TradingStrategy:
         """
         Calculate signals based on the selected algorithm.
         """
-        if self.algorithm == 'SMA':
-            strategy = SMAStrategy()
-        elif self.algorithm == 'BollingerBands':
-            strategy = BollingerBandsStrategy()
-        elif self.algorithm == 'MACD':
-            strategy = MACDStrategy()
-        else:
-            raise ValueError("Invalid algorithm. Choose 'SMA', 'BollingerBands', or 'MACD'.")
-        
-        self.data = strategy.calculate_signals(self.data)
+        if self.signals is not None:
+            if len(self.signals) != len(self.data):
+                raise ValueError("Precomputed signals do not match the market data.")
+            self.data = self.data.copy(deep=False)
+            self.data['signal'] = self.signals
+            return
+        strategy = create_algo(self.algorithm, **self.params)
+        with metrics.stage('signals'):
+            self.data = strategy.calculate_signals(self.data, self.indicators)
 
-    def run_backtest(self):
+    def run_backtest(self, compact: bool = False):
         """
         Backtest a trading strategy based on the selected algorithm.
+
+        The trade log is a list of trade dicts, or with compact=True the
+        TradeLog itself, for callers that keep many results around and only
+        convert the trades they actually send out.
         """
         self.calculate_signals()
 
+        with metrics.stage('simulate'):
+            if not self._simulate_fills():
+                self._simulate_rows()
+
+        return self._summarize(compact)
+
+    def _simulate_fills(self):
+        """
+        Simulate the trades working only on the bars where a fill happens.
+
+        Returns False (with the state reset) when a buy cannot afford a single
+        share, since the position then stays flat and the row-by-row loop is
+        needed to reproduce the repeated empty buys.
+        """
+        close = self.data['Close'].to_numpy()
+        signal = self.data['signal'].to_numpy()
+
+        for i in trade_points(signal):
+            price = close[i]
+
+            if signal[i] == 1:
+                self.shares = self.balance // price
+                if self.shares == 0:
+                    self.balance = self.INITIAL_BALANCE
+                    self.shares = 0
+                    self.trade_log.clear()
+                    return False
+                transaction_amount = self.shares * price
+                self.balance -= transaction_amount
+                self._log_trade(i, BUY, price, transaction_amount, None)
+            else:
+                self._sell(i, price)
+
+        # Final sell if shares remain
+        if self.shares > 0:
+            self._sell(len(close) - 1, close[-1])
+
+        return True
+
+    def _sell(self, bar, price):
+        transaction_amount = self.shares * price
+        gain_loss = transaction_amount - (self.shares * self.trade_log.records['price'][-1])
+        self.balance += transaction_amount
+        self._log_trade(bar, SELL, price, transaction_amount, gain_loss)
+        self.shares = 0
+
+    def _log_trade(self, bar, action, price, transaction_amount, gain_loss):
+        # Dates are formatted for the whole log in _summarize
+        self.trade_log.append(bar, action, price, self.shares, transaction_amount, gain_loss, self.balance)
+
+    def _simulate_rows(self):
+        """
+        Reference row-by-row simulation, used when the fill-only path bails out.
+        """
         for i in range(len(self.data)):
             price = self.data['Close'].iloc[i]
             signal = self.data['signal'].iloc[i]
-            date = pd.to_datetime(self.data['Date'].iloc[i]).strftime('%m/%d/%Y')
 
             # Buy signal
             if signal == 1 and self.shares == 0:
                 self.shares = self.balance // price
                 transaction_amount = self.shares * price
                 self.balance -= transaction_amount
-                self.trade_log.append({
-                    'date': date,
-                    'symbol': self.symbol,
-                    'action': 'BUY',
-                    'price': price,
-                    'shares': self.shares,
-                    'transaction_amount': transaction_amount,
-                    'gain/loss': None,
-                    'balance': self.balance
-                })
+                self._log_trade(i, BUY, price, transaction_amount, None)
 
             # Sell signal
             elif signal == -1 and self.shares > 0:
-                transaction_amount = self.shares * price
-                gain_loss = transaction_amount - (self.shares * self.trade_log[-1]['price'])
-                self.balance += transaction_amount
-                self.trade_log.append({
-                    'date': date,
-                    'symbol': self.symbol,
-                    'action': 'SELL',
-                    'price': price,
-                    'shares': self.shares,
-                    'transaction_amount': transaction_amount,
-                    'gain/loss': gain_loss,
-                    'balance': self.balance
-                })
-                self.shares = 0  # Reset shares after selling
+                self._sell(i, price)
 
         # Final sell if shares remain
         if self.shares > 0:
-            price = self.data['Close'].iloc[-1]
-            transaction_amount = self.shares * price
-            gain_loss = transaction_amount - (self.shares * self.trade_log[-1]['price'])
-            self.balance += transaction_amount
-            date = pd.to_datetime(self.data['Date'].iloc[-1]).strftime('%m/%d/%Y')
-            self.trade_log.append({
-                'date': date,
-                'symbol': self.symbol,
-                'action': 'SELL',
-                'price': price,
-                'shares': self.shares,
-                'transaction_amount': transaction_amount,
-                'gain/loss': gain_loss,
-                'balance': self.balance
-            })
-            self.shares = 0
-
-        self.total_gain_loss = sum(trade['gain/loss'] for trade in self.trade_log if trade['gain/loss'] is not None)
-        start_date = pd.to_datetime(self.data['Date'].iloc[0])
-        end_date = pd.to_datetime(self.data['Date'].iloc[-1])
-        total_days = (end_date - start_date).days
-        total_years = total_days / 365.25
+            self._sell(len(self.data) - 1, self.data['Close'].iloc[-1])
+
+    def _summarize(self, compact: bool = False):
+        dates = self.data['Date'].to_numpy()
+        self.trade_log.format_dates(lambda bars: [format_trade_date(date) for date in dates[bars]])
+        self.total_gain_loss = self.trade_log.total_gain_loss()
+        total_years = years_between(self.data['Date'].iloc[0], self.data['Date'].iloc[-1])
         self.total_return = (self.balance / self.INITIAL_BALANCE - 1) * 100
         self.annual_return = ((self.balance / self.INITIAL_BALANCE) ** (1 / total_years) - 1) * 100 if total_years > 0 else 0
 
-        return self.balance, self.trade_log, self.total_gain_loss, self.annual_return, self.total_return
-
-    def save_trades_to_csv(self):
-        filename = f"{self.symbol}_{self.algorithm}_trades.csv"
-        fieldnames = [
-            'date', 'symbol', 'action', 'price', 'shares',
-            'transaction_amount', 'gain/loss', 'balance'
-        ]
-        with open(filename, mode='w', newline='') as file:
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            for trade in self.trade_log:
-                writer.writerow(trade)
-            summary_writer = csv.writer(file)
-            summary_writer.writerow([f"Total Gain/Loss: {self.total_gain_loss:.2f} | Final Balance: {self.balance:.2f}"])
+        if compact:
+            self.trade_log.trim()
+            trade_log = self.trade_log
+        else:
+            trade_log = self.trade_log.to_dicts()
+        return self.balance, trade_log, self.total_gain_loss, self.annual_return, self.total_return
+
+    def save_trades_to_csv(self, directory: str = '.', filename: Optional[str] = None) -> str:
+        """
+        Write the trade log as a plain CSV and the summary metrics to a
+        .summary.csv sidecar next to it; returns the CSV path
+        """
+        path = os.path.join(directory, filename or f"{self.symbol}_{self.algorithm}_trades.csv")
+        with CsvTradeSink(path, include_run=False) as sink:
+            sink.write_run(self.symbol, self.algorithm, self.params, self.trade_log, self.balance,
+                           self.total_gain_loss, self.annual_return, self.total_return)
+        return path
@@ -0,0 +1,149 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from data_access.models.shared_arrays import SharedArray
+from data_access.models.worker_pool import create_pool, pool_size
+from data_access.models.strategy_pattern.indicators import IndicatorCache
+from data_access.models.parameter_sweep import (
+    RANK_METRICS, evaluate_combo, expand_grid, required_indicators, summarize_signals
+)
+from data_access.models.trading_strategy import create_algo, format_trade_date, years_between
+
+# (train_start, train_end, test_start, test_end) bar indices, ends exclusive
+Window = Tuple[int, int, int, int]
+
+# Per-worker state set up by _init_worker
+_worker_close = None
+_worker_shared = None
+_worker_combos = None
+_worker_rank_by = None
+
+
+def walk_forward_windows(bars: int, train_bars: int, test_bars: int, step_bars: Optional[int] = None,
+                         anchored: bool = False) -> List[Window]:
+    """
+    Consecutive train/test windows over a series of bars. Each test window
+    directly follows its train window, and the windows advance by step_bars
+    (test_bars by default, so the test windows tile the series). A smaller
+    step would overlap the test windows, which are compounded one after
+    another, so it is rejected. Anchored train windows all start at the
+    first bar and grow instead of rolling.
+    """
+    if train_bars < 1 or test_bars < 1:
+        raise ValueError("train_bars and test_bars must be positive.")
+    step_bars = step_bars or test_bars
+    if step_bars < test_bars:
+        raise ValueError(f"step_bars must be at least test_bars ({test_bars}) so the test windows do not overlap.")
+    windows = []
+    test_start = train_bars
+    while test_start + test_bars <= bars:
+        train_start = 0 if anchored else test_start - train_bars
+        windows.append((train_start, test_start, test_start, test_start + test_bars))
+        test_start += step_bars
+    return windows
+
+
+def optimize_window(close: np.ndarray, window: Window, years: Tuple[float, float],
+                    combos: List[Tuple[str, Dict]], rank_by: str) -> Dict:
+    """
+    Pick the best combination on the train window and backtest it, flat at
+    the start, on the test window. Test signals are computed with the
+    strategy's warmup bars of history before the window, so they match a
+    full-series run.
+    """
+    train_start, train_end, test_start, test_end = window
+    train_close = close[train_start:train_end]
+    indicators = IndicatorCache(train_close)
+    indicators.prefetch(required_indicators(combos))
+    train_results = [evaluate_combo(train_close, years[0], algorithm, params, indicators)
+                     for algorithm, params in combos]
+    best = max(train_results, key=lambda result: result[rank_by])
+
+    algo = create_algo(best['algorithm'], **best['params'])
+    lead = max(0, test_start - algo.warmup_bars())
+    signal = algo.generate_signals(IndicatorCache(close[lead:test_end]))[test_start - lead:]
+    return {
+        'algorithm': best['algorithm'],
+        'params': best['params'],
+        'train': {metric: best[metric] for metric in RANK_METRICS},
+        'test': summarize_signals(close[test_start:test_end], signal, years[1])
+    }
+
+
+def _init_worker(descriptor: Dict, combos: List[Tuple[str, Dict]], rank_by: str) -> None:
+    global _worker_close, _worker_shared, _worker_combos, _worker_rank_by
+    _worker_shared = SharedArray.attach(descriptor)
+    _worker_close = _worker_shared.array
+    _worker_combos = combos
+    _worker_rank_by = rank_by
+
+
+def _optimize_in_worker(task: Tuple[int, Window, Tuple[float, float]]) -> Tuple[int, Dict]:
+    n, window, years = task
+    return n, optimize_window(_worker_close, window, years, _worker_combos, _worker_rank_by)
+
+
+def run_walk_forward(data: pd.DataFrame, grids: Dict[str, Dict[str, Iterable]], train_bars: int, test_bars: int,
+                     step_bars: Optional[int] = None, anchored: bool = False, rank_by: str = 'total_return',
+                     processes: Optional[int] = None) -> Dict:
+    """
+    Walk-forward analysis: re-optimize the grid on every train window and
+    keep only the out-of-sample results of the chosen parameters.
+
+    Windows are independent, so they are spread over a process pool reading
+    the close prices from shared memory, as in run_sweep. The summary chains
+    the test windows: the out-of-sample return is what re-optimizing and
+    trading each window in turn would have compounded to, which is why the
+    test windows may not overlap.
+    """
+    if rank_by not in RANK_METRICS:
+        raise ValueError(f"Invalid rank_by '{rank_by}'. Choose from {RANK_METRICS}.")
+    combos = expand_grid(grids)
+    if not combos:
+        raise ValueError("No parameter combinations to optimize.")
+    windows = walk_forward_windows(len(data), train_bars, test_bars, step_bars, anchored)
+    if not windows:
+        raise ValueError(f"{len(data)} bars are too few for a {train_bars} bar train and {test_bars} bar test window.")
+
+    close = np.ascontiguousarray(data['Close'].to_numpy(dtype=np.float64))
+    dates = data['Date'].to_numpy()
+    tasks = [
+        (n, window, (years_between(dates[window[0]], dates[window[1] - 1]),
+                     years_between(dates[window[2]], dates[window[3] - 1])))
+        for n, window in enumerate(windows)
+    ]
+    processes = pool_size(processes, len(tasks))
+
+    if processes == 1:
+        results = [(n, optimize_window(close, window, years, combos, rank_by)) for n, window, years in tasks]
+    else:
+        with SharedArray.create(close) as shared:
+            chunksize = max(1, len(tasks) // (processes * 4))
+            with create_pool(processes, _init_worker, (shared.descriptor(), combos, rank_by)) as pool:
+                results = list(pool.imap_unordered(_optimize_in_worker, tasks, chunksize=chunksize))
+    results.sort(key=lambda result: result[0])
+
+    window_results = []
+    for (n, (train_start, train_end, test_start, test_end), _), (_, result) in zip(tasks, results):
+        result.update({
+            'window': n,
+            'train_start': format_trade_date(dates[train_start]),
+            'train_end': format_trade_date(dates[train_end - 1]),
+            'test_start': format_trade_date(dates[test_start]),
+            'test_end': format_trade_date(dates[test_end - 1])
+        })
+        window_results.append(result)
+
+    growth = float(np.prod([1 + result['test']['total_return'] / 100 for result in window_results]))
+    total_years = years_between(dates[windows[0][2]], dates[windows[-1][3] - 1])
+    return {
+        'windows': window_results,
+        'summary': {
+            'windows': len(window_results),
+            'total_return': (growth - 1) * 100,
+            'annual_return': (growth ** (1 / total_years) - 1) * 100 if total_years > 0 else 0,
+            'profitable_windows': sum(result['test']['total_return'] > 0 for result in window_results),
+            'mean_train_return': float(np.mean([result['train']['total_return'] for result in window_results])),
+            'mean_test_return': float(np.mean([result['test']['total_return'] for result in window_results]))
+        }
+    }
@@ -0,0 +1,35 @@
+import multiprocessing
+import os
+from typing import Callable, Optional, Sequence
+
+# Upper bound on the processes of any one pool, whatever a caller (or a
+# client request) asks for
+MAX_WORKER_PROCESSES = int(os.environ.get('MAX_WORKER_PROCESSES') or os.cpu_count() or 1)
+
+# Imported once by the fork server, so each worker starts with them loaded
+PRELOAD_MODULES = ['numpy', 'pandas', 'data_access.models.parameter_sweep']
+
+
+def pool_size(processes: Optional[int], tasks: int) -> int:
+    """
+    Processes to use for tasks: as asked (all CPUs by default), but never
+    more than MAX_WORKER_PROCESSES or the number of tasks
+    """
+    return max(1, min(processes or MAX_WORKER_PROCESSES, MAX_WORKER_PROCESSES, tasks))
+
+
+def worker_context():
+    """
+    forkserver where available, otherwise spawn. Plain fork would copy the
+    threaded server process, including locks other threads are holding,
+    into every worker.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(PRELOAD_MODULES)
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def create_pool(processes: int, initializer: Callable, initargs: Sequence):
+    return worker_context().Pool(processes, initializer=initializer, initargs=tuple(initargs))
@@ -1,30 +1,196 @@
-from typing import Dict, List, Callable
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PriceCallback = Callable[[str, float], None]
+
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST)
+
+
+class Subscription:
+    """
+    One callback's subscription to a symbol, with its own bounded queue.
+
+    Updates for a subscription are delivered in order by at most one executor
+    thread at a time, so a slow callback only delays itself.
+    """
+
+    def __init__(self, symbol: str, callback: PriceCallback, max_queue: int, overflow: str):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy '{overflow}'. Choose from {list(OVERFLOW_POLICIES)}.")
+        self.symbol = symbol
+        self.callback = callback
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.dropped = 0
+        self.active = True
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def depth(self) -> int:
+        return len(self._queue)
+
 
 class PricePublisher:
     _instance = None
+    _instance_lock = threading.Lock()
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(PricePublisher, cls).__new__(cls)
-            cls._instance._subscribers = {}
+    def __new__(cls, *args, **kwargs):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super(PricePublisher, cls).__new__(cls)
+                instance._setup(*args, **kwargs)
+                cls._instance = instance
         return cls._instance
 
-    def __init__(self):
-        self._subscribers: Dict[str, List[Callable[[str, float], None]]] = {}
-    
-    def subscribe(self, symbol: str, callback: Callable[[str, float], None]):
-        if symbol not in self._subscribers:
-            self._subscribers[symbol] = []
-        self._subscribers[symbol].append(callback)
-    
-    def unsubscribe(self, symbol: str, callback: Callable[[str, float], None]):
-        if symbol in self._subscribers and callback in self._subscribers[symbol]:
-            self._subscribers[symbol].remove(callback)
-    
+    def __init__(self, max_workers: Optional[int] = None, max_queue: int = 1000):
+        # All state is created once in _setup; calling PricePublisher() again
+        # must hand back the same subscribers rather than reset them
+        pass
+
+    def _setup(self, max_workers: Optional[int] = None, max_queue: int = 1000):
+        self.max_queue = max_queue
+        self._subscribers: Dict[str, Tuple[Subscription, ...]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or int(os.environ.get('PRICE_DISPATCH_WORKERS', 8)),
+            thread_name_prefix='price-dispatch'
+        )
+        self._in_flight = 0
+        self._idle = threading.Condition()
+        self._latency: Dict[str, list] = {}
+        self._latency_lock = threading.Lock()
+
+    def subscribe(self, symbol: str, callback: PriceCallback, max_queue: Optional[int] = None,
+                  overflow: str = DROP_OLDEST) -> Subscription:
+        subscription = Subscription(symbol, callback, max_queue or self.max_queue, overflow)
+        with self._lock:
+            self._subscribers[symbol] = self._subscribers.get(symbol, ()) + (subscription,)
+        return subscription
+
+    def unsubscribe(self, symbol: str, callback: PriceCallback):
+        with self._lock:
+            subscriptions = self._subscribers.get(symbol, ())
+            for subscription in subscriptions:
+                if subscription.callback == callback:
+                    subscription.active = False
+                    remaining = tuple(s for s in subscriptions if s is not subscription)
+                    if remaining:
+                        self._subscribers[symbol] = remaining
+                    else:
+                        del self._subscribers[symbol]
+                    return
+
     def notify(self, symbol: str, price: float):
-        if symbol in self._subscribers:
-            for callback in self._subscribers[symbol]:
-                callback(symbol, price)
+        """
+        Queue the update for every subscriber of symbol and return immediately
+        """
+        now = time.perf_counter()
+        for subscription in self._subscribers.get(symbol, ()):
+            self._enqueue(subscription, price, now)
+
+    def notify_batch(self, symbols: Iterable[str], prices: Iterable[float]):
+        now = time.perf_counter()
+        subscribers = self._subscribers
+        for symbol, price in zip(symbols, prices):
+            for subscription in subscribers.get(symbol, ()):
+                self._enqueue(subscription, price, now)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued update has been delivered (mainly for tests)
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def queue_depths(self) -> Dict[str, int]:
+        """
+        Number of undelivered updates per symbol
+        """
+        with self._lock:
+            snapshot = dict(self._subscribers)
+        return {symbol: sum(s.depth() for s in subscriptions) for symbol, subscriptions in snapshot.items()}
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Dispatch counters per symbol: deliveries, mean/max latency from
+        notify to callback start, queue depth and dropped updates
+        """
+        depths = self.queue_depths()
+        with self._lock:
+            dropped = {symbol: sum(s.dropped for s in subscriptions) for symbol, subscriptions in self._subscribers.items()}
+        with self._latency_lock:
+            latency = {symbol: list(values) for symbol, values in self._latency.items()}
+
+        stats = {}
+        for symbol in set(latency) | set(depths):
+            count, total, worst = latency.get(symbol, (0, 0.0, 0.0))
+            stats[symbol] = {
+                'dispatched': count,
+                'avg_latency_ms': total / count * 1000 if count else 0.0,
+                'max_latency_ms': worst * 1000,
+                'queue_depth': depths.get(symbol, 0),
+                'dropped': dropped.get(symbol, 0)
+            }
+        return stats
+
+    def _enqueue(self, subscription: Subscription, price: float, queued_at: float):
+        with subscription._lock:
+            if len(subscription._queue) >= subscription.max_queue:
+                subscription.dropped += 1
+                if subscription.overflow == DROP_NEWEST:
+                    return
+                subscription._queue.popleft()
+                self._done(1)
+            subscription._queue.append((price, queued_at))
+            with self._idle:
+                self._in_flight += 1
+            if subscription._scheduled:
+                return
+            subscription._scheduled = True
+        self._executor.submit(self._drain, subscription)
+
+    def _drain(self, subscription: Subscription):
+        while True:
+            with subscription._lock:
+                if not subscription._queue:
+                    subscription._scheduled = False
+                    return
+                price, queued_at = subscription._queue.popleft()
+
+            if subscription.active:
+                self._record_latency(subscription.symbol, time.perf_counter() - queued_at)
+                try:
+                    subscription.callback(subscription.symbol, price)
+                except Exception as e:
+                    logger.warning(f"Error in price callback for {subscription.symbol}: {str(e)}")
+            self._done(1)
+
+    def _done(self, count: int):
+        with self._idle:
+            self._in_flight -= count
+            if self._in_flight == 0:
+                self._idle.notify_all()
+
+    def _record_latency(self, symbol: str, latency: float):
+        with self._latency_lock:
+            entry = self._latency.get(symbol)
+            if entry is None:
+                self._latency[symbol] = [1, latency, latency]
+            else:
+                entry[0] += 1
+                entry[1] += latency
+                if latency > entry[2]:
+                    entry[2] = latency
 
 # Create a global instance
-price_publisher = PricePublisher() 
\ No newline at end of file
+price_publisher = PricePublisher()
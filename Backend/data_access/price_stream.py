@@ -0,0 +1,198 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from data_access.price_publisher import PricePublisher, price_publisher
+from data_access.symbols import is_valid_symbol
+
+logger = logging.getLogger(__name__)
+
+# Every watched symbol is simulated on every tick, so cap what one
+# connection can ask for
+MAX_STREAM_SYMBOLS = int(os.environ.get('MAX_STREAM_SYMBOLS', '50'))
+
+# Each open stream holds one of the worker's request threads for as long as
+# it lasts, so only part of them may stream; half of gunicorn's by default
+MAX_STREAM_CLIENTS = int(os.environ.get('MAX_STREAM_CLIENTS')
+                         or max(1, int(os.environ.get('GUNICORN_THREADS', '8')) // 2))
+
+
+class StreamLimitError(RuntimeError):
+    """
+    Raised by PriceStreamHub.connect when max_clients streams are open
+    """
+
+
+class PriceStreamClient:
+    """
+    Bounded mailbox for one streaming client.
+
+    Only the latest price per symbol is kept, so a slow consumer gets
+    coalesced updates instead of an ever-growing backlog. If more than
+    max_pending symbols are waiting, the oldest one is dropped. Batches are
+    handed out at most every min_interval seconds, which bounds how often a
+    client's thread wakes up no matter how fast prices tick.
+    """
+
+    def __init__(self, symbols: Iterable[str], max_pending: int = 256, min_interval: float = 0.1):
+        self.symbols = tuple(dict.fromkeys(symbols))
+        self.max_pending = max_pending
+        self.min_interval = min_interval
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.closed = False
+        self._pending: 'OrderedDict[str, float]' = OrderedDict()
+        self._condition = threading.Condition()
+        self._last_batch = 0.0
+
+    def offer(self, symbol: str, price: float) -> None:
+        with self._condition:
+            if self.closed:
+                return
+            if symbol in self._pending:
+                self.coalesced += 1
+                self._pending.move_to_end(symbol)
+            elif len(self._pending) >= self.max_pending:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            self._pending[symbol] = price
+            if len(self._pending) == 1:
+                self._condition.notify()
+
+    def next_batch(self, timeout: Optional[float] = None) -> List[Tuple[str, float]]:
+        """
+        Wait up to timeout seconds for updates and return all pending ones
+        """
+        remaining = self._last_batch + self.min_interval - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+        with self._condition:
+            if not self._pending and not self.closed:
+                self._condition.wait(timeout)
+            updates = list(self._pending.items())
+            self._pending.clear()
+            self.delivered += len(updates)
+            self._last_batch = time.monotonic()
+            return updates
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def close(self) -> None:
+        with self._condition:
+            self.closed = True
+            self._pending.clear()
+            self._condition.notify_all()
+
+
+class PriceStreamHub:
+    """
+    Fans PricePublisher updates out to any number of streaming clients.
+
+    The hub holds a single publisher subscription per symbol no matter how
+    many clients watch it, and drops it again when the last client leaves.
+    While clients are connected a pump thread advances the simulated price of
+    each watched symbol every tick_interval seconds. A symbol whose price
+    cannot be simulated (e.g. an unknown ticker) is dropped after its first
+    failure rather than fetched again on every tick.
+    """
+
+    def __init__(self, publisher: PricePublisher, tick_interval: float = 1.0, simulator=None,
+                 max_symbols: int = MAX_STREAM_SYMBOLS, max_clients: int = MAX_STREAM_CLIENTS):
+        self.publisher = publisher
+        self.tick_interval = tick_interval
+        self.max_symbols = max_symbols
+        self.max_clients = max_clients
+        self._simulator = simulator
+        self._clients: Dict[str, Set[PriceStreamClient]] = {}
+        self._connected: Set[PriceStreamClient] = set()
+        self._lock = threading.Lock()
+        self._pump: Optional[threading.Thread] = None
+
+    def connect(self, symbols: Iterable[str], max_pending: int = 256, min_interval: float = 0.1,
+                pump: bool = True) -> PriceStreamClient:
+        """
+        Start watching symbols; raises ValueError for malformed tickers or
+        more than max_symbols of them, and StreamLimitError while
+        max_clients are already connected
+        """
+        client = PriceStreamClient(symbols, max_pending, min_interval)
+        if len(client.symbols) > self.max_symbols:
+            raise ValueError(f"At most {self.max_symbols} symbols can be streamed per connection.")
+        invalid = [symbol for symbol in client.symbols if not is_valid_symbol(symbol)]
+        if invalid:
+            raise ValueError(f"Invalid symbols: {', '.join(invalid)}")
+        with self._lock:
+            if len(self._connected) >= self.max_clients:
+                raise StreamLimitError(f"At most {self.max_clients} price streams can be open at once.")
+            self._connected.add(client)
+            for symbol in client.symbols:
+                if symbol not in self._clients:
+                    self._clients[symbol] = set()
+                    self.publisher.subscribe(symbol, self._dispatch)
+                self._clients[symbol].add(client)
+            if pump and self.tick_interval and self._pump is None:
+                self._pump = threading.Thread(target=self._run_pump, name='price-stream-pump', daemon=True)
+                self._pump.start()
+        return client
+
+    def disconnect(self, client: PriceStreamClient) -> None:
+        client.close()
+        with self._lock:
+            self._connected.discard(client)
+            for symbol in client.symbols:
+                watchers = self._clients.get(symbol)
+                if watchers is None:
+                    continue
+                watchers.discard(client)
+                if not watchers:
+                    del self._clients[symbol]
+                    self.publisher.unsubscribe(symbol, self._dispatch)
+
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._connected)
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list(self._clients)
+
+    def _drop(self, symbol: str) -> None:
+        # Clients keep the symbol in their list; it just stops ticking
+        with self._lock:
+            if self._clients.pop(symbol, None) is not None:
+                self.publisher.unsubscribe(symbol, self._dispatch)
+
+    def _dispatch(self, symbol: str, price: float) -> None:
+        with self._lock:
+            watchers = list(self._clients.get(symbol, ()))
+        for client in watchers:
+            client.offer(symbol, price)
+
+    def _run_pump(self) -> None:
+        if self._simulator is None:
+            from data_access.simulate_market_price import price_simulator
+            self._simulator = price_simulator
+
+        while True:
+            with self._lock:
+                symbols = list(self._clients)
+                if not symbols:
+                    self._pump = None
+                    return
+            for symbol in symbols:
+                try:
+                    self._simulator.simulate_price(symbol)
+                except Exception as e:
+                    logger.warning(f"Error simulating price for {symbol}, no longer streaming it: {str(e)}")
+                    self._drop(symbol)
+            time.sleep(self.tick_interval)
+
+
+# Create a global instance
+price_stream_hub = PriceStreamHub(price_publisher)
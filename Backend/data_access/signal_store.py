@@ -0,0 +1,295 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+import zlib
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .columnar_io import file_lock, save_columns, load_columns
+from .market_data_store import market_data_store
+from .metrics import metrics
+from .backtest_result_cache import canonical_params
+from .symbols import validate_symbol
+from data_access.models.trading_strategy import ALGORITHMS, create_algo
+from data_access.models.strategy_pattern.streaming_algos import create_streaming_algo
+
+logger = logging.getLogger(__name__)
+
+# Signals live under the store root; tickers never contain an underscore
+DEFAULT_SIGNAL_DIR = os.path.join(market_data_store.root, '_signals')
+SEGMENTS_FILE = 'segments.json'
+# Every append adds a segment; past this many the finished ones are merged
+MAX_SEGMENTS = 32
+
+# (first row, end row, directory name) of one saved block of rows
+Segment = Tuple[int, int, str]
+# Per segment directory name: checksum of its closes and its last date
+Checks = Dict[str, List]
+
+
+def finished_rows(dates: np.ndarray) -> int:
+    """
+    Number of leading bars dated before today; today's bar is still forming
+    """
+    return int(np.searchsorted(dates, date.today().isoformat(), side='left'))
+
+
+def close_checksum(close: np.ndarray) -> int:
+    """
+    CRC32 of the closes as float64 bytes; compares a stored segment with a
+    request's bars without reading the segment back
+    """
+    return zlib.crc32(np.ascontiguousarray(close, dtype=np.float64))
+
+
+def load_segments(directory: str) -> Optional[Dict[str, np.ndarray]]:
+    """
+    All stored columns of one signal entry, concatenated, or None
+    """
+    manifest = _read_segments(directory)
+    if manifest is None:
+        return None
+    parts = [load_columns(os.path.join(directory, name)) for _, _, name in manifest['segments']]
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def _read_segments(directory: str) -> Optional[Dict]:
+    path = os.path.join(directory, SEGMENTS_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+class SignalStore:
+    """
+    Materialized signal and indicator columns per (symbol, algorithm, params,
+    first bar), kept as .npy columns next to the market data store.
+
+    The first request for a series computes the columns with the vectorized
+    TradingAlgo and saves them together with the state of a
+    StreamingTradingAlgo fed the same closes, kept as plain JSON in the
+    manifest. Each segment is listed with a checksum of its closes, so
+    later requests are matched against the stored bars without reading
+    them back. Requests whose data starts with the stored bars read the
+    signals back; bars appended since are fed to the restored
+    streaming algorithm, which carries the rolling and EMA state forward, and
+    saved as a new segment, so an append computes and writes only the new
+    tail. The saved state stops before today's bar, which is still forming,
+    so a revised latest close is recomputed from the state too; any other
+    mismatch with what was stored (a corrected old close, a different first
+    bar) recomputes the series in full.
+    """
+
+    def __init__(self, root: str = DEFAULT_SIGNAL_DIR, max_segments: int = MAX_SEGMENTS):
+        self.root = root
+        self.max_segments = max_segments
+        self.hits = 0
+        self.extensions = 0
+        self.rebuilds = 0
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def get_signals(self, data: pd.DataFrame, symbol: str, algorithm: str, params: Optional[Dict] = None) -> np.ndarray:
+        """
+        Signals for every row of data, which must have Date and Close columns
+        """
+        with metrics.stage('signals'):
+            if len(data) == 0:
+                return np.zeros(0, dtype=np.int8)
+            params = canonical_params(algorithm, params)
+            directory = self._directory(symbol, algorithm, params, str(data['Date'].iloc[0]))
+            # The file lock keeps other server processes from writing or
+            # cleaning up the entry while this one reads or extends it
+            with self._lock_for(directory), file_lock(f"{directory}.lock"):
+                return self._get_signals(directory, data, algorithm, params)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'extensions': self.extensions,
+            'rebuilds': self.rebuilds
+        }
+
+    def _get_signals(self, directory: str, data: pd.DataFrame, algorithm: str, params: Dict) -> np.ndarray:
+        dates = data['Date'].to_numpy()
+        if dates.dtype.kind == 'M':
+            dates = dates.astype('datetime64[D]').astype(str)
+        close = data['Close'].to_numpy(dtype=np.float64)
+        try:
+            manifest = _read_segments(directory)
+            signals = self._stored_signals(directory, manifest, dates, close) if manifest is not None else None
+            if signals is not None:
+                return signals
+        except Exception as e:
+            # e.g. a segment lost to a crash mid-write; rebuilding repairs the entry
+            logger.warning(f"Error reading signals in {directory}: {str(e)}")
+
+        self.rebuilds += 1
+        return self._rebuild(directory, dates, close, algorithm, params)
+
+    def _stored_signals(self, directory: str, manifest: Dict, dates: np.ndarray,
+                        close: np.ndarray) -> Optional[np.ndarray]:
+        if not isinstance(manifest.get('state'), dict) or 'checks' not in manifest:
+            # Written by an older version; rebuilt in the current layout
+            return None
+        segments = [tuple(segment) for segment in manifest['segments']]
+        checks = manifest['checks']
+        if len(dates) <= segments[-1][1] and self._matches(directory, segments, checks, dates, close, len(dates)):
+            self.hits += 1
+            return self._read_signals(directory, segments, len(dates))
+        # The saved state covers the first state_rows bars; everything
+        # after them (new bars, a revised latest bar) is fed through it
+        state_rows = manifest['state_rows']
+        if 0 < state_rows <= len(dates) and self._matches(directory, segments, checks, dates, close, state_rows):
+            signals = self._extend(directory, manifest, segments, dates, close)
+            self.extensions += 1
+            return signals
+        return None
+
+    def _matches(self, directory: str, segments: List[Segment], checks: Checks, dates: np.ndarray,
+                 close: np.ndarray, rows: int) -> bool:
+        """
+        Whether the first rows bars are the stored ones: same closes, and the
+        same date on the last of them. Whole segments are compared by
+        checksum; only a segment that rows ends inside is read.
+        """
+        for start, stop, name in segments:
+            if start >= rows:
+                break
+            if stop <= rows:
+                checksum, last_date = checks[name]
+                if close_checksum(close[start:stop]) != checksum:
+                    return False
+                if stop == rows and last_date != str(dates[rows - 1]):
+                    return False
+                continue
+            columns = load_columns(os.path.join(directory, name), names=['Date', 'Close'])
+            if not np.array_equal(columns['Close'][:rows - start], close[start:rows], equal_nan=True):
+                return False
+            if columns['Date'][rows - start - 1] != str(dates[rows - 1]):
+                return False
+        return True
+
+    def _read_signals(self, directory: str, segments: List[Segment], rows: int) -> np.ndarray:
+        parts = [
+            load_columns(os.path.join(directory, name), names=['signal'])['signal'][:min(stop, rows) - start]
+            for start, stop, name in segments if start < rows
+        ]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int8)
+
+    def _rebuild(self, directory: str, dates: np.ndarray, close: np.ndarray, algorithm: str, params: Dict) -> np.ndarray:
+        frame = create_algo(algorithm, **params).calculate_signals(pd.DataFrame({'Date': dates, 'Close': close}))
+        frame['signal'] = frame['signal'].to_numpy().astype(np.int8)
+        # Feed the same closes to the streaming version so its state can be
+        # carried forward when new bars arrive
+        state_rows = finished_rows(dates)
+        streaming = create_streaming_algo(algorithm, **params)
+        streaming.warm_up(close[:state_rows])
+        try:
+            segments, checks = self._write_segments(directory, frame, 0, state_rows)
+            self._commit(directory, segments, checks, streaming.state(), state_rows, algorithm, params)
+        except Exception as e:
+            # The signals are still returned; they are just computed again next time
+            logger.warning(f"Error saving signals to {directory}: {str(e)}")
+        return frame['signal'].to_numpy()
+
+    def _extend(self, directory: str, manifest: Dict, segments: List[Segment], dates: np.ndarray,
+                close: np.ndarray) -> np.ndarray:
+        streaming = create_streaming_algo(manifest['algorithm'], **manifest['params'])
+        streaming.restore(manifest['state'])
+        start = manifest['state_rows']
+        state_rows = max(finished_rows(dates), start)
+        state = None
+        signals: List[int] = []
+        indicators: Dict[str, List[float]] = {}
+        for row in range(start, len(close)):
+            if row == state_rows:
+                state = streaming.state()
+            signals.append(streaming.update(float(close[row])))
+            for name, value in streaming.indicator_values().items():
+                indicators.setdefault(name, []).append(value)
+        if state is None:
+            state = streaming.state()
+
+        tail = pd.DataFrame({'Date': dates[start:], 'Close': close[start:], **indicators})
+        tail['signal'] = np.array(signals, dtype=np.int8)
+        # Segments are split at state_rows, so the finished ones end by start
+        kept = [segment for segment in segments if segment[1] <= start]
+        result = np.concatenate((self._read_signals(directory, kept, start), tail['signal'].to_numpy()))
+        if len(kept) + 2 > self.max_segments:
+            tail = self._merge(directory, kept, tail)
+            kept, start = [], 0
+        new_segments, checks = self._write_segments(directory, tail, start, state_rows)
+        checks.update({name: manifest['checks'][name] for _, _, name in kept})
+        self._commit(directory, kept + new_segments, checks, state, state_rows, manifest['algorithm'],
+                     manifest['params'])
+        return result
+
+    def _merge(self, directory: str, segments: List[Segment], tail: pd.DataFrame) -> pd.DataFrame:
+        parts = [load_columns(os.path.join(directory, name)) for _, _, name in segments]
+        head = pd.DataFrame({name: np.concatenate([part[name] for part in parts]) for name in parts[0]})
+        return pd.concat([head, tail[head.columns]], ignore_index=True)
+
+    def _write_segments(self, directory: str, frame: pd.DataFrame, offset: int,
+                        state_rows: int) -> Tuple[List[Segment], Checks]:
+        """
+        Save the frame, whose first row is row offset of the series, as one
+        segment up to state_rows and one for the unfinished bars after it, so
+        the next append replaces only the latter
+        """
+        split = min(max(state_rows - offset, 0), len(frame))
+        close = frame['Close'].to_numpy(dtype=np.float64)
+        segments = []
+        checks = {}
+        for lo, hi in ((0, split), (split, len(frame))):
+            if hi > lo:
+                name = f"{offset + lo:010d}-{uuid.uuid4().hex[:8]}"
+                save_columns(frame.iloc[lo:hi].reset_index(drop=True), os.path.join(directory, name))
+                segments.append((offset + lo, offset + hi, name))
+                checks[name] = [close_checksum(close[lo:hi]), str(frame['Date'].iloc[hi - 1])]
+        return segments, checks
+
+    def _commit(self, directory: str, segments: List[Segment], checks: Checks, state: Dict, state_rows: int,
+                algorithm: str, params: Dict) -> None:
+        manifest = {
+            'algorithm': algorithm,
+            'params': params,
+            'segments': [list(segment) for segment in segments],
+            'checks': {name: checks[name] for _, _, name in segments},
+            'state_rows': state_rows,
+            'state': state
+        }
+        path = os.path.join(directory, SEGMENTS_FILE)
+        tmp_path = f"{path}.tmp-{uuid.uuid4().hex}"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+
+        # Readers go through the manifest, and every reader and writer holds
+        # the entry's file lock, so unlisted segments and leftover temp
+        # directories can go now
+        live = {name for _, _, name in segments}
+        for entry in os.scandir(directory):
+            if entry.is_dir() and entry.name not in live:
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def _directory(self, symbol: str, algorithm: str, params: Dict, first_date: str) -> str:
+        # Both names become path components, so neither may leave the root
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm!r}")
+        params_key = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.root, validate_symbol(symbol).upper(), f"{algorithm}-{params_key}-{first_date[:10]}")
+
+    def _lock_for(self, directory: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(directory, threading.Lock())
+
+
+# Create a global instance
+signal_store = SignalStore(os.environ.get('SIGNAL_STORE_DIR', DEFAULT_SIGNAL_DIR))
@@ -1,32 +1,46 @@
 from data_access.models.market_data_adapter import MarketDataAdapter
+from data_access.price_publisher import price_publisher
 import random
+import threading
 
 class MarketPriceSimulator:
     def __init__(self):
         self._last_prices = {}  # Cache for storing last prices per symbol
         self._base_prices = {}  # Store the initial closing prices
+        # The stream pump and request threads both move prices
+        self._lock = threading.Lock()
 
     def get_last_closing_price(self, symbol):
         # If we don't have a base price, get it once from the adapter
-        if symbol not in self._base_prices:
+        with self._lock:
+            known = symbol in self._base_prices
+        if not known:
             market_data = MarketDataAdapter(symbol, None, None)
-            price = market_data.live_price()  # Get initial price
-            self._base_prices[symbol] = price
-            self._last_prices[symbol] = price
+            price = market_data.live_price()  # Get initial price, outside the lock
+            with self._lock:
+                # Another thread may have fetched it meanwhile; keep its walk
+                if symbol in self._base_prices:
+                    return self._last_prices[symbol]
+                self._base_prices[symbol] = price
+                self._last_prices[symbol] = price
+            price_publisher.notify(symbol, price)
             return price
         
         # If we already have a price, return the simulated one
         return self.simulate_price(symbol)
 
     def simulate_price(self, symbol):
-        if symbol not in self._last_prices:
+        with self._lock:
+            last_price = self._last_prices.get(symbol)
+            if last_price is not None:
+                # Simulate price movement of ±0.01%
+                change_percent = (random.random() - 0.5) * 0.0005  # Generate number between -0.01% and +0.01%
+                new_price = last_price * (1 + change_percent)
+                self._last_prices[symbol] = new_price
+        if last_price is None:
             return self.get_last_closing_price(symbol)
-        
-        # Simulate price movement of ±0.01%
-        change_percent = (random.random() - 0.5) * 0.0005  # Generate number between -0.01% and +0.01%
-        new_price = self._last_prices[symbol] * (1 + change_percent)
-        self._last_prices[symbol] = new_price
-        
+
+        price_publisher.notify(symbol, new_price)
         return new_price
 
 # Create a global instance
@@ -0,0 +1,19 @@
+import re
+
+# Ticker syntax, e.g. AAPL, BRK-B, BRK.B, ^GSPC or EURUSD=X. Symbols name
+# directories in the market data and signal stores, so nothing that could
+# leave them (no slashes, no leading dot) is accepted.
+SYMBOL_PATTERN = re.compile(r'[A-Z0-9^][A-Z0-9.^=-]{0,14}', re.IGNORECASE)
+
+
+def is_valid_symbol(symbol) -> bool:
+    return isinstance(symbol, str) and SYMBOL_PATTERN.fullmatch(symbol) is not None
+
+
+def validate_symbol(symbol) -> str:
+    """
+    The symbol itself, or ValueError if it is not a plain ticker
+    """
+    if not is_valid_symbol(symbol):
+        raise ValueError(f"Invalid symbol: {symbol!r}")
+    return symbol
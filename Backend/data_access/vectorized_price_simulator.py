@@ -0,0 +1,215 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from data_access.price_publisher import PricePublisher, price_publisher
+
+logger = logging.getLogger(__name__)
+
+# One simulated tick per second of a 252 day, 6.5 hour trading year
+SECONDS_PER_TRADING_YEAR = 252 * 6.5 * 3600
+
+
+class PriceModel(ABC):
+    """
+    Moves a whole vector of prices forward by one tick
+    """
+
+    @abstractmethod
+    def step(self, prices: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def get_model_name(self) -> str:
+        pass
+
+
+class UniformWalkModel(PriceModel):
+    """
+    The walk MarketPriceSimulator uses: each tick moves the price by a
+    uniform random change of at most +/- half_width (default 2.5 bps).
+    """
+
+    def __init__(self, half_width: float = 0.00025):
+        self.half_width = half_width
+
+    def step(self, prices: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        change_percent = (rng.random(prices.shape[0]) - 0.5) * (2 * self.half_width)
+        return prices * (1 + change_percent)
+
+    def get_model_name(self) -> str:
+        return "uniform"
+
+
+class GeometricBrownianMotionModel(PriceModel):
+    """
+    Log-normal steps with annualised drift mu and volatility sigma;
+    dt is the length of one tick in years.
+    """
+
+    def __init__(self, mu: float = 0.0, sigma: float = 0.2, dt: float = 1 / SECONDS_PER_TRADING_YEAR):
+        self.mu = mu
+        self.sigma = sigma
+        self.dt = dt
+        self._drift = (mu - 0.5 * sigma ** 2) * dt
+        self._diffusion = sigma * np.sqrt(dt)
+
+    def step(self, prices: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        shocks = rng.standard_normal(prices.shape[0])
+        return prices * np.exp(self._drift + self._diffusion * shocks)
+
+    def get_model_name(self) -> str:
+        return "gbm"
+
+
+class ReplayModel(PriceModel):
+    """
+    Plays back a (ticks x symbols) matrix of historical prices one row per
+    tick, starting over from the first row once the history runs out.
+    """
+
+    def __init__(self, history: np.ndarray, loop: bool = True):
+        history = np.asarray(history, dtype=np.float64)
+        if history.ndim != 2 or history.shape[0] == 0:
+            raise ValueError("Replay history must be a non-empty (ticks x symbols) array.")
+        self.history = history
+        self.loop = loop
+        self.position = 0
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame], symbols: Sequence[str],
+                    column: str = 'Close', loop: bool = True) -> 'ReplayModel':
+        """
+        Align stored market data frames on Date, forward/back filling gaps
+        """
+        closes = pd.DataFrame({
+            symbol: pd.Series(frames[symbol][column].to_numpy(), index=frames[symbol]['Date'])
+            for symbol in symbols
+        }).sort_index()
+        closes = closes.ffill().bfill()
+        return cls(closes[list(symbols)].to_numpy(), loop)
+
+    def initial_prices(self) -> np.ndarray:
+        return self.history[0].copy()
+
+    def step(self, prices: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        if self.history.shape[1] != prices.shape[0]:
+            raise ValueError(f"Replay history has {self.history.shape[1]} symbols, expected {prices.shape[0]}.")
+        self.position += 1
+        if self.position >= self.history.shape[0]:
+            if not self.loop:
+                self.position = self.history.shape[0] - 1
+                return prices
+            self.position = 0
+        return self.history[self.position].copy()
+
+    def get_model_name(self) -> str:
+        return "replay"
+
+
+PRICE_MODELS = {
+    'uniform': UniformWalkModel,
+    'gbm': GeometricBrownianMotionModel,
+    'replay': ReplayModel
+}
+
+
+def create_price_model(model: str, **params) -> PriceModel:
+    if model not in PRICE_MODELS:
+        raise ValueError(f"Invalid price model '{model}'. Choose from {list(PRICE_MODELS)}.")
+    return PRICE_MODELS[model](**params)
+
+
+class VectorizedPriceSimulator:
+    """
+    Steps the prices of many symbols at once with a NumPy random generator.
+
+    Pass a seed to make runs reproducible: the same seed, symbols and model
+    always produce the same price paths. start() runs a fixed-rate scheduler
+    that publishes each tick to the PricePublisher as a single batch.
+    """
+
+    def __init__(self, symbols: Iterable[str], initial_prices=None, model='uniform',
+                 seed: Optional[int] = None, publisher: Optional[PricePublisher] = price_publisher,
+                 **model_params):
+        self.symbols: List[str] = list(dict.fromkeys(symbols))
+        if not self.symbols:
+            raise ValueError("At least one symbol is required.")
+
+        self.model = model if isinstance(model, PriceModel) else create_price_model(model, **model_params)
+        if initial_prices is None:
+            if not isinstance(self.model, ReplayModel):
+                raise ValueError(f"initial_prices is required for the '{self.model.get_model_name()}' model.")
+            initial_prices = self.model.initial_prices()
+        self.prices = np.array(initial_prices, dtype=np.float64).reshape(-1)
+        if self.prices.shape[0] != len(self.symbols):
+            raise ValueError(f"Got {self.prices.shape[0]} initial prices for {len(self.symbols)} symbols.")
+
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.publisher = publisher
+        self.ticks = 0
+        self.late_ticks = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def step(self, publish: bool = True) -> np.ndarray:
+        """
+        Advance every symbol by one tick and return the new prices
+        """
+        self.prices = self.model.step(self.prices, self.rng)
+        self.ticks += 1
+        if publish and self.publisher is not None:
+            self.publisher.notify_batch(self.symbols, self.prices.tolist())
+        return self.prices
+
+    def run(self, steps: int, publish: bool = False) -> np.ndarray:
+        """
+        Simulate steps ticks as fast as possible and return the
+        (steps x symbols) price paths
+        """
+        paths = np.empty((steps, len(self.symbols)), dtype=np.float64)
+        for i in range(steps):
+            paths[i] = self.step(publish)
+        return paths
+
+    def last_prices(self) -> Dict[str, float]:
+        return dict(zip(self.symbols, self.prices.tolist()))
+
+    def start(self, interval: float = 1.0) -> None:
+        """
+        Publish a tick every interval seconds on a background thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run_scheduler, args=(interval,),
+                                        name='price-simulator', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run_scheduler(self, interval: float) -> None:
+        # Deadlines are fixed in advance so slow ticks do not make the rate drift;
+        # if a tick overruns a whole interval the schedule skips ahead instead
+        # of bursting to catch up
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.step()
+            except Exception as e:
+                logger.warning(f"Error simulating prices: {str(e)}")
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                self.late_ticks += 1
+                next_tick = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
@@ -0,0 +1,42 @@
+"""
+Gunicorn settings for serving the backend in production.
+
+Run from the Backend directory (gunicorn does not run on Windows; use
+python app.py there for development):
+    gunicorn -c gunicorn.conf.py
+
+Each worker process has its own in-memory caches, price publisher and
+fetch pool; the on-disk market data and signal stores are shared. Every
+setting can be overridden with the environment variable next to it.
+"""
+import multiprocessing
+import os
+
+wsgi_app = 'app:app'
+bind = os.environ.get('BIND', '127.0.0.1:5000')
+
+# Backtests are CPU bound, so one process per core does the real work and
+# the threads cover requests waiting on data fetches
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+
+# /stream_prices keeps its thread for as long as the client stays connected.
+# Each worker accepts at most MAX_STREAM_CLIENTS streams (half of threads
+# unless set) and answers 503 beyond that, so streams cannot take every
+# thread and starve the other endpoints. Keep it below threads; for many
+# streaming clients run a separate gunicorn with more threads for
+# /stream_prices behind the proxy.
+
+# Longer than FETCH_TIMEOUT, so a slow download fails the request cleanly
+# before the arbiter kills the worker. Keep streaming responses in mind.
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+
+# Workers import the app themselves: the shared caches and the price
+# publisher start threads, which do not survive a fork
+preload_app = False
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
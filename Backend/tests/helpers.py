@@ -0,0 +1,22 @@
+import time
+import numpy as np
+import pandas as pd
+
+class StubSource:
+    """Seeded random-walk bars per symbol, after an optional delay; MISSING has none"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def fetch_market_data(self, symbol, start_date, end_date):
+        time.sleep(self.latency)
+        if symbol == 'MISSING':
+            raise ValueError(f"No data found for symbol {symbol}")
+        dates = pd.bdate_range(start_date, end_date, inclusive='left')
+        rng = np.random.default_rng(sum(map(ord, symbol)))
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.02, len(dates)))
+        return pd.DataFrame({
+            'Date': dates.strftime('%Y-%m-%d'),
+            'Open': close, 'High': close, 'Low': close, 'Close': close,
+            'Volume': 1000
+        })
@@ -0,0 +1,67 @@
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from data_access.backtest_result_cache import BacktestResultCache
+from data_access.models.trading_strategy import TradingStrategy
+
+class TestBacktestResultCache(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.02, 800))
+        self.data = pd.DataFrame({
+            'Date': pd.date_range('2018-01-01', periods=800, freq='D').strftime('%Y-%m-%d'),
+            'Close': close
+        })
+        self.runs = 0
+
+    def run_backtest(self, data, cache, algorithm='SMA', params=None):
+        def compute():
+            self.runs += 1
+            return TradingStrategy(data.copy(), 'TEST', algorithm, params).run_backtest()
+        return cache.get_or_compute(cache.make_key(data, 'TEST', algorithm, params), compute)
+
+    def test_repeat_request_is_served_from_cache(self):
+        cache = BacktestResultCache()
+        first = self.run_backtest(self.data, cache)
+        first[1][0]['price'] = -1.0
+        second = self.run_backtest(self.data, cache)
+
+        expected = TradingStrategy(self.data.copy(), 'TEST', 'SMA').run_backtest()
+        self.assertEqual(second, expected)
+        self.assertEqual(self.runs, 1)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_changed_data_or_params_miss(self):
+        cache = BacktestResultCache()
+        self.run_backtest(self.data, cache)
+        self.run_backtest(self.data, cache, params={'short_window': 50, 'long_window': 200})
+        self.assertEqual(self.runs, 1)
+
+        updated = self.data.copy()
+        updated.loc[len(updated) - 1, 'Close'] += 1
+        self.run_backtest(updated, cache)
+        self.run_backtest(self.data, cache, params={'short_window': 20})
+        self.assertEqual(self.runs, 3)
+
+    def test_lru_eviction(self):
+        cache = BacktestResultCache(max_entries=2)
+        for algorithm in ('SMA', 'MACD', 'SMA', 'BollingerBands', 'MACD'):
+            self.run_backtest(self.data, cache, algorithm)
+        self.assertEqual(self.runs, 4)
+        self.assertEqual(cache.stats()['evictions'], 2)
+
+    def test_results_persist_to_disk(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        expected = self.run_backtest(self.data, BacktestResultCache(directory=directory), 'MACD')
+
+        restarted = BacktestResultCache(directory=directory)
+        result = self.run_backtest(self.data, restarted, 'MACD')
+        self.assertEqual(result, expected)
+        self.assertEqual(self.runs, 1)
+        self.assertEqual(restarted.stats()['disk_hits'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
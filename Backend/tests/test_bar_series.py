@@ -0,0 +1,68 @@
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from data_access.bar_series import BarSeries
+
+class TestBarSeries(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.timestamps = np.sort(rng.integers(0, 3 * 3600, 5000)) * 10 ** 9 + pd.Timestamp('2024-03-04 14:30', tz='UTC').value
+        self.prices = 100 + np.cumsum(rng.normal(0, 0.05, 5000))
+        self.sizes = rng.integers(1, 500, 5000)
+        self.ticks = BarSeries.from_ticks(self.timestamps, self.prices, self.sizes, tz='America/New_York')
+
+    def test_resample_matches_pandas(self):
+        bars = self.ticks.resample('5min')
+        frame = pd.DataFrame({'price': self.prices, 'size': self.sizes},
+                             index=pd.to_datetime(self.timestamps, utc=True))
+        expected = frame.resample('5min').agg({'price': ['first', 'max', 'min', 'last'], 'size': 'sum'}).dropna()
+
+        np.testing.assert_array_equal(bars.timestamps, expected.index.asi8)
+        np.testing.assert_array_equal(bars.open, expected[('price', 'first')])
+        np.testing.assert_array_equal(bars.high, expected[('price', 'max')])
+        np.testing.assert_array_equal(bars.low, expected[('price', 'min')])
+        np.testing.assert_array_equal(bars.close, expected[('price', 'last')])
+        np.testing.assert_array_equal(bars.volume, expected[('size', 'sum')])
+
+        hourly = bars.resample('1h')
+        np.testing.assert_array_equal(hourly.volume, self.ticks.resample(3600 * 10 ** 9).volume)
+        self.assertEqual(hourly.high.max(), self.prices.max())
+
+    def test_save_and_memory_mapped_load(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        bars = self.ticks.resample('1min')
+        bars.save(directory)
+
+        loaded = BarSeries.load(directory)
+        self.assertIsInstance(loaded.close, np.memmap)
+        self.assertEqual(loaded.tz, 'America/New_York')
+        np.testing.assert_array_equal(loaded.close, bars.close)
+        start = loaded.locate('2024-03-04 10:00')
+        self.assertEqual(loaded.format_dates([start], '%H:%M')[0], '10:00')
+
+    def test_allocate_fills_in_place(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        bars = BarSeries.allocate(directory, 4, price_dtype=np.float32)
+        bars.timestamps[:] = np.arange(4) * 60 * 10 ** 9
+        bars.close[:] = [1.5, 2.5, 3.5, 4.5]
+        bars.flush()
+
+        loaded = BarSeries.load(directory)
+        self.assertEqual(loaded.close.dtype, np.float32)
+        np.testing.assert_array_equal(loaded.close, [1.5, 2.5, 3.5, 4.5])
+
+    def test_frame_round_trip(self):
+        data = pd.DataFrame({
+            'Date': ['2024-01-02T00:00:00-05:00', '2024-07-01T00:00:00-04:00'],
+            'Open': [1.0, 2.0], 'High': [1.0, 2.0], 'Low': [1.0, 2.0], 'Close': [1.0, 2.0], 'Volume': [10, 20]
+        })
+        bars = BarSeries.from_frame(data)
+        self.assertEqual(bars.format_dates([0, 1]), ['01/02/2024', '07/01/2024'])
+        pd.testing.assert_frame_equal(bars.to_frame(), data)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import time
+import unittest
+from flask import Flask
+from controllers import server
+from data_access.data_access_service import DataAccessService
+from data_access.models.batch_backtest import run_batch
+from tests.helpers import StubSource
+
+class TestBatchBacktest(unittest.TestCase):
+    def test_fetches_run_concurrently(self):
+        service = DataAccessService(StubSource(latency=0.2))
+        symbols = [f"SYM{i}" for i in range(20)]
+
+        start = time.perf_counter()
+        results = list(run_batch(service, symbols, ['SMA', 'MACD'], '2021-01-01', '2023-01-01', max_workers=10))
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 2.0)
+        self.assertEqual(sorted(result['symbol'] for result in results), sorted(symbols))
+        for result in results:
+            self.assertEqual([r['algorithm'] for r in result['results']], ['SMA', 'MACD'])
+
+    def test_failed_symbol_does_not_abort_batch(self):
+        service = DataAccessService(StubSource())
+        results = {r['symbol']: r for r in run_batch(service, ['AAA', 'MISSING'], [{'algorithm': 'SMA', 'params': {'short_window': 5, 'long_window': 20}}],
+                                                     '2021-01-01', '2022-01-01', include_trades=True)}
+
+        self.assertEqual(results['MISSING']['status'], 'error')
+        self.assertEqual(results['AAA']['status'], 'success')
+        self.assertIn('trade_log', results['AAA']['results'][0])
+
+    def test_bad_algorithm_params_fail_alone(self):
+        service = DataAccessService(StubSource())
+        result = next(run_batch(service, ['AAA'], [{'algorithm': 'SMA', 'params': {'short_window': 'x'}}, 'MACD'],
+                                '2021-01-01', '2022-01-01'))
+        self.assertEqual(result['status'], 'success')
+        self.assertIn('error', result['results'][0])
+        self.assertIn('total_return', result['results'][1])
+
+    def test_endpoints_reject_bad_options(self):
+        app = Flask(__name__)
+        server.configure_routes(app)
+        client = app.test_client()
+        batch = {'symbols': ['AAA'], 'algorithms': ['SMA'], 'end_date': '2023-01-01'}
+        for bad in ({'algorithms': [5]}, {'algorithms': [['SMA']]}, {'algorithms': [{'algorithm': 5}]},
+                    {'algorithms': [{'algorithm': 'SMA', 'params': [1]}]}, {'max_workers': 'many'},
+                    {'max_workers': 0}, {'max_workers': {}}):
+            response = client.post('/run_batch_backtest', json=dict(batch, **bad))
+            self.assertEqual(response.status_code, 400, bad)
+        portfolio = {'symbols': ['AAA'], 'algorithm': 'SMA', 'end_date': '2023-01-01'}
+        for bad in ({'max_workers': 'many'}, {'max_workers': [4]}, {'start_date': 20210101}, {'algorithm': ['SMA']},
+                    {'params': {'short_window': 0}}):
+            response = client.post('/run_portfolio_backtest', json=dict(portfolio, **bad))
+            self.assertEqual(response.status_code, 400, bad)
+
+if __name__ == '__main__':
+    unittest.main()
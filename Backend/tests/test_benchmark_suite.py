@@ -0,0 +1,57 @@
+import argparse
+import contextlib
+import io
+import os
+import unittest
+from benchmarks.suite import BENCHMARKS, compare, measure
+from benchmarks.synthetic_source import SyntheticDataSource
+from data_access.decorators.validation_decorator import ValidationDecorator
+
+class TestSyntheticDataSource(unittest.TestCase):
+    def test_bars_are_repeatable_and_valid(self):
+        source = ValidationDecorator(SyntheticDataSource())
+        first = source.fetch_market_data('AAA', '2020-01-01', '2021-01-01')
+        second = SyntheticDataSource().fetch_market_data('AAA', '2020-01-01', '2021-01-01')
+        other = SyntheticDataSource().fetch_market_data('BBB', '2020-01-01', '2021-01-01')
+        self.assertEqual(len(first), 262)
+        self.assertTrue(first.equals(second))
+        self.assertFalse(first['Close'].equals(other['Close']))
+        self.assertTrue(first['Date'].iloc[0].startswith('2020-01-01T00:00:00'))
+        self.assertTrue((first['High'] >= first['Low']).all())
+
+    def test_returns_a_fresh_frame_per_fetch(self):
+        source = SyntheticDataSource()
+        data = source.fetch_market_data('AAA', '2020-01-01', '2020-02-01')
+        data['Close'] = 0.0
+        self.assertNotEqual(source.fetch_market_data('AAA', '2020-01-01', '2020-02-01')['Close'].iloc[0], 0.0)
+        self.assertEqual(source.fetches, 2)
+
+    def test_empty_range_raises(self):
+        with self.assertRaises(ValueError):
+            SyntheticDataSource().fetch_market_data('AAA', '2020-01-04', '2020-01-05')
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_compare_flags_regressions_only(self):
+        baseline = {'a': {'min': 1.0}, 'b': {'min': 1.0}, 'c': {'min': 1.0}}
+        results = {'a': {'min': 1.1}, 'b': {'min': 1.5}, 'c': {'min': 0.5}, 'd': {'min': 1.0}, 'e': {'error': 'x'}}
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(compare(results, baseline, threshold=1.25), ['b'])
+        self.assertIn('REGRESSION', out.getvalue())
+
+    def test_measure(self):
+        timing = measure(lambda: sum(range(100)), repeat=3, min_time=0.001)
+        self.assertEqual(timing['repeat'], 3)
+        self.assertGreaterEqual(timing['number'], 1)
+        self.assertLessEqual(timing['min'], timing['median'])
+
+    # Runs the whole suite, endpoints included; too slow for every test run
+    @unittest.skipUnless(os.environ.get('RUN_BENCHMARKS') == '1', 'set RUN_BENCHMARKS=1 to run every benchmark')
+    def test_every_benchmark_runs(self):
+        options = argparse.Namespace(years=1)
+        for name, setup in BENCHMARKS.items():
+            with self.subTest(name=name), contextlib.ExitStack() as stack:
+                setup(stack, options)()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from data_access.bar_series import BarSeries
+from data_access.models.chunked_backtest import ChunkedTradingStrategy
+from data_access.models.trading_strategy import TradingStrategy
+
+class TestChunkedBacktest(unittest.TestCase):
+    def _random_walk(self, bars, start_price=100.0, seed=4):
+        rng = np.random.default_rng(seed)
+        close = start_price * np.cumprod(1 + rng.normal(0, 0.01, bars))
+        dates = pd.date_range('2000-01-03', periods=bars, freq='D', tz='America/New_York')
+        return pd.DataFrame({
+            'Date': [d.isoformat() for d in dates],
+            'Open': close, 'High': close, 'Low': close,
+            'Close': close, 'Volume': np.full(bars, 1000)
+        })
+
+    def test_chunks_match_full_backtest(self):
+        data = self._random_walk(6000)
+        bars = BarSeries.from_frame(data)
+        cases = [('SMA', {'short_window': 20, 'long_window': 120}), ('BollingerBands', {}), ('MACD', {})]
+        for algorithm, params in cases:
+            expected = TradingStrategy(data, 'TEST', algorithm, params).run_backtest()
+            for chunk_rows in (250, 1000, 10000):
+                actual = ChunkedTradingStrategy(bars, 'TEST', algorithm, params, chunk_rows=chunk_rows).run_backtest()
+                self.assertEqual(actual, expected, (algorithm, chunk_rows))
+
+    def test_unaffordable_buy_across_chunks(self):
+        data = self._random_walk(800, start_price=150000.0)
+        expected = TradingStrategy(data, 'TEST', 'MACD').run_backtest()
+        actual = ChunkedTradingStrategy(BarSeries.from_frame(data), 'TEST', 'MACD', chunk_rows=100).run_backtest()
+        self.assertEqual(actual, expected)
+
+    def test_summary_only_on_memory_mapped_bars(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        data = self._random_walk(3000)
+        BarSeries.from_frame(data).save(directory)
+
+        expected = TradingStrategy(data, 'TEST', 'MACD').run_backtest()
+        strategy = ChunkedTradingStrategy(BarSeries.load(directory), 'TEST', 'MACD', chunk_rows=500, keep_trades=False)
+        final_balance, trade_log, total_gain_loss, annual_return, total_return = strategy.run_backtest()
+
+        self.assertEqual((final_balance, total_gain_loss, annual_return, total_return),
+                         (expected[0], expected[2], expected[3], expected[4]))
+        self.assertEqual(trade_log, expected[1][-1:])
+        self.assertEqual(strategy.num_trades, len(expected[1]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+from benchmarks.synthetic_source import SyntheticDataSource
+from data_access.data_access_service import DataAccessService
+from data_access.fetch_executor import FetchExecutor
+from data_access.market_data_cache import MarketDataCache
+from data_access.models.market_data_adapter import create_data_source
+
+class TestFetchExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = FetchExecutor(max_workers=2, timeout=5)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_returns_results_and_raises_errors(self):
+        self.assertEqual(self.executor.run(lambda: 42), 42)
+
+        def fail():
+            raise ValueError("No data found for symbol X")
+
+        with self.assertRaisesRegex(ValueError, 'No data found'):
+            self.executor.run(fail)
+        self.assertEqual(self.executor.stats()['submitted'], 2)
+
+    def test_bounds_concurrent_fetches(self):
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def fetch():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+
+        threads = [threading.Thread(target=self.executor.run, args=(fetch,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(peak[0], 2)
+
+    def test_slow_fetch_times_out(self):
+        executor = FetchExecutor(max_workers=1, timeout=0.05)
+        self.addCleanup(executor.shutdown)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with self.assertRaises(TimeoutError):
+            executor.run(release.wait)
+        self.assertEqual(executor.stats()['timeouts'], 1)
+
+    def test_service_fetches_through_executor(self):
+        service = DataAccessService(SyntheticDataSource(), cache=MarketDataCache(), executor=self.executor)
+        data = service.get_market_data('TEST', '2023-01-01', '2023-02-01')
+        self.assertGreater(len(data), 0)
+        self.assertEqual(self.executor.stats()['submitted'], 1)
+
+    def test_data_source_from_environment(self):
+        with mock.patch.dict(os.environ, {'MARKET_DATA_SOURCE': 'benchmarks.synthetic_source:SyntheticDataSource'}):
+            self.assertIsInstance(create_data_source(), SyntheticDataSource)
+        with mock.patch.dict(os.environ, {'MARKET_DATA_SOURCE': 'synthetic'}):
+            with self.assertRaises(ValueError):
+                create_data_source()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import numpy as np
+import pandas as pd
+from data_access.models.strategy_pattern.indicators import IndicatorCache
+from data_access.models.strategy_pattern.tradingAlgos import SMAStrategy, BollingerBandsStrategy, MACDStrategy
+
+def legacy_sma(data, short_window, long_window):
+    data['SMA50'] = data['Close'].rolling(window=short_window, min_periods=short_window).mean()
+    data['SMA200'] = data['Close'].rolling(window=long_window, min_periods=long_window).mean()
+    data['signal'] = np.where(
+        (data['SMA50'].shift(1) < data['SMA200'].shift(1)) & (data['SMA50'] > data['SMA200']), 1, 0)
+    data['signal'] = np.where(
+        (data['SMA50'].shift(1) > data['SMA200'].shift(1)) & (data['SMA50'] < data['SMA200']), -1, data['signal'])
+    return data
+
+def legacy_bollinger(data, window, num_std_dev):
+    data['SMA20'] = data['Close'].rolling(window=window).mean()
+    data['std_dev'] = data['Close'].rolling(window=window).std()
+    data['Upper_BB'] = data['SMA20'] + (data['std_dev'] * num_std_dev)
+    data['Lower_BB'] = data['SMA20'] - (data['std_dev'] * num_std_dev)
+    data['signal'] = np.where(data['Close'] > data['Upper_BB'], -1, np.where(data['Close'] < data['Lower_BB'], 1, 0))
+    return data
+
+def legacy_macd(data, short_ema, long_ema, signal_line):
+    data['EMA12'] = data['Close'].ewm(span=short_ema, adjust=False).mean()
+    data['EMA26'] = data['Close'].ewm(span=long_ema, adjust=False).mean()
+    data['MACD'] = data['EMA12'] - data['EMA26']
+    data['Signal_Line'] = data['MACD'].ewm(span=signal_line, adjust=False).mean()
+    data['signal'] = np.where(data['MACD'] > data['Signal_Line'], 1, -1)
+    return data
+
+class TestIndicators(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.02, 600))
+        close[100:110] = close[99]
+        self.data = pd.DataFrame({
+            'Date': pd.date_range('2020-01-01', periods=600, freq='D').strftime('%Y-%m-%d'),
+            'Close': close
+        })
+
+    def test_signals_match_legacy_and_input_is_untouched(self):
+        cases = [
+            (SMAStrategy(10, 40), lambda d: legacy_sma(d, 10, 40)),
+            (BollingerBandsStrategy(20, 2), lambda d: legacy_bollinger(d, 20, 2)),
+            (MACDStrategy(12, 26, 9), lambda d: legacy_macd(d, 12, 26, 9))
+        ]
+        original = self.data.copy()
+        indicators = IndicatorCache(self.data['Close'].to_numpy())
+        for strategy, legacy in cases:
+            result = strategy.calculate_signals(self.data, indicators)
+            pd.testing.assert_frame_equal(result, legacy(original.copy()), check_exact=True)
+            pd.testing.assert_frame_equal(self.data, original)
+
+    def test_indicators_are_computed_once_and_read_only(self):
+        indicators = IndicatorCache(self.data['Close'].to_numpy())
+        for short_window in (5, 10, 20):
+            SMAStrategy(short_window, 40).generate_signals(indicators)
+        BollingerBandsStrategy(20, 2).generate_signals(indicators)
+
+        # sma 5/10/20/40, the 20-bar std and the two bands; SMA 20 is shared
+        self.assertEqual(indicators.stats()['misses'], 7)
+        self.assertIs(indicators.sma(40, 40), indicators.sma(40, 40))
+        with self.assertRaises(ValueError):
+            indicators.sma(40, 40)[0] = 1.0
+
+    def test_matrix_input_matches_each_column(self):
+        second = self.data['Close'].to_numpy()[::-1].copy()
+        matrix = np.column_stack([self.data['Close'].to_numpy(), second])
+        indicators = IndicatorCache(matrix)
+        for strategy in (SMAStrategy(10, 40), BollingerBandsStrategy(20, 2), MACDStrategy()):
+            signals = strategy.generate_signals(indicators)
+            for column in range(2):
+                expected = strategy.generate_signals(IndicatorCache(matrix[:, column]))
+                np.testing.assert_array_equal(signals[:, column], expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import tempfile
+import unittest
+from unittest import mock
+from flask import Flask, Response
+from controllers import instrumentation, server
+from data_access.data_access_service import DataAccessService
+from data_access.decorators.validation_decorator import ValidationDecorator
+from data_access.market_data_cache import MarketDataCache
+from data_access.metrics import metrics, STAGE_METRIC
+from data_access.models import market_data_adapter
+from data_access.price_publisher import price_publisher
+from data_access.signal_store import SignalStore
+from benchmarks.synthetic_source import SyntheticDataSource
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        app = Flask(__name__)
+        server.configure_routes(app)
+        self.consumed = []
+
+        @app.route('/endless')
+        def endless():
+            def generate():
+                while True:
+                    self.consumed.append(1)
+                    yield 'tick\n'
+            return Response(generate(), mimetype='text/plain')
+
+        self.client = app.test_client()
+        service = DataAccessService(ValidationDecorator(SyntheticDataSource()), cache=MarketDataCache())
+        for module in (server, market_data_adapter):
+            patcher = mock.patch.object(module, 'shared_data_service', service)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        signal_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(signal_dir.cleanup)
+        patcher = mock.patch.object(server, 'signal_store', SignalStore(signal_dir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(server.backtest_result_cache.clear)
+
+    def backtest(self, **headers):
+        return self.client.post('/run_backtest', json={'symbol': 'AAA', 'end_date': '2023-01-01', 'algorithm': 'SMA'},
+                                headers=headers)
+
+    def test_stages_and_requests_are_recorded(self):
+        server.backtest_result_cache.clear()
+        self.assertEqual(self.backtest().status_code, 200)
+        for stage in ('fetch', 'validate', 'signals', 'simulate', 'encode'):
+            self.assertEqual(metrics.histogram_count(STAGE_METRIC, stage=stage), 1, stage)
+        self.assertEqual(metrics.counter_value('http_requests_total', method='POST', endpoint='/run_backtest',
+                                               status=200), 1)
+
+    def test_metrics_endpoint(self):
+        callback = lambda price: None
+        price_publisher.subscribe('METRICS_TEST', callback)
+        self.addCleanup(price_publisher.unsubscribe, 'METRICS_TEST', callback)
+        self.backtest()
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        text = response.get_data(as_text=True)
+        self.assertIn('stage_duration_seconds_count{stage="simulate"} 1', text)
+        self.assertIn('market_data_cache_hits_total', text)
+        self.assertIn('market_data_store_misses_total', text)
+        self.assertIn('backtest_result_cache_misses_total', text)
+        self.assertIn('price_publisher_queue_depth{symbol="METRICS_TEST"} 0', text)
+
+    def profiling(self):
+        patcher = mock.patch.object(instrumentation, 'PROFILING_ENABLED', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_profiling_is_opt_in(self):
+        response = self.backtest(**{'X-Profile': 'cprofile'})
+        self.assertNotIn('X-Profiler', response.headers)
+        self.assertEqual(response.get_json()['status'], 'success')
+
+    def test_streamed_responses_are_not_profiled(self):
+        self.profiling()
+        response = self.client.get('/endless', headers={'X-Profile': '1'})
+        self.assertEqual(response.headers['X-Profiler'], 'skipped: streamed response')
+        # The test client reads the first chunk to start the response, no more
+        self.assertLessEqual(len(self.consumed), 1)
+        response.close()
+
+    def test_profile_header_returns_report(self):
+        self.profiling()
+        response = self.backtest(**{'X-Profile': 'cprofile', 'X-Profile-Limit': '5'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['X-Profiled-Status'], '200')
+        self.assertEqual(response.headers['X-Profiler'], 'cprofile')
+        text = response.get_data(as_text=True)
+        self.assertIn('function calls', text)
+        self.assertIn('run_backtest', text)
+
+    def test_profiles_failed_requests(self):
+        self.profiling()
+        response = self.client.post('/run_backtest', json={'symbol': 'AAA'}, headers={'X-Profile': '1'})
+        self.assertEqual(response.headers['X-Profiled-Status'], '400')
+        self.assertEqual(self.backtest(**{'X-Profile': '1'}).headers['X-Profiled-Status'], '200')
+
+if __name__ == '__main__':
+    unittest.main()
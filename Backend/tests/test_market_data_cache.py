@@ -0,0 +1,61 @@
+import threading
+import time
+import unittest
+import pandas as pd
+from data_access.market_data_cache import MarketDataCache
+
+def make_frame(rows):
+    return pd.DataFrame({'Close': [float(i) for i in range(rows)]})
+
+class TestMarketDataCache(unittest.TestCase):
+    def test_evicts_least_recently_used_by_bytes(self):
+        frame_bytes = int(make_frame(100).memory_usage(index=True, deep=True).sum())
+        cache = MarketDataCache(max_bytes=frame_bytes * 2)
+
+        cache.get_or_fetch('a', lambda: make_frame(100))
+        cache.get_or_fetch('b', lambda: make_frame(100))
+        cache.get_or_fetch('a', lambda: make_frame(100))
+        cache.get_or_fetch('c', lambda: make_frame(100))
+
+        fetched = []
+        cache.get_or_fetch('a', lambda: fetched.append('a') or make_frame(100))
+        cache.get_or_fetch('b', lambda: fetched.append('b') or make_frame(100))
+        self.assertEqual(fetched, ['b'])
+        self.assertLessEqual(cache.stats()['bytes'], frame_bytes * 2)
+
+    def test_expired_entries_are_refetched(self):
+        cache = MarketDataCache()
+        calls = []
+        fetch = lambda: calls.append(1) or make_frame(5)
+
+        cache.get_or_fetch('live', fetch, ttl=0)
+        cache.get_or_fetch('live', fetch, ttl=0)
+        cache.get_or_fetch('history', fetch)
+        cache.get_or_fetch('history', fetch)
+        self.assertEqual(len(calls), 3)
+
+    def test_concurrent_misses_share_one_fetch(self):
+        cache = MarketDataCache()
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            return make_frame(10)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch('k', slow_fetch)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 8)
+        self.assertEqual(cache.stats()['coalesced'], 7)
+        results[0]['extra'] = 1
+        self.assertNotIn('extra', cache.get_or_fetch('k', slow_fetch).columns)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from data_access.data_access_service import DataAccessService
+from data_access.data_adaptees.yahoo_finance_adaptee import YahooFinanceAdaptee
+from data_access.columnar_io import load_columns
+from data_access.market_data_files import available_formats, find_market_data, market_data_path, save_frame, load_frame
+
+def sample_frame(rows=50):
+    dates = pd.bdate_range('2024-01-01', periods=rows)
+    close = [100.0 + i * 0.25 for i in range(rows)]
+    return pd.DataFrame({
+        'Date': [d.tz_localize('America/New_York').isoformat() for d in dates],
+        'Open': close, 'High': close, 'Low': close, 'Close': close,
+        'Volume': list(range(1000, 1000 + rows))
+    })
+
+class TestMarketDataFiles(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.root)
+        self.service = DataAccessService(YahooFinanceAdaptee())
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def test_round_trip_every_available_format(self):
+        data = sample_frame()
+        for format in available_formats():
+            path = market_data_path(os.path.join(self.root, 'AAPL'), format)
+            save_frame(data, path)
+            loaded = load_frame(path)
+            pd.testing.assert_frame_equal(loaded, data, check_dtype=False)
+            self.assertEqual(loaded['Date'].tolist(), data['Date'].tolist())
+
+    def test_service_defaults_to_binary_and_autodetects(self):
+        data = sample_frame()
+        self.service.save_market_data(data, 'MSFT')
+        self.assertTrue(os.path.isdir('MSFT_market_data.columns'))
+        self.assertFalse(os.path.exists('MSFT_market_data.json'))
+        pd.testing.assert_frame_equal(self.service.load_market_data('MSFT'), data, check_dtype=False)
+
+    def test_json_fallback(self):
+        data = sample_frame()
+        self.service.save_market_data(data, 'IBM', format='json')
+        pd.testing.assert_frame_equal(self.service.load_market_data('IBM'), data, check_dtype=False)
+
+    def test_mmap_load_does_not_copy_numeric_columns(self):
+        path = market_data_path(os.path.join(self.root, 'AAPL'), 'npy')
+        save_frame(sample_frame(), path)
+        loaded = load_frame(path)
+        values = loaded['Close'].to_numpy()
+        while not isinstance(values, np.memmap) and values.base is not None:
+            values = values.base
+        self.assertIsInstance(values, np.memmap)
+        # Copy-on-write: the frame is writable, the file is untouched
+        loaded.loc[0, 'Close'] = -1.0
+        self.assertEqual(load_columns(path)['Close'][0], 100.0)
+
+    def test_newest_format_wins(self):
+        base = os.path.join(self.root, 'AAPL')
+        save_frame(sample_frame(), market_data_path(base, 'json'))
+        save_frame(sample_frame(), market_data_path(base, 'npy'))
+        self.assertEqual(find_market_data(base), market_data_path(base, 'npy'))
+        newer = sample_frame(60)
+        save_frame(newer, market_data_path(base, 'json'))
+        stamp = os.path.getmtime(market_data_path(base, 'json')) + 10
+        os.utime(market_data_path(base, 'json'), (stamp, stamp))
+        self.assertEqual(find_market_data(base), market_data_path(base, 'json'))
+        self.assertEqual(len(load_frame(find_market_data(base))), 60)
+
+    def test_missing_symbol_returns_none(self):
+        self.assertIsNone(self.service.load_market_data('NONE'))
+        self.assertIsNone(self.service.load_market_data('NONE', format='json'))
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            self.service.save_market_data(sample_frame(), 'AAPL', format='xml')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import pandas as pd
+from data_access.market_data_store import MarketDataStore
+
+class RecordingSource:
+    def __init__(self):
+        self.calls = []
+
+    def fetch_market_data(self, symbol, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        dates = pd.bdate_range(start_date, end_date, inclusive='left')
+        if len(dates) == 0:
+            raise ValueError(f"No data found for symbol {symbol}")
+        close = [float(d.day) for d in dates]
+        return pd.DataFrame({
+            'Date': [d.tz_localize('America/New_York').isoformat() for d in dates],
+            'Open': close, 'High': close, 'Low': close, 'Close': close,
+            'Volume': [100] * len(dates)
+        })
+
+class TestMarketDataStore(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.store = MarketDataStore(self.root)
+        self.source = RecordingSource()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def get(self, start_date, end_date):
+        return self.store.get_market_data('TEST', start_date, end_date, self.source.fetch_market_data)
+
+    def test_repeat_request_is_served_from_disk(self):
+        first = self.get('2023-01-02', '2023-02-01')
+        second = MarketDataStore(self.root).get_market_data('TEST', '2023-01-02', '2023-02-01', self.source.fetch_market_data)
+
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(self.source.calls, [('2023-01-02', '2023-02-01')])
+
+    def test_only_missing_span_is_fetched(self):
+        self.get('2023-01-02', '2023-02-01')
+        data = self.get('2022-12-01', '2023-03-01')
+
+        self.assertEqual(self.source.calls[1:], [('2022-12-01', '2023-01-02'), ('2023-02-01', '2023-03-01')])
+        expected = self.source.fetch_market_data('TEST', '2022-12-01', '2023-03-01')
+        pd.testing.assert_frame_equal(data, expected)
+        self.assertEqual(self.store.stats(), {'hits': 0, 'partial_hits': 1, 'misses': 1})
+
+        sub_range = self.get('2023-01-10', '2023-01-20')
+        self.assertEqual(len(self.source.calls), 4)
+        self.assertEqual(sub_range['Date'].iloc[0][:10], '2023-01-10')
+        self.assertEqual(self.store.stats()['hits'], 1)
+
+    def test_partial_hit_copies_stored_rows_without_loading_them(self):
+        self.get('2023-01-02', '2023-02-01')
+        with mock.patch('data_access.market_data_store.columns_to_frame',
+                        side_effect=AssertionError('stored history loaded into a frame')):
+            self.store._update('TEST', '2022-12-01', '2023-03-01', self.source.fetch_market_data)
+        data = self.get('2022-12-01', '2023-03-01')
+        self.assertEqual(len(self.source.calls), 3)
+        pd.testing.assert_frame_equal(data, RecordingSource().fetch_market_data('TEST', '2022-12-01', '2023-03-01'))
+
+    def test_fetched_bars_replace_stored_ones_on_the_same_date(self):
+        self.get('2023-01-02', '2023-02-01')
+        revised = RecordingSource()
+        original = revised.fetch_market_data
+
+        def fetch(symbol, start_date, end_date):
+            # The span starts on the last stored day, as a still-forming bar would
+            data = original(symbol, '2023-01-31', end_date)
+            data['Close'] += 100
+            return data
+
+        data = self.store.get_market_data('TEST', '2023-01-02', '2023-02-10', fetch)
+        self.assertEqual(len(data), len(pd.bdate_range('2023-01-02', '2023-02-10', inclusive='left')))
+        self.assertTrue(data['Date'].is_unique)
+        self.assertEqual(data['Close'].iloc[-9], 30.0)
+        self.assertEqual(data['Close'].iloc[-8], 131.0)
+
+    def test_symbols_cannot_leave_the_root(self):
+        outside = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, outside)
+        for symbol in ('../escaped', os.path.join(outside, 'abs'), '..', '.hidden', 'A/B', 'AAPL\n', ''):
+            with self.assertRaises(ValueError, msg=symbol):
+                self.store.get_market_data(symbol, '2023-01-02', '2023-02-01', self.source.fetch_market_data)
+        self.assertEqual(os.listdir(outside), [])
+        self.assertEqual(os.listdir(self.root), [])
+        self.assertEqual(self.source.calls, [])
+        self.assertEqual(len(self.store.get_market_data('BRK.B', '2023-01-02', '2023-01-09',
+                                                       self.source.fetch_market_data)), 5)
+
+    def test_spans_without_bars_are_covered(self):
+        self.get('2023-01-02', '2023-01-07')
+        # Saturday to Monday holds no trading days
+        for _ in range(3):
+            data = self.get('2023-01-02', '2023-01-09')
+        self.assertEqual(self.source.calls, [('2023-01-02', '2023-01-07'), ('2023-01-07', '2023-01-09')])
+        self.assertEqual(len(data), 5)
+        self.assertEqual(self.store.stats(), {'hits': 2, 'partial_hits': 1, 'misses': 1})
+
+    def test_missing_weekday_bars_are_retried(self):
+        self.get('2023-01-02', '2023-01-07')
+        fetch = self.source.fetch_market_data
+
+        def flaky(symbol, start_date, end_date):
+            # What yfinance reports when a download is rate limited
+            raise ValueError(f"No data found for symbol {symbol}")
+
+        self.source.fetch_market_data = flaky
+        self.assertEqual(len(self.get('2023-01-02', '2023-01-12')), 5)
+        self.source.fetch_market_data = fetch
+        data = self.get('2023-01-02', '2023-01-12')
+        self.assertEqual(self.source.calls, [('2023-01-02', '2023-01-07'), ('2023-01-07', '2023-01-12')])
+        self.assertEqual(len(data), 8)
+
+    def test_iter_market_data_yields_bounded_chunks(self):
+        expected = self.get('2022-01-03', '2023-01-02')
+        chunks = list(self.store.iter_market_data('TEST', '2022-03-01', '2022-06-01', self.source.fetch_market_data, chunk_rows=10))
+
+        self.assertTrue(all(len(chunk) <= 10 for chunk in chunks))
+        days = expected['Date'].str[:10]
+        window = expected[(days >= '2022-03-01') & (days < '2022-06-01')].reset_index(drop=True)
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), window)
+        self.assertEqual(len(self.source.calls), 1)
+
+    def test_stores_sharing_a_root_take_turns(self):
+        # One store per thread stands in for one per server process
+        ranges = [('2022-01-03', '2022-07-01'), ('2021-06-01', '2022-03-01'), ('2022-05-02', '2023-01-02')] * 4
+        errors = []
+
+        def work(start_date, end_date):
+            try:
+                data = MarketDataStore(self.root).get_market_data('TEST', start_date, end_date,
+                                                                 RecordingSource().fetch_market_data)
+                pd.testing.assert_frame_equal(data, self.source.fetch_market_data('TEST', start_date, end_date))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=span) for span in ranges]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.get('2021-06-01', '2023-01-02')), len(pd.bdate_range('2021-06-01', '2023-01-02',
+                                                                                       inclusive='left')))
+
+if __name__ == '__main__':
+    unittest.main()
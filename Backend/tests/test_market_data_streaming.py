@@ -0,0 +1,77 @@
+import json
+import unittest
+from unittest import mock
+import pandas as pd
+from flask import Flask
+from controllers import server
+from data_access.data_access_service import DataAccessService
+from data_access.data_source_interface import DataSourceInterface
+from data_access.decorators.validation_decorator import ValidationDecorator
+from data_access.market_data_cache import MarketDataCache
+
+class FrameSource(DataSourceInterface):
+    def fetch_market_data(self, symbol, start_date, end_date):
+        dates = pd.bdate_range(start_date, end_date, inclusive='left')
+        if len(dates) == 0:
+            raise ValueError(f"No data found for symbol {symbol}")
+        close = [float(i) for i in range(len(dates))]
+        return pd.DataFrame({
+            'Date': [d.isoformat() for d in dates],
+            'Open': close, 'High': close, 'Low': close, 'Close': close,
+            'Volume': list(range(len(dates)))
+        })
+
+    def save_data(self, data, filename):
+        pass
+
+    def load_data(self, filename):
+        raise FileNotFoundError(filename)
+
+class TestMarketDataStreaming(unittest.TestCase):
+    def setUp(self):
+        app = Flask(__name__)
+        server.configure_routes(app)
+        self.client = app.test_client()
+        self.service = DataAccessService(ValidationDecorator(FrameSource()), cache=MarketDataCache())
+        patcher = mock.patch.object(server, 'shared_data_service', self.service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, payload):
+        return self.client.post('/fetch_market_data', json=payload)
+
+    def test_ndjson_rows(self):
+        response = self.post({'symbol': 'TEST', 'start_date': '2020-01-01', 'end_date': '2020-03-01',
+                              'stream': True, 'chunk_rows': 7})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+
+        rows = [json.loads(line) for line in response.data.splitlines()]
+        expected = FrameSource().fetch_market_data('TEST', '2020-01-01', '2020-03-01')
+        self.assertEqual(rows, expected.to_dict(orient='records'))
+
+    def test_ndjson_column_blocks(self):
+        response = self.post({'symbol': 'TEST', 'start_date': '2020-01-01', 'end_date': '2020-03-01',
+                              'stream': True, 'layout': 'columns', 'chunk_rows': 10})
+        blocks = [json.loads(line) for line in response.data.splitlines()]
+
+        self.assertEqual([len(block['Date']) for block in blocks], [10, 10, 10, 10, 3])
+        self.assertEqual(sum((block['Volume'] for block in blocks), []), list(range(43)))
+
+    def test_errors_are_reported_before_streaming(self):
+        response = self.post({'symbol': 'TEST', 'start_date': '2020-01-04', 'end_date': '2020-01-06', 'stream': True})
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('No data found', response.get_json()['error'])
+
+    def test_invalid_chunk_rows(self):
+        for chunk_rows in ('many', 0, [5]):
+            response = self.post({'symbol': 'TEST', 'start_date': '2020-01-01', 'end_date': '2020-03-01',
+                                  'stream': True, 'chunk_rows': chunk_rows})
+            self.assertEqual(response.status_code, 400, chunk_rows)
+
+    def test_invalid_start_date(self):
+        response = self.post({'symbol': 'TEST', 'start_date': '01/01/2020', 'end_date': '2020-03-01'})
+        self.assertEqual(response.status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import threading
+import unittest
+from data_access.metrics import MetricsRegistry, STAGE_METRIC, stats_families
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.metrics = MetricsRegistry(buckets=(0.01, 0.1))
+
+    def test_counters_render_with_labels(self):
+        self.metrics.increment('requests_total', help='Requests', endpoint='/a', status=200)
+        self.metrics.increment('requests_total', 2, endpoint='/a', status=200)
+        self.metrics.increment('requests_total', endpoint='/b"', status=500)
+        text = self.metrics.render()
+        self.assertIn('# HELP requests_total Requests\n# TYPE requests_total counter\n', text)
+        self.assertIn('requests_total{endpoint="/a",status="200"} 3\n', text)
+        self.assertIn('requests_total{endpoint="/b\\"",status="500"} 1\n', text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        for seconds in (0.005, 0.05, 0.5):
+            self.metrics.observe('latency_seconds', seconds, stage='fetch')
+        text = self.metrics.render()
+        self.assertIn('latency_seconds_bucket{stage="fetch",le="0.01"} 1\n', text)
+        self.assertIn('latency_seconds_bucket{stage="fetch",le="0.1"} 2\n', text)
+        self.assertIn('latency_seconds_bucket{stage="fetch",le="+Inf"} 3\n', text)
+        self.assertIn('latency_seconds_count{stage="fetch"} 3\n', text)
+        self.assertIn('latency_seconds_sum{stage="fetch"} 0.555', text)
+
+    def test_stage_timer_records_even_on_error(self):
+        with self.metrics.stage('signals'):
+            pass
+        with self.assertRaises(ValueError), self.metrics.stage('signals'):
+            raise ValueError('boom')
+        self.assertEqual(self.metrics.histogram_count(STAGE_METRIC, stage='signals'), 2)
+
+    def test_collectors_are_read_at_render_time(self):
+        stats = {'hits': 1, 'misses': 0, 'entries': 5}
+        self.metrics.register_collector('cache', lambda: stats_families('cache', stats, ('hits', 'misses')))
+        stats['hits'] = 7
+        text = self.metrics.render()
+        self.assertIn('# TYPE cache_hits_total counter\ncache_hits_total 7\n', text)
+        self.assertIn('# TYPE cache_entries gauge\ncache_entries 5\n', text)
+
+    def test_failing_collector_is_skipped(self):
+        def broken():
+            raise RuntimeError('down')
+        self.metrics.register_collector('broken', broken)
+        self.metrics.increment('ok_total')
+        with self.assertLogs('data_access.metrics', level='WARNING') as logs:
+            self.assertIn('ok_total 1', self.metrics.render())
+        self.assertIn('Error collecting broken metrics: down', logs.output[0])
+
+    def test_concurrent_increments(self):
+        def work():
+            for _ in range(1000):
+                self.metrics.increment('hits_total', symbol='AAPL')
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.metrics.counter_value('hits_total', symbol='AAPL'), 8000)
+
+if __name__ == '__main__':
+    unittest.main()
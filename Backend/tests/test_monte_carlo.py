@@ -0,0 +1,71 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from flask import Flask
+from controllers import server
+from data_access.models import worker_pool
+from data_access.models.monte_carlo import bootstrap_closes, run_monte_carlo, trade_growth
+from data_access.models.trading_strategy import TradingStrategy
+
+class TestMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(9)
+        close = 100 * np.cumprod(1 + rng.normal(0.0003, 0.02, 1500))
+        self.data = pd.DataFrame({
+            'Date': pd.bdate_range('2015-01-01', periods=1500).strftime('%Y-%m-%d'),
+            'Close': close
+        })
+        self.params = {'short_window': 10, 'long_window': 50}
+
+    def test_trade_growth_compounds_to_final_balance(self):
+        final_balance, trade_log, _, _, _ = TradingStrategy(self.data, 'TEST', 'SMA', self.params).run_backtest()
+        growth = trade_growth(trade_log)
+        self.assertEqual(len(growth), sum(trade['action'] == 'SELL' for trade in trade_log))
+        self.assertAlmostEqual(TradingStrategy.INITIAL_BALANCE * growth.prod(), final_balance, places=6)
+
+    def test_shuffle_keeps_total_return(self):
+        result = run_monte_carlo(self.data, 'SMA', self.params, method='shuffle', runs=200, seed=1)
+        self.assertAlmostEqual(result['total_return']['min'], result['backtest']['total_return'], places=6)
+        self.assertAlmostEqual(result['total_return']['max'], result['backtest']['total_return'], places=6)
+        self.assertLess(result['max_drawdown']['min'], result['max_drawdown']['max'])
+
+    def test_trades_resampling_varies_returns(self):
+        result = run_monte_carlo(self.data, 'SMA', self.params, method='trades', runs=500, seed=1,
+                                 include_samples=True)
+        self.assertEqual(len(result['samples']['total_return']), 500)
+        self.assertLess(result['total_return']['p5'], result['total_return']['p95'])
+
+    def test_bootstrap_is_seeded_and_independent_of_pool_size(self):
+        serial = run_monte_carlo(self.data, 'MACD', method='bootstrap', runs=150, seed=3, processes=1,
+                                 include_samples=True)
+        with mock.patch.object(worker_pool, 'MAX_WORKER_PROCESSES', 2):
+            pooled = run_monte_carlo(self.data, 'MACD', method='bootstrap', runs=150, seed=3, processes=2,
+                                     include_samples=True)
+        self.assertEqual(serial, pooled)
+        self.assertEqual(len(serial['samples']['annual_return']), 150)
+
+    def test_bootstrap_paths_reuse_the_series_returns(self):
+        log_returns = np.diff(np.log(self.data['Close'].to_numpy()))
+        close = bootstrap_closes(log_returns, 100.0, 4, 20, np.random.default_rng(0))
+        self.assertEqual(close.shape, (1500, 4))
+        self.assertTrue(np.all(close[0] == 100.0))
+        path_returns = np.diff(np.log(close[:, 0]))
+        self.assertTrue(np.all(np.isin(np.round(path_returns, 12), np.round(log_returns, 12))))
+
+    def test_endpoints_reject_bad_options(self):
+        app = Flask(__name__)
+        server.configure_routes(app)
+        client = app.test_client()
+        monte_carlo = {'symbol': 'AAA', 'end_date': '2023-01-01', 'algorithm': 'SMA'}
+        for bad in ({'seed': 'abc'}, {'seed': -1}, {'runs': 'x'}, {'processes': [2]}, {'params': [1]},
+                    {'params': {'window': 20}}, {'params': {'short_window': 0}}, {'start_date': 20210101}):
+            self.assertEqual(client.post('/run_monte_carlo', json=dict(monte_carlo, **bad)).status_code, 400, bad)
+        walk_forward = {'symbol': 'AAA', 'end_date': '2023-01-01', 'grids': {'SMA': {}}, 'train_bars': 100,
+                        'test_bars': 50}
+        for bad in ({'test_bars': 'x'}, {'step_bars': 0}, {'step_bars': 25}, {'processes': 'all'},
+                    {'start_date': ['2021-01-01']}):
+            self.assertEqual(client.post('/run_walk_forward', json=dict(walk_forward, **bad)).status_code, 400, bad)
+
+if __name__ == '__main__':
+    unittest.main()
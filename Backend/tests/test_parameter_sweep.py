@@ -0,0 +1,95 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from flask import Flask
+from controllers import server
+from data_access.models.parameter_sweep import expand_grid, group_by_indicators, required_indicators, run_sweep
+from data_access.models import worker_pool
+from data_access.models.trading_strategy import TradingStrategy
+
+class TestParameterSweep(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.02, 1500))
+        self.data = pd.DataFrame({
+            'Date': pd.date_range('2015-01-01', periods=1500, freq='D').strftime('%Y-%m-%d'),
+            'Close': close
+        })
+        self.grids = {
+            'SMA': {'short_window': [5, 10, 20], 'long_window': [50, 100]},
+            'MACD': {'short_ema': [8, 12]}
+        }
+
+    def test_expand_grid(self):
+        combos = expand_grid(self.grids)
+        self.assertEqual(len(combos), 8)
+        self.assertIn(('SMA', {'short_window': 10, 'long_window': 100}), combos)
+        with self.assertRaises(ValueError):
+            expand_grid({'SMA': {'window': [5]}})
+        with self.assertRaises(ValueError):
+            expand_grid({'SMA': [5, 10]})
+        for bad in ({'self': [1]}, {'short_window': [0]}, {'short_window': [10, '20']},
+                    {'short_window': [True]}, {'short_window': [2.5]}, {'num_std_dev': [1.5]}):
+            with self.assertRaises(ValueError, msg=bad):
+                expand_grid({'SMA': bad})
+        self.assertEqual(expand_grid({'BollingerBands': {'num_std_dev': [1.5, 2]}}),
+                         [('BollingerBands', {'num_std_dev': 1.5}), ('BollingerBands', {'num_std_dev': 2})])
+
+    def test_grids_over_the_cap_are_rejected_before_expanding(self):
+        with mock.patch('data_access.models.parameter_sweep.MAX_SWEEP_COMBOS', 8):
+            self.assertEqual(len(expand_grid(self.grids)), 8)
+            with self.assertRaises(ValueError):
+                expand_grid(dict(self.grids, BollingerBands={'window': [10]}))
+            with self.assertRaises(ValueError):
+                expand_grid({'SMA': {'short_window': list(range(1, 10 ** 6)), 'long_window': list(range(1, 10 ** 6))}})
+
+    def test_required_indicators_are_grouped(self):
+        combos = expand_grid(self.grids)
+        keys = required_indicators(combos)
+        self.assertEqual(len(keys), len(set(keys)))
+        self.assertEqual(set(keys[:5]), {('sma', w, w) for w in (5, 10, 20, 50, 100)})
+        self.assertIn(('macd_signal', 8, 26, 9), keys)
+
+        grouped = group_by_indicators(list(reversed(combos)))
+        self.assertCountEqual(grouped, combos)
+        firsts = [required_indicators([combo])[0] for combo in grouped]
+        # Each first indicator forms one run
+        runs = [key for n, key in enumerate(firsts) if n == 0 or key != firsts[n - 1]]
+        self.assertEqual(len(runs), len(set(firsts)))
+
+    def test_pool_size_is_capped(self):
+        with mock.patch.object(worker_pool, 'MAX_WORKER_PROCESSES', 4):
+            self.assertEqual(worker_pool.pool_size(5000, 100), 4)
+            self.assertEqual(worker_pool.pool_size(None, 3), 3)
+            self.assertEqual(worker_pool.pool_size(2, 100), 2)
+
+    def test_results_are_ranked_and_match_run_backtest(self):
+        with mock.patch.object(worker_pool, 'MAX_WORKER_PROCESSES', 2):
+            results = run_sweep(self.data, self.grids, processes=2)
+
+        self.assertEqual(len(results), 8)
+        returns = [result['total_return'] for result in results]
+        self.assertEqual(returns, sorted(returns, reverse=True))
+
+        best = results[0]
+        strategy = TradingStrategy(self.data.copy(), 'TEST', best['algorithm'], best['params'])
+        final_balance, trade_log, total_gain_loss, annual_return, total_return = strategy.run_backtest()
+        self.assertEqual(best['final_balance'], final_balance)
+        self.assertEqual(best['total_return'], total_return)
+        self.assertEqual(best['annual_return'], annual_return)
+        self.assertEqual(best['num_trades'], len(trade_log))
+
+    def test_endpoint_rejects_bad_options(self):
+        app = Flask(__name__)
+        server.configure_routes(app)
+        client = app.test_client()
+        payload = {'symbol': 'AAA', 'end_date': '2023-01-01', 'grids': self.grids}
+        for bad in ({'processes': 'many'}, {'processes': 0}, {'top_n': [3]}, {'top_n': 'x'},
+                    {'grids': {'SMA': [5, 10]}}, {'grids': ['SMA']}, {'grids': {'SMA': {'self': [1]}}},
+                    {'grids': {'SMA': {'short_window': [0]}}}):
+            response = client.post('/run_sweep', json=dict(payload, **bad))
+            self.assertEqual(response.status_code, 400, bad)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import numpy as np
+import pandas as pd
+from data_access.data_access_service import DataAccessService
+from data_access.models.trading_strategy import TradingStrategy
+from data_access.models.portfolio_backtest import (
+    PortfolioBacktest, align_closes, fetch_frames, holding_state, equal_weight, fixed_fraction, inverse_volatility
+)
+from tests.helpers import StubSource
+
+def make_frame(dates, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, len(dates)))
+    return pd.DataFrame({'Date': dates, 'Close': close})
+
+class TestPortfolioBacktest(unittest.TestCase):
+    def setUp(self):
+        dates = pd.bdate_range('2015-01-01', periods=1500).strftime('%Y-%m-%d')
+        self.frames = {f"SYM{i}": make_frame(dates, i) for i in range(8)}
+        # Listed later than the rest, with a gap in its history
+        late = make_frame(dates[300:], 99).drop(index=[50, 51, 52])
+        self.frames['LATE'] = late
+
+    def test_single_symbol_matches_trading_strategy(self):
+        for algorithm in ['SMA', 'BollingerBands', 'MACD']:
+            data = self.frames['SYM1']
+            final_balance = TradingStrategy(data, 'SYM1', algorithm).run_backtest()[0]
+            result = PortfolioBacktest.from_frames({'SYM1': data}, algorithm).run()
+            self.assertEqual(result['final_balance'], final_balance, algorithm)
+
+    def test_align_closes_fills_gaps_but_not_before_listing(self):
+        dates, symbols, close = align_closes(self.frames)
+        late = symbols.index('LATE')
+        self.assertEqual(close.shape, (1500, 9))
+        self.assertTrue(np.isnan(close[:300, late]).all())
+        self.assertFalse(np.isnan(close[300:, late]).any())
+        self.assertEqual(close[352, late], close[349, late])
+        self.assertTrue(list(dates) == sorted(dates))
+
+    def test_holding_state(self):
+        signal = np.array([[0, 1], [1, 0], [0, -1], [-1, 0], [0, 1]])
+        expected = np.array([[0, 1], [1, 1], [1, 0], [0, 0], [0, 1]], dtype=bool)
+        np.testing.assert_array_equal(holding_state(signal), expected)
+
+    def test_sizing_rules(self):
+        state = np.array([[True, True, False, False], [False, False, False, False]])
+        close = np.ones(state.shape)
+        np.testing.assert_array_equal(equal_weight(state, close)[0], [0.5, 0.5, 0, 0])
+        np.testing.assert_array_equal(equal_weight(state, close)[1], 0)
+        np.testing.assert_array_equal(fixed_fraction(state, close, fraction=0.2)[0], [0.2, 0.2, 0, 0])
+        np.testing.assert_array_equal(fixed_fraction(np.ones((1, 10), dtype=bool), close, fraction=0.2)[0], 0.1)
+
+        prices = np.cumprod(1 + np.random.default_rng(0).normal(0, [0.01, 0.03], (100, 2)), axis=0)
+        weights = inverse_volatility(np.ones((100, 2), dtype=bool), prices)
+        self.assertAlmostEqual(weights[-1].sum(), 1.0)
+        self.assertGreater(weights[-1, 0], weights[-1, 1])
+
+    def test_cash_and_positions_stay_consistent(self):
+        for sizing, rebalance_every in [('equal_weight', None), ('inverse_volatility', 21), ('fixed_fraction', 5)]:
+            result = PortfolioBacktest.from_frames(self.frames, 'SMA', sizing=sizing, rebalance_every=rebalance_every,
+                                                   commission=0.001).run()
+            positions = {}
+            for trade in result['trades']:
+                change = trade['shares'] if trade['action'] == 'BUY' else -trade['shares']
+                positions[trade['symbol']] = positions.get(trade['symbol'], 0) + change
+                self.assertEqual(positions[trade['symbol']], trade['position'])
+                self.assertGreaterEqual(trade['position'], 0)
+            self.assertEqual(result['num_trades'], len(result['trades']))
+            self.assertGreater(result['fees'], 0)
+            self.assertLessEqual(result['max_drawdown'], 0)
+            self.assertEqual(result['equity_curve']['equity'][-1], result['final_balance'])
+            self.assertTrue(all(equity > 0 for equity in result['equity_curve']['equity']))
+
+    def test_never_trades_before_listing(self):
+        result = PortfolioBacktest.from_frames(self.frames, 'MACD').run()
+        first_day = pd.Timestamp(self.frames['LATE']['Date'].iloc[0])
+        late_trades = [t for t in result['trades'] if t['symbol'] == 'LATE']
+        self.assertTrue(late_trades)
+        self.assertTrue(all(pd.Timestamp(t['date']) >= first_day for t in late_trades))
+
+    def test_invalid_inputs(self):
+        with self.assertRaises(ValueError):
+            PortfolioBacktest.from_frames(self.frames, 'SMA', sizing='kelly')
+        with self.assertRaises(ValueError):
+            PortfolioBacktest(['2020-01-01'], ['A', 'B'], np.ones((1, 3)), 'SMA')
+
+    def test_fetch_frames_reports_failures(self):
+        service = DataAccessService(StubSource())
+        frames, errors = fetch_frames(service, ['AAA', 'MISSING', 'BBB', 'AAA'], '2021-01-01', '2022-01-01')
+        self.assertEqual(sorted(frames), ['AAA', 'BBB'])
+        self.assertIn('MISSING', errors)
+
+if __name__ == '__main__':
+    unittest.main()
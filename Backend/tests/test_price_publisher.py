@@ -0,0 +1,87 @@
+import threading
+import time
+import unittest
+from data_access.price_publisher import PricePublisher, DROP_NEWEST
+
+class TestPricePublisher(unittest.TestCase):
+    def setUp(self):
+        self.publisher = PricePublisher()
+
+    def test_repeated_construction_keeps_subscribers(self):
+        received = []
+        callback = lambda symbol, price: received.append(price)
+        self.publisher.subscribe('KEEP', callback)
+
+        PricePublisher().notify('KEEP', 1.0)
+        self.publisher.flush(timeout=5)
+        self.assertEqual(received, [1.0])
+        self.publisher.unsubscribe('KEEP', callback)
+
+    def test_slow_callback_does_not_block_others(self):
+        release = threading.Event()
+        fast = []
+        slow = lambda symbol, price: release.wait(5)
+        quick = lambda symbol, price: fast.append(price)
+        self.publisher.subscribe('SLOW', slow)
+        self.publisher.subscribe('SLOW', quick)
+
+        start = time.perf_counter()
+        for price in range(5):
+            self.publisher.notify('SLOW', float(price))
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+        deadline = time.time() + 5
+        while len(fast) < 5 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(fast, [0.0, 1.0, 2.0, 3.0, 4.0])
+
+        release.set()
+        self.publisher.flush(timeout=5)
+        self.publisher.unsubscribe('SLOW', slow)
+        self.publisher.unsubscribe('SLOW', quick)
+
+    def test_bounded_queue_overflow(self):
+        release = threading.Event()
+        received = []
+
+        def blocked(symbol, price):
+            release.wait(5)
+            received.append(price)
+
+        self.publisher.subscribe('FULL', blocked, max_queue=2, overflow=DROP_NEWEST)
+        for price in range(6):
+            self.publisher.notify('FULL', float(price))
+            time.sleep(0.01)
+        self.assertEqual(self.publisher.queue_depths()['FULL'], 2)
+
+        release.set()
+        self.publisher.flush(timeout=5)
+        self.assertEqual(received, [0.0, 1.0, 2.0])
+        self.assertEqual(self.publisher.stats()['FULL']['dropped'], 3)
+        self.publisher.unsubscribe('FULL', blocked)
+
+    def test_concurrent_subscribe_and_notify(self):
+        errors = []
+
+        def churn():
+            try:
+                for i in range(200):
+                    callback = lambda symbol, price: None
+                    self.publisher.subscribe('CHURN', callback)
+                    self.publisher.notify('CHURN', float(i))
+                    self.publisher.unsubscribe('CHURN', callback)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=churn) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertTrue(self.publisher.flush(timeout=5))
+        self.assertNotIn('CHURN', self.publisher.queue_depths())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import time
+import unittest
+from unittest import mock
+from flask import Flask
+from controllers import server
+from data_access.price_publisher import PricePublisher
+from data_access.price_stream import PriceStreamHub, StreamLimitError
+
+class TestPriceStreamHub(unittest.TestCase):
+    def setUp(self):
+        self.publisher = PricePublisher()
+        self.hub = PriceStreamHub(self.publisher, tick_interval=0)
+
+    def test_fans_out_and_coalesces_per_client(self):
+        first = self.hub.connect(['AAPL', 'MSFT'], min_interval=0)
+        second = self.hub.connect(['AAPL'], min_interval=0)
+
+        self.publisher.notify('AAPL', 100.0)
+        self.publisher.notify('AAPL', 101.0)
+        self.publisher.notify('MSFT', 50.0)
+        self.publisher.flush(timeout=5)
+
+        self.assertEqual(first.next_batch(timeout=1), [('AAPL', 101.0), ('MSFT', 50.0)])
+        self.assertEqual(second.next_batch(timeout=1), [('AAPL', 101.0)])
+        self.assertEqual(first.coalesced, 1)
+
+        self.hub.disconnect(first)
+        self.hub.disconnect(second)
+
+    def test_bounded_mailbox_drops_oldest(self):
+        client = self.hub.connect(['A', 'B', 'C'], max_pending=2, min_interval=0)
+        for symbol in ['A', 'B', 'C']:
+            self.publisher.notify(symbol, 1.0)
+        self.publisher.flush(timeout=5)
+
+        self.assertEqual([symbol for symbol, _ in client.next_batch(timeout=1)], ['B', 'C'])
+        self.assertEqual(client.dropped, 1)
+        self.hub.disconnect(client)
+
+    def test_last_disconnect_unsubscribes(self):
+        client = self.hub.connect(['TSLA'], min_interval=0)
+        self.hub.disconnect(client)
+
+        self.assertEqual(self.hub.symbols(), [])
+        self.publisher.notify('TSLA', 10.0)
+        self.publisher.flush(timeout=5)
+        self.assertEqual(client.next_batch(timeout=0), [])
+
+    def test_rejects_malformed_or_too_many_symbols(self):
+        hub = PriceStreamHub(self.publisher, tick_interval=0, max_symbols=2)
+        with self.assertRaises(ValueError):
+            hub.connect(['A', 'B', 'C'])
+        with self.assertRaises(ValueError):
+            hub.connect(['AAPL', 'not a ticker'])
+        self.assertEqual(hub.symbols(), [])
+        hub.disconnect(hub.connect(['BRK-B', '^GSPC']))
+
+    def test_connections_are_capped(self):
+        hub = PriceStreamHub(self.publisher, tick_interval=0, max_clients=2)
+        first = hub.connect(['AAPL'])
+        second = hub.connect(['AAPL'])
+        with self.assertRaises(StreamLimitError):
+            hub.connect(['MSFT'])
+        self.assertEqual((hub.client_count(), hub.symbols()), (2, ['AAPL']))
+        hub.disconnect(first)
+        hub.disconnect(hub.connect(['MSFT']))
+        hub.disconnect(second)
+        self.assertEqual(hub.client_count(), 0)
+
+    def test_full_hub_answers_503(self):
+        app = Flask(__name__)
+        server.configure_routes(app)
+        hub = PriceStreamHub(self.publisher, tick_interval=0, max_clients=0)
+        with mock.patch.object(server, 'price_stream_hub', hub):
+            response = app.test_client().get('/stream_prices?symbols=AAPL')
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response.headers)
+
+    def test_pump_drops_symbols_that_fail(self):
+        class Simulator:
+            def __init__(self):
+                self.calls = []
+
+            def simulate_price(self, symbol):
+                self.calls.append(symbol)
+                if symbol == 'BAD':
+                    raise ValueError(f"No data found for symbol {symbol}")
+
+        simulator = Simulator()
+        hub = PriceStreamHub(self.publisher, tick_interval=0.01, simulator=simulator)
+        client = hub.connect(['GOOD', 'BAD'])
+        deadline = time.monotonic() + 5
+        while simulator.calls.count('GOOD') < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        hub.disconnect(client)
+
+        self.assertGreaterEqual(simulator.calls.count('GOOD'), 5)
+        self.assertEqual(simulator.calls.count('BAD'), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from data_access.data_adaptees.replay_adaptee import ReplayAdaptee, record_fixtures, synthetic_bars
+from data_access.decorators.validation_decorator import ValidationDecorator
+from data_access.models.market_data_adapter import create_data_source
+from benchmarks.synthetic_source import SyntheticDataSource
+
+class TestReplayAdaptee(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        record_fixtures(SyntheticDataSource(), self.directory, ['AAA'], '2020-01-01', '2021-01-01', format='json')
+        self.recorded = synthetic_bars('AAA', '2020-01-01', '2021-01-01')
+
+    def test_fixture_ranges_are_sliced_from_the_recording(self):
+        source = ValidationDecorator(ReplayAdaptee(self.directory, synthetic=False))
+        data = source.fetch_market_data('AAA', '2020-03-01', '2020-04-01')
+        expected = self.recorded[self.recorded['Date'].str[:10].between('2020-03-01', '2020-03-31')]
+        self.assertEqual(list(data['Date']), list(expected['Date']))
+        self.assertEqual(list(data['Close']), list(expected['Close']))
+        self.assertEqual(source.get_live_price('AAA'), self.recorded['Close'].iloc[-1])
+
+        with self.assertRaises(ValueError):
+            source.fetch_market_data('AAA', '2022-01-01', '2022-02-01')
+        with self.assertRaises(ValueError):
+            source.fetch_market_data('BBB', '2020-01-01', '2021-01-01')
+
+    def test_symbols_without_fixtures_are_synthetic(self):
+        data = ReplayAdaptee(self.directory).fetch_market_data('BBB', '2020-01-01', '2020-06-01')
+        self.assertTrue(data.equals(synthetic_bars('BBB', '2020-01-01', '2020-06-01')))
+
+    def test_overlapping_synthetic_ranges_agree(self):
+        whole = synthetic_bars('BBB', '2020-01-01', '2021-01-01')
+        part = synthetic_bars('BBB', '2020-06-06', '2020-09-01')
+        shared = whole[whole['Date'].isin(part['Date'])].reset_index(drop=True)
+        self.assertEqual(len(shared), len(part))
+        self.assertTrue(shared.equals(part))
+        self.assertFalse(part['Close'].equals(synthetic_bars('CCC', '2020-06-06', '2020-09-01')['Close']))
+
+    def test_failures_are_injected_repeatably(self):
+        def outcomes(seed):
+            source = ReplayAdaptee(self.directory, failure_rate=0.3, seed=seed)
+            results = []
+            for _ in range(200):
+                try:
+                    source.fetch_market_data('AAA', '2020-01-01', '2020-02-01')
+                    results.append(True)
+                except Exception as e:
+                    self.assertIn('injected failure', str(e))
+                    results.append(False)
+            return results, source.stats()
+
+        first, stats = outcomes(1)
+        self.assertEqual(outcomes(1)[0], first)
+        self.assertNotEqual(outcomes(2)[0], first)
+        self.assertEqual(stats['fetches'], 200)
+        self.assertEqual(stats['failures'], first.count(False))
+        self.assertTrue(30 < stats['failures'] < 90)
+
+    def test_latency(self):
+        source = ReplayAdaptee(self.directory, latency=0.02, jitter=0.02)
+        started = time.perf_counter()
+        source.fetch_market_data('AAA', '2020-01-01', '2020-02-01')
+        self.assertGreaterEqual(time.perf_counter() - started, 0.02)
+
+    def test_selected_by_configuration(self):
+        environment = {'MARKET_DATA_SOURCE': 'replay', 'REPLAY_FIXTURES': self.directory,
+                       'REPLAY_LATENCY': '0.5', 'REPLAY_FAILURE_RATE': '0.1'}
+        with mock.patch.dict(os.environ, environment):
+            source = create_data_source()
+        self.assertIsInstance(source, ReplayAdaptee)
+        self.assertEqual((source.fixtures_dir, source.latency, source.failure_rate), (self.directory, 0.5, 0.1))
+
+if __name__ == '__main__':
+    unittest.main()
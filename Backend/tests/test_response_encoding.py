@@ -0,0 +1,72 @@
+import gzip
+import json
+import unittest
+import numpy as np
+import pandas as pd
+from flask import Flask
+from controllers import response_encoding
+from controllers.response_encoding import encode_response, frame_to_records, frame_to_columns
+
+def sample_frame(rows=10):
+    close = np.linspace(100.0, 110.0, rows)
+    return pd.DataFrame({
+        'Date': [f"2024-01-{i + 1:02d}T00:00:00-05:00" for i in range(rows)],
+        'Close': close,
+        'Volume': np.arange(rows, dtype=np.int64)
+    })
+
+class TestResponseEncoding(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.payload = {'status': 'success', 'data': []}
+
+        @self.app.route('/payload')
+        def payload():
+            return encode_response(self.payload)
+
+        self.client = self.app.test_client()
+
+    def test_records_match_to_dict(self):
+        data = sample_frame()
+        self.assertEqual(frame_to_records(data), data.to_dict(orient='records'))
+
+    def test_columns_layout(self):
+        data = sample_frame(3)
+        columns = frame_to_columns(data)
+        self.assertEqual(list(columns), ['Date', 'Close', 'Volume'])
+        self.assertEqual(columns['Volume'], [0, 1, 2])
+        self.assertIsInstance(columns['Volume'][0], int)
+
+    def test_numpy_scalars_are_serialized(self):
+        self.payload = {'trade_log': [{'Price': np.float64(1.5), 'Shares': np.int64(3)}]}
+        response = self.client.get('/payload')
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(json.loads(response.data), {'trade_log': [{'Price': 1.5, 'Shares': 3}]})
+
+    def test_large_payload_is_gzipped(self):
+        self.payload = {'data': frame_to_records(sample_frame(28))}
+        original = response_encoding.GZIP_MIN_BYTES
+        response_encoding.GZIP_MIN_BYTES = 100
+        try:
+            response = self.client.get('/payload', headers={'Accept-Encoding': 'gzip'})
+            plain = self.client.get('/payload')
+        finally:
+            response_encoding.GZIP_MIN_BYTES = original
+
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.data)), json.loads(plain.data))
+        self.assertNotIn('Content-Encoding', plain.headers)
+
+    def test_msgpack_requires_explicit_preference(self):
+        response = self.client.get('/payload', headers={'Accept': '*/*'})
+        self.assertEqual(response.mimetype, 'application/json')
+
+        response = self.client.get('/payload', headers={'Accept': 'application/msgpack'})
+        if response_encoding.msgpack is None:
+            self.assertEqual(response.mimetype, 'application/json')
+        else:
+            self.assertEqual(response.mimetype, 'application/msgpack')
+            self.assertEqual(response_encoding.msgpack.unpackb(response.data), self.payload)
+
+if __name__ == '__main__':
+    unittest.main()
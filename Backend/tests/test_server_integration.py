@@ -1,12 +1,44 @@
 import unittest
 import json
-from controllers.server import app
+import tempfile
+from unittest import mock
+from app import app
+from controllers import server
+from data_access.data_access_service import DataAccessService
+from data_access.data_adaptees.replay_adaptee import ReplayAdaptee, record_fixtures, synthetic_bars
+from data_access.decorators.validation_decorator import ValidationDecorator
+from data_access.market_data_cache import MarketDataCache
+from data_access.models import market_data_adapter
+from data_access.signal_store import SignalStore
+from benchmarks.synthetic_source import SyntheticDataSource
 
 class TestServerIntegration(unittest.TestCase):
     def setUp(self):
         self.app = app.test_client()
         self.app.testing = True
 
+        # Offline: FNGU is replayed from a recorded fixture, other symbols are synthetic
+        fixtures = tempfile.TemporaryDirectory()
+        self.addCleanup(fixtures.cleanup)
+        record_fixtures(SyntheticDataSource(), fixtures.name, ['FNGU'], '2021-01-01', '2024-01-10')
+        self.source = ReplayAdaptee(fixtures.name)
+        self.use_source(self.source)
+
+        signal_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(signal_dir.cleanup)
+        patcher = mock.patch.object(server, 'signal_store', SignalStore(signal_dir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        server.backtest_result_cache.clear()
+        self.addCleanup(server.backtest_result_cache.clear)
+
+    def use_source(self, source):
+        service = DataAccessService(ValidationDecorator(source), cache=MarketDataCache())
+        for module in (server, market_data_adapter):
+            patcher = mock.patch.object(module, 'shared_data_service', service)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
     def test_fetch_market_data_endpoint(self):
         # Test data
         test_payload = {
@@ -35,6 +67,11 @@ class TestServerIntegration(unittest.TestCase):
             for field in required_fields:
                 self.assertIn(field, first_entry)
 
+        # The recorded bars, not synthetic ones for this range
+        recorded = synthetic_bars('FNGU', '2021-01-01', '2024-01-10')
+        self.assertEqual(len(data['data']), len(recorded))
+        self.assertEqual(data['data'][-1]['Close'], recorded['Close'].iloc[-1])
+
     def test_invalid_date_format(self):
         # Test with invalid date format
         test_payload = {
@@ -51,5 +88,40 @@ class TestServerIntegration(unittest.TestCase):
         self.assertIn('error', data)
         self.assertIn('Invalid date format', data['error'])
 
+    def test_invalid_symbols_are_rejected(self):
+        for endpoint, payload in (('/fetch_market_data', {'symbol': '../../x', 'end_date': '2024-01-10'}),
+                                  ('/run_backtest', {'symbol': '/tmp/x', 'end_date': '2024-01-10', 'algorithm': 'SMA'}),
+                                  ('/run_batch_backtest', {'symbols': ['AAPL', '../x'], 'algorithms': ['SMA'],
+                                                           'end_date': '2024-01-10'})):
+            response = self.app.post(endpoint, json=payload)
+            self.assertEqual(response.status_code, 400, endpoint)
+            self.assertIn('Invalid symbols', response.get_json()['error'])
+
+    def test_run_backtest_rejects_bad_params(self):
+        payload = {'symbol': 'AAPL', 'end_date': '2023-06-01', 'algorithm': 'SMA'}
+        for params in ([20, 50], {'window': 20}, {'short_window': '20'}, {'short_window': 0}, {'self': 1}):
+            response = self.app.post('/run_backtest', json=dict(payload, params=params))
+            self.assertEqual(response.status_code, 400, params)
+        response = self.app.post('/run_backtest', json=dict(payload, algorithm='RSI'))
+        self.assertEqual(response.status_code, 400)
+
+    def test_run_backtest_is_repeatable(self):
+        payload = {'symbol': 'AAPL', 'end_date': '2023-06-01', 'algorithm': 'MACD'}
+        first = self.app.post('/run_backtest', json=payload)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.get_json()['status'], 'success')
+
+        server.backtest_result_cache.clear()
+        self.use_source(ReplayAdaptee(self.source.fixtures_dir))
+        second = self.app.post('/run_backtest', json=payload)
+        self.assertEqual(second.get_json(), first.get_json())
+
+    def test_injected_failures_surface_as_errors(self):
+        self.use_source(ReplayAdaptee(self.source.fixtures_dir, failure_rate=1.0))
+        response = self.app.post('/run_backtest', json={'symbol': 'MSFT', 'end_date': '2023-06-01',
+                                                        'algorithm': 'SMA'})
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('injected failure', response.get_json()['error'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,165 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import date
+from unittest import mock
+import numpy as np
+import pandas as pd
+from data_access import signal_store as signal_store_module
+from data_access.models.trading_strategy import create_algo
+from data_access.signal_store import SignalStore, load_segments
+
+ALGORITHMS = [('SMA', {'short_window': 10, 'long_window': 30}), ('BollingerBands', {}), ('MACD', {})]
+
+class FixedDate(date):
+    @classmethod
+    def today(cls):
+        return cls(2024, 1, 2)
+
+class TestSignalStore(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.store = SignalStore(self.root)
+        dates = pd.bdate_range('2020-01-01', '2024-01-03', inclusive='left')
+        rng = np.random.default_rng(3)
+        self.data = pd.DataFrame({
+            'Date': [d.isoformat() for d in dates],
+            'Close': 100 * np.cumprod(1 + rng.normal(0, 0.02, len(dates)))
+        })
+        patcher = mock.patch.object(signal_store_module, 'date', FixedDate)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def expected(self, data, algorithm, params):
+        return create_algo(algorithm, **params).calculate_signals(data)
+
+    def test_appended_bars_extend_the_stored_signals(self):
+        for algorithm, params in ALGORITHMS:
+            store = SignalStore(tempfile.mkdtemp(dir=self.root))
+            for rows in (700, 701, 760, len(self.data)):
+                data = self.data.iloc[:rows]
+                signals = store.get_signals(data, 'TEST', algorithm, params)
+                np.testing.assert_array_equal(signals, self.expected(data, algorithm, params)['signal'].to_numpy())
+            self.assertEqual(store.stats(), {'hits': 0, 'extensions': 3, 'rebuilds': 1})
+
+            # Indicator columns extended by the streaming algorithm match the batch ones too
+            expected = self.expected(self.data, algorithm, params)
+            directory = store._directory('TEST', algorithm, signal_store_module.canonical_params(algorithm, params),
+                                         self.data['Date'].iloc[0])
+            columns = load_segments(directory)
+            for name in expected.columns:
+                if name != 'Date':
+                    np.testing.assert_array_equal(np.asarray(columns[name]), expected[name].to_numpy(), err_msg=name)
+
+    def test_many_appends_are_merged(self):
+        store = SignalStore(self.root, max_segments=4)
+        for rows in range(700, 720):
+            store.get_signals(self.data.iloc[:rows], 'TEST', 'SMA')
+        signals = store.get_signals(self.data, 'TEST', 'SMA')
+        np.testing.assert_array_equal(signals, self.expected(self.data, 'SMA', {})['signal'].to_numpy())
+        directory = store._directory('TEST', 'SMA', signal_store_module.canonical_params('SMA', {}),
+                                     self.data['Date'].iloc[0])
+        segments = signal_store_module._read_segments(directory)['segments']
+        self.assertLessEqual(len(segments), 4)
+        self.assertEqual(len([entry for entry in os.scandir(directory) if entry.is_dir()]), len(segments))
+        self.assertEqual(len(load_segments(directory)['signal']), len(self.data))
+
+    def test_shorter_or_repeated_requests_are_read_back(self):
+        self.store.get_signals(self.data, 'TEST', 'MACD')
+        reopened = SignalStore(self.root)
+        for rows in (len(self.data), 500):
+            data = self.data.iloc[:rows]
+            np.testing.assert_array_equal(reopened.get_signals(data, 'TEST', 'MACD'),
+                                          self.expected(data, 'MACD', {})['signal'].to_numpy())
+        self.assertEqual(reopened.stats()['hits'], 2)
+        # Explicit default params share the entry
+        reopened.get_signals(self.data, 'TEST', 'MACD', {'short_ema': 12})
+        self.assertEqual(reopened.stats()['hits'], 3)
+
+    def test_revised_latest_bar_is_recomputed_from_state(self):
+        self.store.get_signals(self.data, 'TEST', 'BollingerBands')
+        revised = self.data.copy()
+        revised.loc[len(revised) - 1, 'Close'] *= 1.5
+        signals = self.store.get_signals(revised, 'TEST', 'BollingerBands')
+        np.testing.assert_array_equal(signals, self.expected(revised, 'BollingerBands', {})['signal'].to_numpy())
+        self.assertEqual(self.store.stats(), {'hits': 0, 'extensions': 1, 'rebuilds': 1})
+
+    def test_hits_read_only_the_signal_column(self):
+        self.store.get_signals(self.data, 'TEST', 'SMA')
+        load_columns = signal_store_module.load_columns
+        with mock.patch.object(signal_store_module, 'load_columns', wraps=load_columns) as loads:
+            self.store.get_signals(self.data, 'TEST', 'SMA')
+        self.assertEqual(self.store.stats()['hits'], 1)
+        self.assertTrue(all(call.kwargs.get('names') == ['signal'] for call in loads.call_args_list))
+
+    def test_entries_in_the_pickled_layout_are_rebuilt(self):
+        self.store.get_signals(self.data, 'TEST', 'SMA')
+        directory = self.store._directory('TEST', 'SMA', signal_store_module.canonical_params('SMA', {}),
+                                          self.data['Date'].iloc[0])
+        manifest = signal_store_module._read_segments(directory)
+        self.assertIsInstance(manifest['state'], dict)
+        manifest['state'] = 'gASVAAAAAAAAAAA='
+        del manifest['checks']
+        with open(os.path.join(directory, signal_store_module.SEGMENTS_FILE), 'w') as f:
+            json.dump(manifest, f)
+        np.testing.assert_array_equal(self.store.get_signals(self.data, 'TEST', 'SMA'),
+                                      self.expected(self.data, 'SMA', {})['signal'].to_numpy())
+        self.assertEqual(self.store.stats()['rebuilds'], 2)
+
+    def test_corrected_history_is_rebuilt(self):
+        self.store.get_signals(self.data, 'TEST', 'SMA')
+        corrected = self.data.copy()
+        corrected.loc[100, 'Close'] += 1
+        signals = self.store.get_signals(corrected, 'TEST', 'SMA')
+        np.testing.assert_array_equal(signals, self.expected(corrected, 'SMA', {})['signal'].to_numpy())
+        self.assertEqual(self.store.stats()['rebuilds'], 2)
+
+    def test_different_start_gets_its_own_entry(self):
+        self.store.get_signals(self.data, 'TEST', 'MACD')
+        later = self.data.iloc[300:].reset_index(drop=True)
+        np.testing.assert_array_equal(self.store.get_signals(later, 'TEST', 'MACD'),
+                                      self.expected(later, 'MACD', {})['signal'].to_numpy())
+        self.assertEqual(self.store.stats()['rebuilds'], 2)
+
+    def test_names_cannot_leave_the_root(self):
+        outside = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, outside)
+        for symbol, algorithm in [(os.path.join(outside, 'abs'), 'SMA'), ('../../escape', 'SMA'), ('..', 'SMA'),
+                                  ('TEST', '../escape'), ('TEST', os.path.join(outside, 'abs'))]:
+            with self.assertRaises(ValueError):
+                self.store.get_signals(self.data, symbol, algorithm)
+        self.assertEqual(os.listdir(outside), [])
+        self.assertEqual(os.listdir(self.root), [])
+
+    def test_stores_sharing_a_root_take_turns(self):
+        # One store per thread stands in for one per server process
+        errors = []
+
+        def work(rows):
+            try:
+                data = self.data.iloc[:rows]
+                signals = SignalStore(self.root).get_signals(data, 'TEST', 'SMA')
+                np.testing.assert_array_equal(signals, self.expected(data, 'SMA', {})['signal'].to_numpy())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(rows,)) for rows in range(700, 1000, 25)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        directory = self.store._directory('TEST', 'SMA', signal_store_module.canonical_params('SMA', {}),
+                                          self.data['Date'].iloc[0])
+        segments = signal_store_module._read_segments(directory)['segments']
+        self.assertEqual(sorted(entry.name for entry in os.scandir(directory) if entry.is_dir()),
+                         sorted(name for _, _, name in segments))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from importlib.metadata import EntryPoint
+from unittest import mock
+import numpy as np
+from flask import Flask
+from controllers import server
+from data_access.models.strategy_pattern import registry as registry_module
+from data_access.models.strategy_pattern.indicators import IndicatorCache
+from data_access.models.strategy_pattern.registry import BUILTIN_STRATEGIES, StrategyRegistry
+from data_access.models.strategy_pattern.tradingAlgos import TradingAlgo
+
+class ConstantStrategy(TradingAlgo):
+    """Always long"""
+
+    def __init__(self, window=5):
+        self.window = window
+
+    def required_indicators(self):
+        return (('sma', self.window, self.window),)
+
+    def indicator_columns(self, indicators):
+        return {}
+
+    def generate_signals(self, indicators):
+        return np.ones(len(indicators.close), dtype=int)
+
+    def warmup_bars(self):
+        return 0
+
+    def get_strategy_name(self):
+        return "Constant"
+
+class TestStrategyRegistry(unittest.TestCase):
+    def test_entry_points_are_listed_and_loaded_lazily(self):
+        found = [EntryPoint('Constant', f"{__name__}:ConstantStrategy", registry_module.ENTRY_POINT_GROUP),
+                 EntryPoint('SMA', 'nowhere:Nothing', registry_module.ENTRY_POINT_GROUP)]
+        with mock.patch.object(registry_module, 'entry_points', return_value=found):
+            registry = StrategyRegistry()
+            with self.assertLogs(registry_module.__name__, level='WARNING') as logs:
+                self.assertEqual(list(registry), list(BUILTIN_STRATEGIES) + ['Constant'])
+        self.assertIn('Ignoring entry point strategy SMA', logs.output[0])
+        self.assertEqual(registry.stats()['loaded'], 0)
+
+        self.assertIs(registry['Constant'], ConstantStrategy)
+        self.assertEqual(registry['SMA'].__name__, 'SMAStrategy')
+        self.assertEqual(registry.stats()['loaded'], 2)
+
+    def test_instances_are_shared_per_params(self):
+        registry = StrategyRegistry(entry_point_group=None)
+        registry.register('Constant', ConstantStrategy)
+        first = registry.create('Constant', window=3)
+        self.assertIs(registry.create('Constant', window=3), first)
+        self.assertIsNot(registry.create('Constant', window=4), first)
+        self.assertEqual((registry.stats()['hits'], registry.stats()['misses']), (1, 2))
+        with self.assertRaises(ValueError):
+            registry.create('Unknown')
+
+    def test_required_indicators_prefetch_everything_signals_read(self):
+        close = 100 + np.cumsum(np.random.default_rng(2).normal(0, 1, 500))
+        registry = StrategyRegistry(entry_point_group=None)
+        for name in BUILTIN_STRATEGIES:
+            algo = registry.create(name)
+            indicators = IndicatorCache(close)
+            indicators.prefetch(algo.required_indicators())
+            computed = indicators.stats()['misses']
+            algo.generate_signals(indicators)
+            # Only plain arithmetic on the prefetched ones (the bands) is left to compute
+            self.assertEqual(set(indicators.keys()[:computed]), set(algo.required_indicators()), name)
+            self.assertTrue(all(key[0] not in ('sma', 'std', 'ema', 'macd', 'macd_signal')
+                                for key in indicators.keys()[computed:]), name)
+
+    def test_strategies_endpoint(self):
+        app = Flask(__name__)
+        server.configure_routes(app)
+        response = app.test_client().get('/strategies')
+        self.assertEqual(response.status_code, 200)
+        strategies = {strategy['name']: strategy for strategy in response.get_json()['strategies']}
+        self.assertEqual(strategies['SMA']['parameters'], {'short_window': 50, 'long_window': 200})
+        self.assertIn('moving average', strategies['SMA']['description'])
+        self.assertEqual(strategies['MACD']['required_indicators'], [['ema', 12], ['ema', 26], ['macd', 12, 26], ['macd_signal', 12, 26, 9]])
+
+    def test_description_is_the_strategys_own_docstring(self):
+        class Undocumented(ConstantStrategy):
+            pass
+
+        registry = StrategyRegistry({'Constant': ConstantStrategy, 'Undocumented': Undocumented}, entry_point_group=None)
+        self.assertEqual(registry.describe('Constant')['description'], 'Always long')
+        self.assertIsNone(registry.describe('Undocumented')['description'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import json
+import unittest
+import numpy as np
+import pandas as pd
+from data_access.models.strategy_pattern.tradingAlgos import SMAStrategy, BollingerBandsStrategy, MACDStrategy
+from data_access.models.strategy_pattern.streaming_algos import create_streaming_algo
+
+class TestStreamingAlgos(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.02, 3000))
+        # A flat stretch exercises the repeated-value handling in pandas' rolling code
+        close[1000:1060] = close[999]
+        self.close = close
+
+    def assert_matches_batch(self, batch_algo, algorithm, params):
+        batch = batch_algo.calculate_signals(pd.DataFrame({'Close': self.close}))
+        streaming = create_streaming_algo(algorithm, **params)
+        signals = streaming.warm_up(self.close)
+        np.testing.assert_array_equal(np.array(signals), batch['signal'].to_numpy())
+        return streaming, batch
+
+    def test_sma_matches_batch(self):
+        self.assert_matches_batch(SMAStrategy(20, 60), 'SMA', {'short_window': 20, 'long_window': 60})
+
+    def test_bollinger_matches_batch(self):
+        streaming, batch = self.assert_matches_batch(BollingerBandsStrategy(), 'BollingerBands', {})
+        self.assertEqual(streaming.upper, batch['Upper_BB'].iloc[-1])
+        self.assertEqual(streaming.lower, batch['Lower_BB'].iloc[-1])
+
+    def test_macd_matches_batch(self):
+        streaming, batch = self.assert_matches_batch(MACDStrategy(), 'MACD', {})
+        self.assertEqual(streaming.macd, batch['MACD'].iloc[-1])
+
+    def test_state_round_trips_through_json(self):
+        for algorithm, params in (('SMA', {'short_window': 20, 'long_window': 60}), ('BollingerBands', {}),
+                                  ('MACD', {})):
+            streaming = create_streaming_algo(algorithm, **params)
+            streaming.warm_up(self.close[:2000])
+            restored = create_streaming_algo(algorithm, **params)
+            restored.restore(json.loads(json.dumps(streaming.state())))
+            self.assertEqual(restored.warm_up(self.close[2000:]), streaming.warm_up(self.close[2000:]), algorithm)
+            self.assertEqual(restored.indicator_values(), streaming.indicator_values())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from data_access.backtest_result_cache import BacktestResultCache
+from data_access.models.trade_log import BUY, SELL, TradeLog
+from data_access.models.trading_strategy import TradingStrategy
+
+class TestTradeLog(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.data = pd.DataFrame({
+            'Date': pd.bdate_range('2012-01-01', periods=2500).strftime('%Y-%m-%d'),
+            'Close': 100 * np.cumprod(1 + rng.normal(0, 0.02, 2500))
+        })
+
+    def test_append_grows_and_converts_to_trade_dicts(self):
+        log = TradeLog('TEST', capacity=1)
+        for n in range(5):
+            log.append(2 * n, BUY, 10.0 + n, 100.0, 1000.0 + 100 * n, None, 500.0)
+            log.append(2 * n + 1, SELL, 11.0 + n, 100.0, 1100.0 + 100 * n, 100.0, 1600.0)
+        log.format_dates(lambda bars: [f"01/{bar + 1:02d}/2020" for bar in bars])
+
+        self.assertEqual(len(log), 10)
+        self.assertEqual(log[0], {'date': '01/01/2020', 'symbol': 'TEST', 'action': 'BUY', 'price': 10.0,
+                                  'shares': 100.0, 'transaction_amount': 1000.0, 'gain/loss': None,
+                                  'balance': 500.0})
+        self.assertEqual(log[-1]['action'], 'SELL')
+        self.assertEqual(log[-1]['date'], '01/10/2020')
+        self.assertEqual(log.total_gain_loss(), 500.0)
+        self.assertEqual(TradeLog.from_dicts(log.to_dicts()), log)
+
+    def test_compact_backtest_matches_trade_dicts(self):
+        for algorithm in ('SMA', 'BollingerBands', 'MACD'):
+            expected = TradingStrategy(self.data, 'TEST', algorithm).run_backtest()
+            actual = TradingStrategy(self.data, 'TEST', algorithm).run_backtest(compact=True)
+            self.assertIsInstance(actual[1], TradeLog)
+            self.assertEqual(actual[1].to_dicts(), expected[1])
+            self.assertEqual(actual[2], sum(t['gain/loss'] for t in expected[1] if t['gain/loss'] is not None))
+            self.assertEqual((actual[0],) + actual[2:], (expected[0],) + expected[2:])
+
+    def test_result_cache_keeps_compact_logs(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        key = 'compact'
+        compute = lambda: TradingStrategy(self.data, 'TEST', 'MACD').run_backtest(compact=True)
+        expected = BacktestResultCache(directory=directory).get_or_compute(key, compute)
+
+        restarted = BacktestResultCache(directory=directory)
+        result = restarted.get_or_compute(key, compute)
+        self.assertIsInstance(result[1], TradeLog)
+        self.assertEqual(result[1].to_dicts(), expected[1].to_dicts())
+        self.assertEqual(restarted.stats()['disk_hits'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
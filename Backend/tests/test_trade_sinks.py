@@ -0,0 +1,119 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from data_access.data_access_service import DataAccessService
+from data_access.models.batch_backtest import run_batch
+from data_access.models.trade_sinks import HAS_PYARROW, TRADE_COLUMNS, create_trade_sink, summary_path
+from data_access.models.trading_strategy import TradingStrategy
+from tests.helpers import StubSource
+
+class TestTradeSinks(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        rng = np.random.default_rng(4)
+        self.data = pd.DataFrame({
+            'Date': pd.bdate_range('2015-01-01', periods=1500).strftime('%Y-%m-%d'),
+            'Close': 100 * np.cumprod(1 + rng.normal(0, 0.02, 1500))
+        })
+        self.strategy = TradingStrategy(self.data, 'TEST', 'SMA', {'short_window': 5, 'long_window': 20})
+        self.result = self.strategy.run_backtest()
+
+    def write(self, path, runs=3, **kwargs):
+        final_balance, trade_log, total_gain_loss, annual_return, total_return = self.result
+        with create_trade_sink(path, **kwargs) as sink:
+            for _ in range(runs):
+                sink.write_run('TEST', 'SMA', {'short_window': 5}, trade_log, final_balance, total_gain_loss,
+                               annual_return, total_return)
+        return sink
+
+    def assert_trades(self, frame, runs):
+        trade_log = self.result[1]
+        self.assertEqual(len(frame), runs * len(trade_log))
+        expected = pd.DataFrame(trade_log * runs)
+        for column in ('price', 'shares', 'balance'):
+            np.testing.assert_array_equal(frame[column].to_numpy(), expected[column].to_numpy())
+        self.assertEqual(list(frame['date']), list(expected['date']))
+        self.assertEqual(int(frame['gain/loss'].isna().sum()), sum(t['gain/loss'] is None for t in trade_log) * runs)
+
+    def test_csv_flushes_in_batches_and_keeps_summaries_apart(self):
+        path = os.path.join(self.directory, 'trades.csv')
+        sink = self.write(path, batch_rows=7)
+        self.assertEqual(sink.trades_written, 3 * len(self.result[1]))
+        self.assertEqual(sink.batches_written, -(-sink.trades_written // 7))
+
+        frame = pd.read_csv(path, float_precision='round_trip')
+        self.assertEqual(list(frame.columns), ['run'] + TRADE_COLUMNS)
+        self.assertEqual(sorted(frame['run'].unique()), [0, 1, 2])
+        self.assert_trades(frame, 3)
+
+        summaries = pd.read_csv(summary_path(path), float_precision='round_trip')
+        self.assertEqual(list(summaries['run']), [0, 1, 2])
+        self.assertEqual(summaries['final_balance'].iloc[0], self.result[0])
+        self.assertEqual(summaries['num_trades'].iloc[0], len(self.result[1]))
+
+    def test_sqlite(self):
+        path = os.path.join(self.directory, 'trades.db')
+        self.write(path, batch_rows=10)
+        self.write(path, runs=2)
+        with sqlite3.connect(path) as connection:
+            frame = pd.read_sql('SELECT * FROM trades', connection).rename(columns={'gain_loss': 'gain/loss'})
+            summaries = pd.read_sql('SELECT * FROM summaries', connection)
+        # A second export replaces the first
+        self.assert_trades(frame, 2)
+        self.assertEqual(list(summaries['run']), [0, 1])
+
+    def test_long_symbols_are_kept_whole(self):
+        final_balance, trade_log, total_gain_loss, annual_return, total_return = self.result
+        symbols = ['A', 'EURUSD=X', 'A-SYMBOL-LONGER-THAN-ANY-FIXED-WIDTH-FIELD']
+        for name in ('trades.csv', 'trades.db'):
+            path = os.path.join(self.directory, name)
+            with create_trade_sink(path, batch_rows=10) as sink:
+                for symbol in symbols:
+                    sink.write_run(symbol, 'SMA', {}, trade_log, final_balance, total_gain_loss,
+                                   annual_return, total_return)
+            if name.endswith('.csv'):
+                frame = pd.read_csv(path)
+            else:
+                with sqlite3.connect(path) as connection:
+                    frame = pd.read_sql('SELECT * FROM trades', connection)
+            self.assertEqual(frame.groupby('run')['symbol'].unique().map(list).tolist(), [[s] for s in symbols], name)
+
+    @unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+    def test_parquet(self):
+        path = os.path.join(self.directory, 'trades.parquet')
+        self.write(path, batch_rows=10)
+        self.assert_trades(pd.read_parquet(path), 3)
+        self.assertEqual(len(pd.read_parquet(summary_path(path))), 3)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            create_trade_sink(os.path.join(self.directory, 'trades.txt'))
+
+    def test_save_trades_to_csv_has_no_summary_row(self):
+        path = self.strategy.save_trades_to_csv(self.directory)
+        self.assertEqual(path, os.path.join(self.directory, 'TEST_SMA_trades.csv'))
+        frame = pd.read_csv(path, float_precision='round_trip')
+        self.assertEqual(list(frame.columns), TRADE_COLUMNS)
+        self.assert_trades(frame, 1)
+        self.assertEqual(pd.read_csv(summary_path(path), float_precision='round_trip')['total_gain_loss'].iloc[0], self.result[2])
+
+    def test_batch_backtest_streams_into_sink(self):
+        path = os.path.join(self.directory, 'batch.csv')
+        service = DataAccessService(StubSource())
+        with create_trade_sink(path) as sink:
+            results = list(run_batch(service, ['AAA', 'BBB', 'MISSING'], ['SMA', 'MACD'], '2021-01-01',
+                                     '2023-01-01', sink=sink))
+        self.assertTrue(all('trade_log' not in run for result in results for run in result.get('results', [])))
+        summaries = pd.read_csv(summary_path(path), float_precision='round_trip')
+        self.assertEqual(len(summaries), 4)
+        self.assertEqual(summaries['num_trades'].sum(), len(pd.read_csv(path, float_precision='round_trip')))
+        expected = sorted(run['num_trades'] for result in results for run in result.get('results', []))
+        self.assertEqual(sorted(summaries['num_trades']), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
+import numpy as np
 import pandas as pd
-from models.trading_strategy import TradingStrategy
+from data_access.models.trading_strategy import TradingStrategy
 
 class TestTradingAlgo(unittest.TestCase):
     def setUp(self):
@@ -33,5 +34,34 @@ class TestTradingAlgo(unittest.TestCase):
             for key in required_keys:
                 self.assertIn(key, first_trade)
 
+    def _random_walk(self, bars, start_price=100.0, seed=7):
+        rng = np.random.default_rng(seed)
+        close = start_price * np.cumprod(1 + rng.normal(0, 0.02, bars))
+        dates = pd.date_range('2010-01-01', periods=bars, freq='D')
+        return pd.DataFrame({
+            'Date': [d.isoformat() for d in dates],
+            'Open': close, 'High': close, 'Low': close,
+            'Close': close, 'Volume': np.full(bars, 1000)
+        })
+
+    def _legacy_backtest(self, data, algorithm):
+        strategy = TradingStrategy(data, 'TEST', algorithm)
+        strategy.calculate_signals()
+        strategy._simulate_rows()
+        return strategy._summarize()
+
+    def test_fill_engine_matches_row_loop(self):
+        for algorithm in ['SMA', 'BollingerBands', 'MACD']:
+            data = self._random_walk(3000)
+            expected = self._legacy_backtest(data.copy(), algorithm)
+            actual = TradingStrategy(data.copy(), 'TEST', algorithm).run_backtest()
+            self.assertEqual(actual, expected, algorithm)
+
+    def test_unaffordable_buy_matches_row_loop(self):
+        data = self._random_walk(500, start_price=150000.0)
+        expected = self._legacy_backtest(data.copy(), 'MACD')
+        actual = TradingStrategy(data.copy(), 'TEST', 'MACD').run_backtest()
+        self.assertEqual(actual, expected)
+
 if __name__ == '__main__':
     unittest.main()
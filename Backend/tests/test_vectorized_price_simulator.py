@@ -0,0 +1,65 @@
+import time
+import unittest
+import numpy as np
+import pandas as pd
+from data_access.price_publisher import PricePublisher
+from data_access.vectorized_price_simulator import VectorizedPriceSimulator, ReplayModel
+
+class TestVectorizedPriceSimulator(unittest.TestCase):
+    def test_seeded_runs_are_reproducible(self):
+        for model in ('uniform', 'gbm'):
+            first = VectorizedPriceSimulator(['A', 'B', 'C'], [10.0, 20.0, 30.0], model=model, seed=7, publisher=None)
+            second = VectorizedPriceSimulator(['A', 'B', 'C'], [10.0, 20.0, 30.0], model=model, seed=7, publisher=None)
+            np.testing.assert_array_equal(first.run(50), second.run(50))
+
+    def test_uniform_walk_stays_within_band(self):
+        simulator = VectorizedPriceSimulator([f"S{i}" for i in range(1000)], np.full(1000, 100.0),
+                                             seed=1, publisher=None)
+        prices = simulator.step(publish=False)
+        self.assertTrue(np.all(np.abs(prices / 100.0 - 1) <= 0.00025))
+
+    def test_gbm_moments(self):
+        simulator = VectorizedPriceSimulator([f"S{i}" for i in range(20000)], np.full(20000, 100.0),
+                                             model='gbm', seed=3, publisher=None, mu=0.0, sigma=0.2, dt=1.0)
+        log_returns = np.log(simulator.step(publish=False) / 100.0)
+        self.assertAlmostEqual(log_returns.mean(), -0.02, delta=0.01)
+        self.assertAlmostEqual(log_returns.std(), 0.2, delta=0.01)
+
+    def test_replay_from_frames(self):
+        frames = {
+            'A': pd.DataFrame({'Date': ['2024-01-01', '2024-01-02', '2024-01-03'], 'Close': [1.0, 2.0, 3.0]}),
+            'B': pd.DataFrame({'Date': ['2024-01-01', '2024-01-03'], 'Close': [10.0, 30.0]})
+        }
+        model = ReplayModel.from_frames(frames, ['A', 'B'])
+        simulator = VectorizedPriceSimulator(['A', 'B'], model=model, publisher=None)
+        np.testing.assert_array_equal(simulator.prices, [1.0, 10.0])
+        np.testing.assert_array_equal(simulator.run(3), [[2.0, 10.0], [3.0, 30.0], [1.0, 10.0]])
+
+    def test_scheduler_publishes_batches(self):
+        publisher = PricePublisher()
+        received = []
+        callback = lambda symbol, price: received.append((symbol, price))
+        publisher.subscribe('SIMX', callback)
+        publisher.subscribe('SIMY', callback)
+
+        simulator = VectorizedPriceSimulator(['SIMX', 'SIMY'], [1.0, 2.0], seed=0, publisher=publisher)
+        simulator.start(interval=0.01)
+        time.sleep(0.2)
+        simulator.stop(timeout=1)
+        publisher.flush(timeout=5)
+
+        self.assertGreater(simulator.ticks, 3)
+        # Symbols are delivered independently, so only each one's own order is fixed
+        per_symbol = {symbol: [price for name, price in received if name == symbol] for symbol in ('SIMX', 'SIMY')}
+        self.assertEqual({symbol: len(prices) for symbol, prices in per_symbol.items()},
+                         {'SIMX': simulator.ticks, 'SIMY': simulator.ticks})
+        self.assertEqual({symbol: prices[-1] for symbol, prices in per_symbol.items()}, simulator.last_prices())
+        publisher.unsubscribe('SIMX', callback)
+        publisher.unsubscribe('SIMY', callback)
+
+    def test_invalid_model(self):
+        with self.assertRaises(ValueError):
+            VectorizedPriceSimulator(['A'], [1.0], model='random', publisher=None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from data_access.models import worker_pool
+from data_access.models.parameter_sweep import run_sweep
+from data_access.models.walk_forward import run_walk_forward, walk_forward_windows
+
+class TestWalkForward(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        close = 100 * np.cumprod(1 + rng.normal(0.0002, 0.02, 2000))
+        self.data = pd.DataFrame({
+            'Date': pd.bdate_range('2010-01-01', periods=2000).strftime('%Y-%m-%d'),
+            'Close': close
+        })
+        self.grids = {'SMA': {'short_window': [5, 20], 'long_window': [50, 100]}, 'MACD': {}}
+
+    def test_windows(self):
+        self.assertEqual(walk_forward_windows(100, 50, 20), [(0, 50, 50, 70), (20, 70, 70, 90)])
+        self.assertEqual(walk_forward_windows(100, 50, 20, anchored=True), [(0, 50, 50, 70), (0, 70, 70, 90)])
+        self.assertEqual(walk_forward_windows(100, 20, 20, step_bars=30), [(0, 20, 20, 40), (30, 50, 50, 70), (60, 80, 80, 100)])
+        with self.assertRaises(ValueError):
+            walk_forward_windows(100, 50, 20, step_bars=10)
+        self.assertEqual(walk_forward_windows(60, 50, 20), [])
+
+    def test_train_choice_matches_sweep_and_pool_matches_serial(self):
+        serial = run_walk_forward(self.data, self.grids, 500, 250, processes=1)
+        with mock.patch.object(worker_pool, 'MAX_WORKER_PROCESSES', 2):
+            pooled = run_walk_forward(self.data, self.grids, 500, 250, processes=2)
+        self.assertEqual(serial, pooled)
+        self.assertEqual(serial['summary']['windows'], 6)
+
+        first = serial['windows'][0]
+        best = run_sweep(self.data.iloc[:500], self.grids, processes=1)[0]
+        self.assertEqual((first['algorithm'], first['params']), (best['algorithm'], best['params']))
+        self.assertEqual(first['train']['total_return'], best['total_return'])
+
+        growth = np.prod([1 + window['test']['total_return'] / 100 for window in serial['windows']])
+        self.assertAlmostEqual(serial['summary']['total_return'], (growth - 1) * 100)
+
+    def test_too_little_data(self):
+        with self.assertRaises(ValueError):
+            run_walk_forward(self.data.iloc[:600], self.grids, 500, 250)
+
+if __name__ == '__main__':
+    unittest.main()